@@ -0,0 +1,130 @@
+import time
+
+
+class EnemyAI:
+    """Staggered decision-making for enemies.
+    
+    Physics runs for every enemy every step; thinking does not. Each enemy
+    gets a think slot when it spawns and only thinks on frames where
+    `frame % think_interval` matches it, so the work is spread evenly over
+    the interval. At most `max_thinks` enemies think per step and, when
+    `time_budget` (seconds) is set, thinking also stops once the budget is
+    spent. Enemies left over simply wait for their next slot; the start of
+    each frame's queue rotates so none of them starve.
+    
+    Thinking only uses the engine RNG and simulation clock, so matches stay
+    deterministic. A time budget depends on the wall clock and makes them
+    machine dependent, so it is off by default.
+    """
+    
+    def __init__(self, think_interval=6, max_thinks=8, time_budget=None,
+                 throw_range=(60, 450), throw_cooldown=2.5, throw_speed=260,
+                 dodge_time=0.35, dodge_chance=0.6, jump_chance=0.02, jump_power=330):
+        self.think_interval = think_interval
+        self.max_thinks = max_thinks
+        self.time_budget = time_budget
+        self.clock = time.perf_counter
+        self.throw_range = throw_range
+        self.throw_cooldown = throw_cooldown
+        self.throw_speed = throw_speed
+        self.dodge_time = dodge_time
+        self.dodge_chance = dodge_chance
+        self.jump_chance = jump_chance
+        self.jump_power = jump_power
+        
+        # Statistics
+        self.thinks = 0
+        self.deferred = 0
+    
+    def assign_slot(self, enemy, spawn_index):
+        """Give a newly spawned enemy its think slot"""
+        enemy.think_slot = spawn_index % self.think_interval
+    
+    def update(self, engine):
+        """Let the enemies whose slot is due think, within the per-frame budget"""
+        slot = engine.frame % self.think_interval
+        due = [enemy for enemy in engine.enemies if enemy.think_slot == slot]
+        if not due:
+            return
+        
+        # Nearest first, independent of how the engine stores its enemies;
+        # then rotate so deferred enemies go first on their next turn
+        due.sort(key=lambda enemy: enemy.x)
+        start = (engine.frame // self.think_interval) % len(due)
+        due = due[start:] + due[:start]
+        deadline = self.clock() + self.time_budget if self.time_budget else None
+        thought = 0
+        for enemy in due:
+            if thought == self.max_thinks or (deadline and self.clock() > deadline):
+                break
+            self.think(engine, enemy)
+            thought += 1
+        self.thinks += thought
+        self.deferred += len(due) - thought
+    
+    def think(self, engine, enemy):
+        rng = engine.rng
+        on_ground = enemy.y <= engine.ground_level
+        
+        # Dodge: jump over a player snowball that will arrive soon
+        if on_ground and self.incoming_snowball(engine, enemy):
+            if rng.random() < self.dodge_chance:
+                enemy.velocity_y = self.jump_power
+                return
+        
+        # Throw at the player when in range and the arm has recovered
+        player = engine.player
+        if player is not None and enemy.x < engine.game_width:
+            distance = enemy.x - player.x
+            if (self.throw_range[0] <= distance <= self.throw_range[1] and
+                    engine.sim_time - enemy.last_throw_time >= self.throw_cooldown):
+                enemy.last_throw_time = engine.sim_time
+                engine.add_enemy_snowball(*self.aim(enemy, player))
+                return
+        
+        # Otherwise hop now and then to be harder to hit
+        if on_ground and rng.random() < self.jump_chance:
+            enemy.velocity_y = self.jump_power
+    
+    def incoming_snowball(self, engine, enemy):
+        """Whether a player snowball will reach the enemy within dodge_time"""
+        left = enemy.x - enemy.width / 2
+        top = enemy.y + enemy.height
+        store = engine.snowball_store
+        if store is not None:
+            return self.incoming_from_columns(store, left, top)
+        for snowball in engine.snowballs:
+            if snowball.velocity_x <= 0 or snowball.x > left:
+                continue
+            arrival = (left - snowball.x) / snowball.velocity_x
+            if arrival <= self.dodge_time and snowball.y <= top:
+                return True
+        return False
+    
+    def incoming_from_columns(self, store, left, top):
+        """incoming_snowball over the columns of an EntityStore of snowballs"""
+        n = store.count
+        c = store.columns
+        x, y, velocity_x = c['x'][:n], c['y'][:n], c['velocity_x'][:n]
+        if store.use_numpy:
+            coming = (velocity_x > 0) & (x <= left) & (y <= top)
+            return bool(((left - x[coming]) / velocity_x[coming] <= self.dodge_time).any())
+        for x, y, velocity_x in zip(x, y, velocity_x):
+            if velocity_x > 0 and x <= left and y <= top and (left - x) / velocity_x <= self.dodge_time:
+                return True
+        return False
+    
+    def aim(self, enemy, player, gravity=400):
+        """Start position and velocity of a lob landing on the player.
+        
+        Snowballs fly at a fixed horizontal speed, so the flight time is set
+        by the distance and the vertical speed is what makes the arc end at
+        the player's chest despite gravity.
+        """
+        x = enemy.x - enemy.width / 2
+        y = enemy.y + enemy.height / 2
+        target_y = player.y + player.height / 2
+        velocity_x = -self.throw_speed
+        flight = max((x - player.x) / self.throw_speed, 0.05)
+        velocity_y = (target_y - y) / flight + gravity * flight / 2
+        return x, y, velocity_x, velocity_y
\ No newline at end of file
@@ -0,0 +1,187 @@
+import asyncio
+import multiprocessing
+import random
+import time
+
+from .characters import CHARACTERS
+from .protocol import (
+    SnapshotDecoder, encode_ack, encode_input, encode_join, frame_message,
+    read_message
+)
+from .server import SessionServer
+
+
+class BotClient:
+    """Headless TCP client that mashes random inputs and acknowledges snapshots"""
+    
+    def __init__(self, room, character, seed=None, input_rate=4.0):
+        self.room = room
+        self.character = character
+        self.rng = random.Random(seed)
+        self.input_interval = 1.0 / input_rate
+        self.decoder = SnapshotDecoder()
+        self.writer = None
+        self.bytes_received = 0
+        self.snapshots = 0
+        self.errors = 0
+    
+    def send(self, payload):
+        self.writer.write(frame_message(payload))
+    
+    async def connect(self, host, port):
+        reader, self.writer = await asyncio.open_connection(host, port)
+        self.send(encode_join(self.room, self.character))
+        return reader
+    
+    async def receive(self, reader):
+        while True:
+            payload = await read_message(reader)
+            self.bytes_received += len(payload) + 2
+            try:
+                frame = self.decoder.apply(payload)
+            except KeyError:
+                self.errors += 1  # Unknown baseline, wait for a full snapshot
+                continue
+            self.snapshots += 1
+            self.send(encode_ack(frame))
+    
+    async def play(self):
+        while True:
+            await asyncio.sleep(self.input_interval * self.rng.uniform(0.5, 1.5))
+            direction = self.rng.choice(('left', 'right', None))
+            self.send(encode_input('left', direction == 'left'))
+            self.send(encode_input('right', direction == 'right'))
+            self.send(encode_input('jump', self.rng.random() < 0.2))
+            if self.rng.random() < 0.5:
+                self.send(encode_input('throw', True))
+    
+    async def run(self, reader):
+        try:
+            await asyncio.gather(self.receive(reader), self.play())
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.writer.close()
+    
+    def reset_counters(self):
+        self.bytes_received = 0
+        self.snapshots = 0
+        self.errors = 0
+
+
+def serve_process(host, port, options, conn):
+    """Child process entry point: run a SessionServer and report load over the pipe.
+    
+    The parent sends 'measure' to start a measurement window and 'stop' to
+    end it; the server then sends back its statistics for that window.
+    """
+    async def serve():
+        server = SessionServer(**options)
+        await server.listen(host, port)
+        conn.send('ready')
+        ticking = asyncio.get_running_loop().create_task(server.run())
+        start = None
+        while True:
+            await asyncio.sleep(0.05)
+            if not conn.poll():
+                continue
+            command = conn.recv()
+            if command == 'measure':
+                start = (time.perf_counter(), time.process_time(), server.busy_time,
+                         server.tick, server.late_ticks, server.stats()['bytes_sent'])
+            elif command == 'stop':
+                stats = server.stats()
+                wall = time.perf_counter() - start[0]
+                stats.update(
+                    wall_time=wall,
+                    cpu_time=time.process_time() - start[1],
+                    busy_time=server.busy_time - start[2],
+                    ticks=server.tick - start[3],
+                    late_ticks=server.late_ticks - start[4],
+                    bytes_sent=stats['bytes_sent'] - start[5]
+                )
+                conn.send(stats)
+                await server.close()
+                await ticking
+                return
+    
+    asyncio.run(serve())
+
+
+async def run_bots(bots, clients_per_room, duration, host, port, seed=0,
+                   on_measure=None, on_stop=None):
+    """Connect bots (clients_per_room to a room), play for duration seconds, return them
+    
+    on_measure() runs once every room is warmed up and on_stop() when the
+    measurement window ends; the bots stay connected until on_stop returns.
+    """
+    clients = []
+    readers = []
+    for index in range(bots):
+        bot = BotClient(f'room-{index // clients_per_room}',
+                        CHARACTERS[index % len(CHARACTERS)]['name'], seed + index)
+        readers.append(await bot.connect(host, port))
+        clients.append(bot)
+    
+    tasks = [asyncio.create_task(bot.run(reader)) for bot, reader in zip(clients, readers)]
+    await asyncio.sleep(1.0)  # Let every room reach steady state
+    for bot in clients:
+        bot.reset_counters()
+    if on_measure:
+        on_measure()
+    
+    await asyncio.sleep(duration)
+    if on_stop:
+        await asyncio.get_running_loop().run_in_executor(None, on_stop)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return clients
+
+
+def run_load_test(bots=200, clients_per_room=2, duration=10.0, host='127.0.0.1', port=7777,
+                  server_options=None, seed=0):
+    """Measure a SessionServer in its own process under a crowd of bot clients.
+    
+    Returns the server statistics for the measurement window plus
+    rooms per (fully used) server core and bytes per second per client.
+    """
+    options = dict(server_options or {})
+    options.setdefault('seats', clients_per_room)
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=serve_process, args=(host, port, options, child),
+                                      daemon=True)
+    process.start()
+    
+    def stop():
+        parent.send('stop')
+        if not parent.poll(10):
+            raise RuntimeError("Session server did not report")
+        return parent.recv()
+    
+    reports = []
+    try:
+        if not parent.poll(10) or parent.recv() != 'ready':
+            raise RuntimeError("Session server did not start")
+        clients = asyncio.run(run_bots(bots, clients_per_room, duration, host, port, seed,
+                                       on_measure=lambda: parent.send('measure'),
+                                       on_stop=lambda: reports.append(stop())))
+    finally:
+        process.join(5)
+        if process.is_alive():
+            process.terminate()
+    
+    stats = reports[0]
+    wall = stats['wall_time']
+    received = sum(bot.bytes_received for bot in clients)
+    stats.update(
+        bots=bots,
+        cpu_load=stats['cpu_time'] / wall,
+        tick_load=stats['busy_time'] / wall,
+        rooms_per_core=stats['rooms'] * wall / stats['cpu_time'] if stats['cpu_time'] else 0.0,
+        bytes_per_client=received / wall / bots,
+        server_bytes_per_client=stats['bytes_sent'] / wall / bots,
+        snapshots_per_client=sum(bot.snapshots for bot in clients) / wall / bots,
+        decode_errors=sum(bot.errors for bot in clients)
+    )
+    return stats
\ No newline at end of file
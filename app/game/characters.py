@@ -0,0 +1,49 @@
+# Playable characters. Multipliers are applied to the base player
+# attributes by Player.set_character_attributes; sprite names the frame
+# in the sprite atlas (see build_atlas.py).
+CHARACTERS = [
+    {
+        'name': 'Arda',
+        'sprite': 'arda',
+        'description': 'Hızlı hareket\nkabiliyeti',
+        'speed': 1.5,
+        'throw_cooldown': 1.0,
+        'jump_power': 1.0,
+        'snowball_power': 1.0
+    },
+    {
+        'name': 'Elif',
+        'sprite': 'elif',
+        'description': 'Hızlı atış\nkabiliyeti',
+        'speed': 1.0,
+        'throw_cooldown': 0.6,
+        'jump_power': 1.0,
+        'snowball_power': 1.0
+    },
+    {
+        'name': 'Can',
+        'sprite': 'can',
+        'description': 'Güçlü kar topu\natışları',
+        'speed': 1.0,
+        'throw_cooldown': 1.0,
+        'jump_power': 1.0,
+        'snowball_power': 1.5
+    },
+    {
+        'name': 'Ayşe',
+        'sprite': 'ayse',
+        'description': 'Yüksek zıplama\nkabiliyeti',
+        'speed': 1.0,
+        'throw_cooldown': 1.0,
+        'jump_power': 1.4,
+        'snowball_power': 1.0
+    }
+]
+
+
+def get_character(name):
+    """Return the character data with the given name"""
+    for character in CHARACTERS:
+        if character['name'] == name:
+            return character
+    raise KeyError(f"Unknown character: {name}")
\ No newline at end of file
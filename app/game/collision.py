@@ -0,0 +1,253 @@
+from bisect import bisect_left
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, fall back to plain loops
+    numpy = None
+
+
+def bounds(obj):
+    """Return (left, right, bottom, top) of a sprite's bounding box"""
+    return (obj.x - obj.half_width, obj.x + obj.half_width, obj.y, obj.y + obj.box_height)
+
+
+def sprites_overlap(a, b):
+    """Check whether the cached collision boxes of two sprites overlap"""
+    return (a.x + a.half_width > b.x - b.half_width and
+            a.x - a.half_width < b.x + b.half_width and
+            a.y + a.box_height > b.y and
+            a.y < b.y + b.box_height)
+
+
+def swept_bounds(obj):
+    """Return the (left, right, bottom, top) box covering a sprite's last step"""
+    if obj.x < obj.prev_x:
+        left, right = obj.x, obj.prev_x
+    else:
+        left, right = obj.prev_x, obj.x
+    if obj.y < obj.prev_y:
+        bottom, top = obj.y, obj.prev_y
+    else:
+        bottom, top = obj.prev_y, obj.y
+    return (left - obj.half_width, right + obj.half_width, bottom, top + obj.box_height)
+
+
+def time_of_impact(a, b):
+    """Fraction of the last step at which sprite a first touched sprite b, or None.
+    
+    Both sprites are taken to move in a straight line from (prev_x, prev_y)
+    to (x, y). Working in b's frame of reference this is a ray-vs-box test
+    of a's box against b's, so a fast snowball cannot pass through an enemy
+    between two steps. Returns 0.0 when they already overlapped at the start.
+    """
+    return _slab_impact(
+        (a.x - a.prev_x) - (b.x - b.prev_x), a.prev_x - b.prev_x, a.half_width + b.half_width,
+        (a.y - a.prev_y) - (b.y - b.prev_y), a.prev_y - b.prev_y, a.box_height, b.box_height)
+
+
+def _slab_impact(dx, offset_x, reach, dy, offset_y, under, over):
+    """time_of_impact from relative motion: a's offset from b starts at
+    (offset_x, offset_y) and moves by (dx, dy); the boxes touch while
+    -reach < x offset < reach and -under < y offset < over"""
+    enter = 0.0
+    leave = 1.0
+    
+    # Horizontal slab: gap between the boxes at the start, closing at speed dx
+    if dx == 0:
+        if not -reach < offset_x < reach:
+            return None
+    else:
+        t0 = (-reach - offset_x) / dx
+        t1 = (reach - offset_x) / dx
+        if t0 > t1:
+            t0, t1 = t1, t0
+        enter = max(enter, t0)
+        leave = min(leave, t1)
+    
+    # Vertical slab; boxes sit on y, so the extents are not symmetric
+    if dy == 0:
+        if not -under < offset_y < over:
+            return None
+    else:
+        t0 = (-under - offset_y) / dy
+        t1 = (over - offset_y) / dy
+        if t0 > t1:
+            t0, t1 = t1, t0
+        enter = max(enter, t0)
+        leave = min(leave, t1)
+    
+    if enter < leave:
+        return enter
+    return None
+
+
+def _slab_impacts(dx, offset_x, reach, dy, offset_y, under, over):
+    """_slab_impact over NumPy arrays of pairs, with inf for pairs that never touch"""
+    enter = numpy.zeros(len(dx))
+    leave = numpy.ones(len(dx))
+    for d, offset, low, high in ((dx, offset_x, -reach, reach), (dy, offset_y, -under, over)):
+        still = d == 0
+        speed = numpy.where(still, 1.0, d)
+        t0 = (low - offset) / speed
+        t1 = (high - offset) / speed
+        enter = numpy.where(still, enter, numpy.maximum(enter, numpy.minimum(t0, t1)))
+        # A pair not moving along this axis touches throughout or never
+        apart = still & ~((low < offset) & (offset < high))
+        leave = numpy.where(still, numpy.where(apart, -1.0, leave),
+                            numpy.minimum(leave, numpy.maximum(t0, t1)))
+    return numpy.where(enter < leave, enter, numpy.inf)
+
+
+def boxes_overlap(box1, box2):
+    """Check whether two (left, right, bottom, top) boxes overlap"""
+    return (box1[1] > box2[0] and
+            box1[0] < box2[1] and
+            box1[3] > box2[2] and
+            box1[2] < box2[3])
+
+
+class SweepAndPrune:
+    """Broad phase that sorts boxes along x.
+    
+    The game scrolls sideways, so objects are spread along x. Build once per
+    frame, then each query only visits boxes whose left edge lies within
+    reach of the query box instead of every object.
+    """
+    
+    def __init__(self):
+        self.lefts = []
+        self.entries = []
+        self.max_width = 0
+    
+    def build(self, objects, box_of=bounds):
+        """Index objects for this frame by box_of(obj), e.g. swept_bounds for movers"""
+        entries = []
+        max_width = 0
+        for order, obj in enumerate(objects):
+            box = box_of(obj)
+            entries.append((box[0], order, box, obj))
+            if box[1] - box[0] > max_width:
+                max_width = box[1] - box[0]
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+        
+        self.entries = entries
+        self.lefts = [entry[0] for entry in entries]
+        self.max_width = max_width
+    
+    def first_impact(self, mover):
+        """Return the object mover touched earliest during its last step, or None.
+        
+        Build with swept_bounds so moving objects are found along their whole
+        path. Ties go to the earliest-added object.
+        """
+        box = swept_bounds(mover)
+        
+        # Any box overlapping must start after box.left - max_width and before box.right
+        start = bisect_left(self.lefts, box[0] - self.max_width)
+        end = bisect_left(self.lefts, box[1])
+        
+        best_key = None
+        best = None
+        for i in range(start, end):
+            left, order, other_box, obj = self.entries[i]
+            if boxes_overlap(box, other_box):
+                t = time_of_impact(mover, obj)
+                if t is not None and (best_key is None or (t, order) < best_key):
+                    best_key = (t, order)
+                    best = obj
+        return best
+
+
+def first_impacts(movers, targets, use_numpy=True):
+    """Pair each mover with the target it touched first during the last step.
+    
+    movers and targets are (x, y, prev_x, prev_y, half_width, box_height)
+    columns, e.g. from EntityStore.boxes(). Returns (mover row, target row)
+    pairs in mover order, the same pairs SweepAndPrune.first_impact finds
+    one object at a time. With NumPy the broad phase is a searchsorted over
+    the targets' sorted swept boxes and the slab test runs on all candidate
+    pairs at once; without it the same search runs in a loop.
+    """
+    if not len(movers[0]) or not len(targets[0]):
+        return []
+    if use_numpy and numpy is not None:
+        return _first_impacts_numpy(movers, targets)
+    
+    tx, ty, tpx, tpy, thw, th = targets
+    entries = []
+    max_width = 0
+    for j in range(len(tx)):
+        box = (min(tx[j], tpx[j]) - thw[j], max(tx[j], tpx[j]) + thw[j],
+               min(ty[j], tpy[j]), max(ty[j], tpy[j]) + th[j])
+        entries.append((box[0], j, box))
+        if box[1] - box[0] > max_width:
+            max_width = box[1] - box[0]
+    entries.sort(key=lambda entry: (entry[0], entry[1]))
+    lefts = [entry[0] for entry in entries]
+    
+    mx, my, mpx, mpy, mhw, mh = movers
+    hits = []
+    for i in range(len(mx)):
+        box = (min(mx[i], mpx[i]) - mhw[i], max(mx[i], mpx[i]) + mhw[i],
+               min(my[i], mpy[i]), max(my[i], mpy[i]) + mh[i])
+        best_key = None
+        for k in range(bisect_left(lefts, box[0] - max_width), bisect_left(lefts, box[1])):
+            _, j, other_box = entries[k]
+            if boxes_overlap(box, other_box):
+                t = _slab_impact(
+                    (mx[i] - mpx[i]) - (tx[j] - tpx[j]), mpx[i] - tpx[j], mhw[i] + thw[j],
+                    (my[i] - mpy[i]) - (ty[j] - tpy[j]), mpy[i] - tpy[j], mh[i], th[j])
+                if t is not None and (best_key is None or (t, j) < best_key):
+                    best_key = (t, j)
+        if best_key is not None:
+            hits.append((i, best_key[1]))
+    return hits
+
+
+def _first_impacts_numpy(movers, targets):
+    mx, my, mpx, mpy, mhw, mh = movers
+    tx, ty, tpx, tpy, thw, th = targets
+    
+    # Swept boxes, as swept_bounds computes them
+    m_left = numpy.minimum(mx, mpx) - mhw
+    m_right = numpy.maximum(mx, mpx) + mhw
+    m_bottom = numpy.minimum(my, mpy)
+    m_top = numpy.maximum(my, mpy) + mh
+    t_left = numpy.minimum(tx, tpx) - thw
+    t_right = numpy.maximum(tx, tpx) + thw
+    t_bottom = numpy.minimum(ty, tpy)
+    t_top = numpy.maximum(ty, tpy) + th
+    
+    # Broad phase: each mover's candidates are a run of targets sorted by left edge
+    order = numpy.argsort(t_left, kind='stable')
+    lefts = t_left[order]
+    max_width = (t_right - t_left).max()
+    start = numpy.searchsorted(lefts, m_left - max_width, 'left')
+    counts = numpy.searchsorted(lefts, m_right, 'left') - start
+    total = int(counts.sum())
+    if total == 0:
+        return []
+    first = numpy.cumsum(counts) - counts
+    mover = numpy.repeat(numpy.arange(len(mx)), counts)
+    target = order[numpy.arange(total) - numpy.repeat(first - start, counts)]
+    
+    near = ((m_right[mover] > t_left[target]) & (m_left[mover] < t_right[target]) &
+            (m_top[mover] > t_bottom[target]) & (m_bottom[mover] < t_top[target]))
+    mover = mover[near]
+    target = target[near]
+    
+    # Narrow phase: slab test on every candidate pair, then the earliest per mover
+    t = _slab_impacts(
+        (mx - mpx)[mover] - (tx - tpx)[target], mpx[mover] - tpx[target], mhw[mover] + thw[target],
+        (my - mpy)[mover] - (ty - tpy)[target], mpy[mover] - tpy[target], mh[mover], th[target])
+    touched = t < numpy.inf
+    mover = mover[touched]
+    target = target[touched]
+    if not len(mover):
+        return []
+    ranked = numpy.lexsort((target, t[touched], mover))
+    mover = mover[ranked]
+    target = target[ranked]
+    earliest = numpy.ones(len(mover), dtype=bool)
+    earliest[1:] = mover[1:] != mover[:-1]
+    return list(zip(mover[earliest].tolist(), target[earliest].tolist()))
\ No newline at end of file
@@ -1,15 +1,72 @@
 import random
+import zlib
+from array import array
 from .sprites import Player, Enemy, Snowball
+from .store import EntityStore, EnemyView, SnowballView
+from .collision import SweepAndPrune, first_impacts, sprites_overlap, swept_bounds, time_of_impact
+from .pool import ObjectPool
+from .particles import DENSITIES, SnowParticles
+from .ai import EnemyAI
+from .waves import DEFAULT_DIFFICULTY, GROUP_GAP, SPAWN_MARGIN, WaveTable, load_wave_table
+
+
+# Collision detection strategies for check_collisions
+COLLISION_BRUTE_FORCE = 'brute'
+COLLISION_SWEEP_AND_PRUNE = 'sweep'
+
+# Points lost when an enemy snowball hits the player
+PLAYER_HIT_PENALTY = 5
 
 
 class GameEngine:
-    def __init__(self):
+    def __init__(self, seed=None, use_entity_store=False, enemy_pool_size=32,
+                 snowball_pool_size=64, snow_density='classic', difficulty=DEFAULT_DIFFICULTY):
         self.player = None
-        self.enemies = []
-        self.snowballs = []
-        self.snow_particles = []
+        
+        # Deterministic simulation: all randomness comes from self.rng and all
+        # timing from the simulation clock, never from the wall clock
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.frame = 0
+        self.sim_time = 0.0
+        
+        # Enemies and snowballs are either plain lists of sprite objects or,
+        # with use_entity_store, views over array-backed entity stores
+        self.use_entity_store = use_entity_store
+        if use_entity_store:
+            self.enemy_store = EntityStore(EnemyView)
+            self.snowball_store = EntityStore(SnowballView)
+            self.enemies = self.enemy_store.views
+            self.snowballs = self.snowball_store.views
+        else:
+            self.enemy_store = None
+            self.snowball_store = None
+            self.enemies = []
+            self.snowballs = []
+        
+        # Snowballs thrown by enemies are few, so always plain Snowball objects
+        self.enemy_snowballs = []
+        
+        # Entities killed this frame, removed together by compact_*()
+        self.dead_enemies = 0
+        self.dead_snowballs = 0
+        
+        # Recycled Enemy/Snowball objects; sizes cap how many idle objects are kept
+        self.enemy_pool = ObjectPool(Enemy, max_size=enemy_pool_size)
+        self.snowball_pool = ObjectPool(Snowball, max_size=snowball_pool_size)
+        self.enemy_pool.prefill(8, 0, 0, 35, 55)
+        self.snowball_pool.prefill(16, 0, 0, 0, 0)
+        self.snow_density = snow_density
+        self.snow = None
         self.score = 0
         self.time_remaining = 60.0
+        
+        # Match statistics
+        self.hits = 0
+        self.enemies_spawned = 0
+        self.snowballs_thrown = 0
+        self.times_hit = 0
+        
         self.game_width = 800
         self.game_height = 600
         self.ground_level = 100
@@ -20,8 +77,46 @@ class GameEngine:
             'jump': False,
             'throw': False
         }
-        self.enemy_spawn_timer = 0
-        self.enemy_spawn_interval = 2.0
+        
+        # Enemy waves: a time-sorted spawn timeline compiled from
+        # difficulty.json (see game.waves) and the index of the next event
+        self.waves = load_wave_table()
+        self.difficulty = None
+        self.spawn_timeline = ()
+        self.wave_index = 0
+        self.set_difficulty(difficulty)
+        
+        # Enemy decisions, staggered across frames (see game.ai)
+        self.ai = EnemyAI()
+        
+        # Fixed-timestep simulation, see advance()
+        self.fixed_dt = 1/60.0
+        self.max_substeps = 5
+        self.accumulator = 0.0
+        self.interpolation_alpha = 0.0
+        
+        # Snowball-enemy collision strategy, see check_collisions
+        self.collision_mode = COLLISION_SWEEP_AND_PRUNE
+        self.broad_phase = SweepAndPrune()
+        
+        # Objects notified when entities spawn or despawn (e.g. renderers)
+        self.listeners = []
+        
+        # Optional game.replay.ReplayRecorder logging inputs and state hashes
+        self.recorder = None
+        
+        # Optional game.profiler.FrameProfiler timing each update phase
+        self.profiler = None
+        self.update_phases = (
+            ('snow', self.update_snow_particles),
+            ('player', self.update_player),
+            ('ai', lambda dt: self.ai.update(self)),
+            ('enemies', self.update_enemies),
+            ('snowballs', self.update_snowballs),
+            ('spawning', self.update_enemy_spawning),
+            ('collisions', lambda dt: self.check_collisions()),
+            ('culling', lambda dt: self.cull_snowballs())
+        )
         
         self.init_snow_particles()
     
@@ -31,13 +126,66 @@ class GameEngine:
         if self.player:
             self.player.set_character_attributes(character_data)
     
+    def add_listener(self, listener):
+        """Register a listener with on_spawn(kind, entity) and on_despawn(kind, entity)"""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        """Unregister a previously added listener"""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+    
+    def notify_spawn(self, kind, entity):
+        """Tell listeners that an entity entered the game"""
+        for listener in self.listeners:
+            listener.on_spawn(kind, entity)
+    
+    def notify_despawn(self, kind, entity):
+        """Tell listeners that an entity left the game"""
+        for listener in self.listeners:
+            listener.on_despawn(kind, entity)
+    
     def reset_game(self):
         """Reset game state for a new game"""
+        if self.seed is not None:
+            # Same seed, same match
+            self.rng.seed(self.seed)
+            self.init_snow_particles()
+        self.frame = 0
+        self.sim_time = 0.0
         self.score = 0
         self.time_remaining = 60.0
-        self.enemies.clear()
-        self.snowballs.clear()
-        self.enemy_spawn_timer = 0
+        self.hits = 0
+        self.enemies_spawned = 0
+        self.snowballs_thrown = 0
+        self.times_hit = 0
+        for snowball in self.enemy_snowballs:
+            self.notify_despawn('enemy_snowball', snowball)
+            self.snowball_pool.release(snowball)
+        self.enemy_snowballs.clear()
+        for enemy in self.enemies:
+            self.notify_despawn('enemy', enemy)
+        for snowball in self.snowballs:
+            self.notify_despawn('snowball', snowball)
+        if self.use_entity_store:
+            self.enemy_store.clear()
+            self.snowball_store.clear()
+        else:
+            for enemy in self.enemies:
+                self.enemy_pool.release(enemy)
+            for snowball in self.snowballs:
+                self.snowball_pool.release(snowball)
+            self.enemies.clear()
+            self.snowballs.clear()
+        self.dead_enemies = 0
+        self.dead_snowballs = 0
+        self.wave_index = 0
+        self.accumulator = 0.0
+        self.interpolation_alpha = 0.0
+        
+        if self.player:
+            self.notify_despawn('player', self.player)
         
         # Create player
         self.player = Player(
@@ -49,60 +197,194 @@ class GameEngine:
         
         if self.character_data:
             self.player.set_character_attributes(self.character_data)
+        
+        self.notify_spawn('player', self.player)
+    
+    def pool_stats(self):
+        """Return hit/miss statistics of the enemy and snowball pools"""
+        return {
+            'enemy': self.enemy_pool.stats(),
+            'snowball': self.snowball_pool.stats()
+        }
+    
+    def add_enemy(self, enemy):
+        """Add an enemy to the game and notify listeners"""
+        if self.use_entity_store:
+            view = self.enemy_store.add_entity(enemy)
+            self.enemy_pool.release(enemy)
+            enemy = view
+        else:
+            self.enemies.append(enemy)
+        self.ai.assign_slot(enemy, self.enemies_spawned)
+        self.notify_spawn('enemy', enemy)
+        return enemy
+    
+    def add_snowball(self, snowball):
+        """Add a snowball to the game and notify listeners"""
+        if self.use_entity_store:
+            view = self.snowball_store.add_entity(snowball)
+            self.snowball_pool.release(snowball)
+            snowball = view
+        else:
+            self.snowballs.append(snowball)
+        self.notify_spawn('snowball', snowball)
+        return snowball
+    
+    def add_enemy_snowball(self, x, y, velocity_x, velocity_y):
+        """Launch a snowball thrown by an enemy and notify listeners"""
+        snowball = self.snowball_pool.acquire(x, y, velocity_x, velocity_y)
+        self.enemy_snowballs.append(snowball)
+        self.notify_spawn('enemy_snowball', snowball)
+        return snowball
+    
+    def kill_enemy(self, enemy):
+        """Mark an enemy for removal by the next compact_enemies call"""
+        if enemy.alive:
+            enemy.alive = False
+            self.dead_enemies += 1
+    
+    def kill_snowball(self, snowball):
+        """Mark a snowball for removal by the next compact_snowballs call"""
+        if snowball.alive:
+            snowball.alive = False
+            self.dead_snowballs += 1
+    
+    def compact_enemies(self):
+        """Remove all dead enemies in linear time"""
+        if not self.dead_enemies:
+            return
+        self.dead_enemies = 0
+        
+        if self.use_entity_store:
+            for enemy in self.enemy_store.remove_dead():
+                self.notify_despawn('enemy', enemy)
+            return
+        
+        enemies = self.enemies
+        alive = 0
+        for enemy in enemies:
+            if enemy.alive:
+                enemies[alive] = enemy
+                alive += 1
+            else:
+                self.notify_despawn('enemy', enemy)
+                self.enemy_pool.release(enemy)
+        del enemies[alive:]
+    
+    def compact_snowballs(self):
+        """Remove all dead snowballs in linear time"""
+        if not self.dead_snowballs:
+            return
+        self.dead_snowballs = 0
+        
+        if self.use_entity_store:
+            for snowball in self.snowball_store.remove_dead():
+                self.notify_despawn('snowball', snowball)
+            return
+        
+        snowballs = self.snowballs
+        alive = 0
+        for snowball in snowballs:
+            if snowball.alive:
+                snowballs[alive] = snowball
+                alive += 1
+            else:
+                self.notify_despawn('snowball', snowball)
+                self.snowball_pool.release(snowball)
+        del snowballs[alive:]
     
     def init_snow_particles(self):
         """Initialize background snow particles"""
-        self.snow_particles = []
-        for _ in range(30):
-            self.snow_particles.append({
-                'x': random.uniform(0, self.game_width),
-                'y': random.uniform(0, self.game_height),
-                'speed': random.uniform(20, 60),
-                'size': random.uniform(2, 4)
-            })
+        count = DENSITIES[self.snow_density]
+        seed = self.rng.getrandbits(32)
+        if self.snow is None:
+            self.snow = SnowParticles(self.game_width, self.game_height, count, seed=seed)
+        else:
+            self.snow.reset(count, seed)
+    
+    def set_snow_density(self, density):
+        """Switch the background snow to 'low', 'medium' or 'blizzard'"""
+        if density not in DENSITIES:
+            raise ValueError(f"Unknown snow density: {density}")
+        self.snow_density = density
+        self.init_snow_particles()
     
     def set_player_input(self, action, active):
         """Set player input state"""
         if action in self.player_input:
+            active = bool(active)
+            if self.recorder and self.player_input[action] != active:
+                self.recorder.on_input(self.frame, action, active)
             self.player_input[action] = active
     
+    def advance(self, frame_dt):
+        """Advance the game by real elapsed time in fixed steps.
+        
+        Leftover time is carried to the next call and exposed as
+        interpolation_alpha (0..1) for rendering between the previous and
+        current step. At most max_substeps steps run per call; any backlog
+        beyond that is dropped so a long stall cannot snowball.
+        Returns the number of steps run.
+        """
+        self.accumulator += frame_dt
+        steps = 0
+        while self.accumulator >= self.fixed_dt and steps < self.max_substeps:
+            self.update(self.fixed_dt)
+            self.accumulator -= self.fixed_dt
+            steps += 1
+        
+        if self.accumulator >= self.fixed_dt:
+            self.accumulator %= self.fixed_dt
+        
+        self.interpolation_alpha = self.accumulator / self.fixed_dt
+        return steps
+    
     def update(self, dt):
-        """Main game update loop"""
+        """Main game update loop, advancing the simulation by one step of dt"""
         # Update timer
         self.time_remaining -= dt
         if self.time_remaining <= 0:
             self.time_remaining = 0
             return  # Game over
         
-        # Update snow particles
-        self.update_snow_particles(dt)
-        
-        # Update player
-        if self.player:
-            self.update_player(dt)
-        
-        # Update enemies
-        self.update_enemies(dt)
-        
-        # Update snowballs
-        self.update_snowballs(dt)
+        # Advance the simulation clock
+        self.frame += 1
+        self.sim_time += dt
         
-        # Spawn enemies
-        self.update_enemy_spawning(dt)
+        # Snow, player, enemies, snowballs, spawning, then collisions
+        profiler = self.profiler
+        for name, phase in self.update_phases:
+            if profiler is None:
+                phase(dt)
+            else:
+                profiler.run_phase(name, phase, dt)
         
-        # Check collisions
-        self.check_collisions()
+        if self.recorder:
+            self.recorder.on_step(self)
+    
+    def state_hash(self):
+        """Return a CRC32 of the simulation state, used to verify replays"""
+        values = array('d', (self.score, self.time_remaining))
+        if self.player:
+            player = self.player
+            values.extend((player.x, player.y, player.velocity_x, player.velocity_y))
+        for enemy in self.enemies:
+            values.extend((enemy.x, enemy.y))
+        for snowball in self.snowballs:
+            values.extend((snowball.x, snowball.y))
+        for snowball in self.enemy_snowballs:
+            values.extend((snowball.x, snowball.y))
+        return zlib.crc32(values.tobytes())
     
     def update_snow_particles(self, dt):
         """Update background snow animation"""
-        for particle in self.snow_particles:
-            particle['y'] -= particle['speed'] * dt
-            if particle['y'] < 0:
-                particle['y'] = self.game_height
-                particle['x'] = random.uniform(0, self.game_width)
+        self.snow.update(dt)
     
     def update_player(self, dt):
         """Update player physics and input"""
+        if not self.player:
+            return
+        
         # Handle horizontal movement
         if self.player_input['left']:
             self.player.move_left(dt)
@@ -116,9 +398,10 @@ class GameEngine:
         # Handle throwing
         if self.player_input['throw']:
             self.player_input['throw'] = False  # Reset throw input
-            snowball = self.player.throw_snowball()
+            snowball = self.player.throw_snowball(self.sim_time, self.snowball_pool)
             if snowball:
-                self.snowballs.append(snowball)
+                self.add_snowball(snowball)
+                self.snowballs_thrown += 1
         
         # Update player physics
         self.player.update(dt)
@@ -139,81 +422,129 @@ class GameEngine:
     
     def update_enemies(self, dt):
         """Update all enemies"""
-        enemies_to_remove = []
-        
-        for enemy in self.enemies:
-            enemy.update(dt)
-            
-            # Remove enemies that have moved off screen
-            if enemy.x < -enemy.width:
-                enemies_to_remove.append(enemy)
+        if self.use_entity_store:
+            self.enemy_store.integrate(dt, ground_level=self.ground_level)
+            for enemy in self.enemy_store.find_outside(min_x=0, margin_column='width'):
+                self.kill_enemy(enemy)
+        else:
+            for enemy in self.enemies:
+                enemy.update(dt)
+                
+                # Remove enemies that have moved off screen
+                if enemy.x < -enemy.width:
+                    self.kill_enemy(enemy)
         
         # Remove off-screen enemies
-        for enemy in enemies_to_remove:
-            self.enemies.remove(enemy)
+        self.compact_enemies()
     
     def update_snowballs(self, dt):
-        """Update all snowballs"""
-        snowballs_to_remove = []
+        """Move all snowballs; leaving the field is handled by cull_snowballs"""
+        if self.use_entity_store:
+            self.snowball_store.integrate(dt)
+        else:
+            for snowball in self.snowballs:
+                snowball.update(dt)
         
-        for snowball in self.snowballs:
+        for snowball in self.enemy_snowballs:
             snowball.update(dt)
-            
-            # Remove snowballs that are off screen or hit ground
-            if (snowball.x > self.game_width + 50 or 
-                snowball.x < -50 or 
-                snowball.y <= self.ground_level):
-                snowballs_to_remove.append(snowball)
+    
+    def cull_snowballs(self):
+        """Remove snowballs that hit the ground or left the screen.
+        
+        Runs after check_collisions, so a snowball that passes through an
+        enemy and lands or flies off in the same step still gets swept
+        against it first.
+        """
+        if self.use_entity_store:
+            for snowball in self.snowball_store.find_outside(
+                    min_x=-50, max_x=self.game_width + 50, min_y=self.ground_level):
+                self.kill_snowball(snowball)
+        else:
+            for snowball in self.snowballs:
+                # Remove snowballs that are off screen or hit ground
+                if (snowball.x > self.game_width + 50 or 
+                    snowball.x < -50 or 
+                    snowball.y <= self.ground_level):
+                    self.kill_snowball(snowball)
         
         # Remove off-screen snowballs
-        for snowball in snowballs_to_remove:
-            self.snowballs.remove(snowball)
+        self.compact_snowballs()
+        
+        for snowball in self.enemy_snowballs:
+            if snowball.x < -50 or snowball.y <= self.ground_level:
+                snowball.alive = False
+        self.compact_enemy_snowballs()
+    
+    def compact_enemy_snowballs(self):
+        """Remove enemy snowballs that hit something or left the field"""
+        enemy_snowballs = self.enemy_snowballs
+        alive = 0
+        for snowball in enemy_snowballs:
+            if snowball.alive:
+                enemy_snowballs[alive] = snowball
+                alive += 1
+            else:
+                self.notify_despawn('enemy_snowball', snowball)
+                self.snowball_pool.release(snowball)
+        del enemy_snowballs[alive:]
+    
+    def set_difficulty(self, difficulty):
+        """Switch to another difficulty's waves, continuing from the current time"""
+        self.spawn_timeline = self.waves.timeline(difficulty)
+        self.difficulty = difficulty
+        self.wave_index = WaveTable.resume_index(self.spawn_timeline, self.sim_time)
     
     def update_enemy_spawning(self, dt):
-        """Handle enemy spawning"""
-        self.enemy_spawn_timer += dt
-        
-        if self.enemy_spawn_timer >= self.enemy_spawn_interval:
-            self.enemy_spawn_timer = 0
-            
-            # Spawn new enemy
-            enemy = Enemy(
-                x=self.game_width + 50,
-                y=self.ground_level,
-                width=35,
-                height=55
-            )
-            self.enemies.append(enemy)
-            
-            # Adjust spawn rate based on time
-            if self.time_remaining < 30:
-                self.enemy_spawn_interval = 1.5
-            elif self.time_remaining < 45:
-                self.enemy_spawn_interval = 1.8
+        """Spawn the enemies of every wave event that has come due"""
+        timeline = self.spawn_timeline
+        while self.wave_index < len(timeline) and timeline[self.wave_index].time <= self.sim_time:
+            event = timeline[self.wave_index]
+            self.wave_index += 1
+            for i in range(event.count):
+                self.spawn_enemy(event.enemy, i)
+    
+    def spawn_enemy(self, kind='walker', slot=0):
+        """Spawn an enemy of the given type past the right edge, slot places it within a group"""
+        enemy_type = self.waves.enemy_types[kind]
+        width = enemy_type['width']
+        enemy = self.enemy_pool.acquire(
+            self.game_width + SPAWN_MARGIN + slot * (width + GROUP_GAP),
+            self.ground_level,
+            width,
+            enemy_type['height']
+        )
+        enemy.velocity_x = -enemy_type['speed']
+        enemy = self.add_enemy(enemy)
+        self.enemies_spawned += 1
+        return enemy
     
     def check_collisions(self):
         """Check for collisions between game objects"""
         # Check snowball-enemy collisions
-        snowballs_to_remove = []
-        enemies_to_remove = []
+        if self.collision_mode == COLLISION_BRUTE_FORCE:
+            hits = self.find_hits_brute_force()
+        else:
+            hits = self.find_hits_sweep_and_prune()
         
-        for snowball in self.snowballs:
-            for enemy in self.enemies:
-                if self.check_aabb_collision(snowball, enemy):
-                    # Hit!
-                    snowballs_to_remove.append(snowball)
-                    enemies_to_remove.append(enemy)
-                    self.score += 10
-                    break
+        for snowball, enemy in hits:
+            # Hit!
+            self.kill_snowball(snowball)
+            self.kill_enemy(enemy)
+            self.score += 10
+            self.hits += 1
         
         # Remove hit snowballs and enemies
-        for snowball in snowballs_to_remove:
-            if snowball in self.snowballs:
-                self.snowballs.remove(snowball)
+        self.compact_snowballs()
+        self.compact_enemies()
         
-        for enemy in enemies_to_remove:
-            if enemy in self.enemies:
-                self.enemies.remove(enemy)
+        # Enemy snowballs hitting the player cost points
+        if self.player and self.enemy_snowballs:
+            for snowball in self.enemy_snowballs:
+                if time_of_impact(snowball, self.player) is not None:
+                    snowball.alive = False
+                    self.score = max(0, self.score - PLAYER_HIT_PENALTY)
+                    self.times_hit += 1
+            self.compact_enemy_snowballs()
         
         # Check player-enemy collisions (optional - could reduce score or end game)
         if self.player:
@@ -222,21 +553,47 @@ class GameEngine:
                     # Player hit by enemy - could implement damage/game over logic here
                     pass
     
+    def find_hits_brute_force(self):
+        """Sweep every snowball against every enemy, O(snowballs * enemies).
+        
+        Collisions are continuous: a snowball hits the enemy it touched
+        first anywhere along its path over the last step, not just where it
+        ended up, so fast snowballs and long steps cannot skip over enemies.
+        """
+        hits = []
+        for snowball in self.snowballs:
+            best_time = None
+            best = None
+            for enemy in self.enemies:
+                t = time_of_impact(snowball, enemy)
+                if t is not None and (best_time is None or t < best_time):
+                    best_time = t
+                    best = enemy
+            if best is not None:
+                hits.append((snowball, best))
+        return hits
+    
+    def find_hits_sweep_and_prune(self):
+        """Find the same hits as brute force, testing only enemies near each snowball"""
+        hits = []
+        if not self.snowballs or not self.enemies:
+            return hits
+        
+        if self.use_entity_store:
+            # Whole columns at once; views only for the pairs that hit
+            snowballs = self.snowball_store.views
+            enemies = self.enemy_store.views
+            pairs = first_impacts(self.snowball_store.boxes(), self.enemy_store.boxes(),
+                                  self.snowball_store.use_numpy)
+            return [(snowballs[i], enemies[j]) for i, j in pairs]
+        
+        self.broad_phase.build(self.enemies, swept_bounds)
+        for snowball in self.snowballs:
+            enemy = self.broad_phase.first_impact(snowball)
+            if enemy is not None:
+                hits.append((snowball, enemy))
+        return hits
+    
     def check_aabb_collision(self, obj1, obj2):
-        """Check axis-aligned bounding box collision between two objects"""
-        # Get bounding boxes
-        obj1_left = obj1.x - getattr(obj1, 'width', getattr(obj1, 'radius', 10)) / 2
-        obj1_right = obj1.x + getattr(obj1, 'width', getattr(obj1, 'radius', 10)) / 2
-        obj1_top = obj1.y + getattr(obj1, 'height', getattr(obj1, 'radius', 10))
-        obj1_bottom = obj1.y
-        
-        obj2_left = obj2.x - getattr(obj2, 'width', getattr(obj2, 'radius', 10)) / 2
-        obj2_right = obj2.x + getattr(obj2, 'width', getattr(obj2, 'radius', 10)) / 2
-        obj2_top = obj2.y + getattr(obj2, 'height', getattr(obj2, 'radius', 10))
-        obj2_bottom = obj2.y
-        
-        # Check collision
-        return (obj1_right > obj2_left and 
-                obj1_left < obj2_right and 
-                obj1_top > obj2_bottom and 
-                obj1_bottom < obj2_top)
\ No newline at end of file
+        """Check axis-aligned bounding box collision between two sprites"""
+        return sprites_overlap(obj1, obj2)
\ No newline at end of file
@@ -0,0 +1,82 @@
+import random
+from array import array
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, fall back to the array module
+    numpy = None
+
+
+# Particle counts for the snow density setting; 'classic' is the original
+# in-game snowfall, 'low' the original home screen one
+DENSITIES = {
+    'classic': 30,
+    'low': 50,
+    'medium': 500,
+    'blizzard': 3000
+}
+
+
+class SnowParticles:
+    """Falling snow kept in contiguous x, y, speed and size arrays.
+    
+    With NumPy every update moves and wraps all particles in a handful of
+    vectorized operations; without it the same arrays are updated in a loop.
+    Particles that fall below zero re-enter at the top at a random x.
+    Both paths draw from one random.Random in the same order, so a seed
+    gives the same snow with or without NumPy.
+    """
+    
+    def __init__(self, width, height, count=DENSITIES['classic'], speed_range=(20, 60),
+                 size_range=(2, 4), seed=None, use_numpy=True):
+        self.width = width
+        self.height = height
+        self.speed_range = speed_range
+        self.size_range = size_range
+        self.use_numpy = use_numpy and numpy is not None
+        self.count = 0
+        self.reset(count, seed)
+    
+    def __len__(self):
+        return self.count
+    
+    def reset(self, count=None, seed=None):
+        """Scatter count particles over the area; a seed makes the layout repeatable"""
+        if count is not None:
+            self.count = count
+        n = self.count
+        
+        rng = self.rng = random.Random(seed)
+        column = numpy.array if self.use_numpy else lambda values: array('d', values)
+        self.x = column([rng.uniform(0, self.width) for _ in range(n)])
+        self.y = column([rng.uniform(0, self.height) for _ in range(n)])
+        self.speed = column([rng.uniform(*self.speed_range) for _ in range(n)])
+        self.size = column([rng.uniform(*self.size_range) for _ in range(n)])
+    
+    def set_density(self, density):
+        """Switch to one of DENSITIES ('classic', 'low', 'medium', 'blizzard')"""
+        self.reset(DENSITIES[density])
+    
+    def set_bounds(self, width, height):
+        """Change the area particles fall through and scatter them over it"""
+        self.width = width
+        self.height = height
+        self.reset()
+    
+    def update(self, dt):
+        if self.use_numpy:
+            y = self.y
+            y -= self.speed * dt
+            wrapped = numpy.flatnonzero(y < 0)
+            if len(wrapped):
+                # Same draws, in the same particle order, as the loop below
+                y[wrapped] = self.height
+                self.x[wrapped] = [self.rng.uniform(0, self.width) for _ in wrapped]
+            return
+        
+        x, y, speed = self.x, self.y, self.speed
+        for i in range(self.count):
+            y[i] -= speed[i] * dt
+            if y[i] < 0:
+                y[i] = self.height
+                x[i] = self.rng.uniform(0, self.width)
\ No newline at end of file
@@ -0,0 +1,65 @@
+class ObjectPool:
+    """Recycles game objects so spawning does not allocate.
+    
+    Pooled classes provide a `reset(*args)` method taking the same arguments
+    as their constructor; acquire() calls it on recycled objects. Released
+    objects beyond `max_size` are left to the garbage collector.
+    """
+    
+    def __init__(self, factory, max_size=64, on_acquire=None, on_release=None):
+        self.factory = factory
+        self.max_size = max_size
+        self.on_acquire = on_acquire
+        self.on_release = on_release
+        self.free = []
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+    
+    def prefill(self, count, *args):
+        """Create objects up front so the first spawns are hits"""
+        while len(self.free) < min(count, self.max_size):
+            self.free.append(self.factory(*args))
+    
+    def acquire(self, *args):
+        """Return a recycled object reset with args, or a new one"""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.hits += 1
+        else:
+            obj = self.factory(*args)
+            self.misses += 1
+        
+        if self.on_acquire:
+            self.on_acquire(obj)
+        return obj
+    
+    def release(self, obj):
+        """Give an object back to the pool once nothing references it"""
+        if self.on_release:
+            self.on_release(obj)
+        
+        if len(self.free) < self.max_size:
+            self.free.append(obj)
+        else:
+            self.discarded += 1
+    
+    def stats(self):
+        """Return hit/miss counters and current pool usage"""
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'discarded': self.discarded,
+            'free': len(self.free),
+            'max_size': self.max_size
+        }
+    
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
\ No newline at end of file
@@ -0,0 +1,258 @@
+import gc
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+def percentile(sorted_values, fraction):
+    """Return the value at fraction (0..1) of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """Opt-in per-phase frame profiler.
+    
+    Keeps the last `window` frames of phase timings, frame times, entity
+    counts and garbage collections, and records trace events that can be
+    exported as a Chrome trace (chrome://tracing, Perfetto).
+    """
+    
+    def __init__(self, window=300, max_trace_events=50000):
+        self.window = window
+        self.clock = time.perf_counter
+        self.frame_times = deque(maxlen=window)
+        self.entity_counts = deque(maxlen=window)
+        self.gc_counts = deque(maxlen=window)
+        self.phase_times = {}
+        self.trace_events = deque(maxlen=max_trace_events)
+        
+        self.frame_start = None
+        self.frame_phases = {}
+        self.frame_gc = 0
+        self.gc_installed = False
+        self.pid = os.getpid()
+    
+    def enable(self):
+        """Start counting garbage collections"""
+        if not self.gc_installed:
+            gc.callbacks.append(self.on_gc)
+            self.gc_installed = True
+    
+    def disable(self):
+        if self.gc_installed:
+            gc.callbacks.remove(self.on_gc)
+            self.gc_installed = False
+    
+    def on_gc(self, phase, info):
+        if phase == 'start':
+            self.frame_gc += 1
+    
+    def begin_frame(self):
+        self.frame_start = self.clock()
+        self.frame_phases = {}
+        self.frame_gc = 0
+    
+    def run_phase(self, name, function, *args):
+        """Call function(*args) and add its duration to the current frame"""
+        start = self.clock()
+        result = function(*args)
+        self.add_phase(name, start, self.clock())
+        return result
+    
+    def add_phase(self, name, start, end):
+        duration = end - start
+        self.frame_phases[name] = self.frame_phases.get(name, 0.0) + duration
+        self.trace_events.append((name, start, duration))
+    
+    def end_frame(self, entity_count=0):
+        if self.frame_start is None:
+            return
+        end = self.clock()
+        self.trace_events.append(('frame', self.frame_start, end - self.frame_start))
+        self.frame_times.append(end - self.frame_start)
+        self.entity_counts.append(entity_count)
+        self.gc_counts.append(self.frame_gc)
+        
+        # Phases that did not run this frame count as zero
+        for name in set(self.phase_times) | set(self.frame_phases):
+            samples = self.phase_times.get(name)
+            if samples is None:
+                samples = self.phase_times[name] = deque(maxlen=self.window)
+            samples.append(self.frame_phases.get(name, 0.0))
+        self.frame_start = None
+    
+    def summary(self):
+        """Return rolling p50/p95/p99 (milliseconds) for frames and every phase"""
+        def stats(samples):
+            ordered = sorted(samples)
+            return {
+                'p50': percentile(ordered, 0.50) * 1000,
+                'p95': percentile(ordered, 0.95) * 1000,
+                'p99': percentile(ordered, 0.99) * 1000
+            }
+        
+        frames = len(self.frame_times)
+        return {
+            'frames': frames,
+            'frame': stats(self.frame_times),
+            'phases': {name: stats(samples) for name, samples in self.phase_times.items()},
+            'entities': self.entity_counts[-1] if self.entity_counts else 0,
+            'gc_per_frame': sum(self.gc_counts) / frames if frames else 0.0
+        }
+    
+    def export_chrome_trace(self, path):
+        """Write recorded events in Chrome trace event JSON format"""
+        events = [{
+            'name': name,
+            'ph': 'X',
+            'ts': start * 1e6,
+            'dur': duration * 1e6,
+            'pid': self.pid,
+            'tid': 0 if name == 'frame' else 1
+        } for name, start, duration in self.trace_events]
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+
+class _TimedLoader:
+    """Loader wrapper that reports how long exec_module took"""
+    
+    def __init__(self, loader, profiler):
+        self.loader = loader
+        self.profiler = profiler
+    
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+    
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+    
+    def exec_module(self, module):
+        self.profiler.time_import(module.__name__, self.loader.exec_module, module)
+
+
+class StartupProfiler:
+    """Cold start profiler: module import times, timed sections and marks.
+    
+    Enabled with the KARTOPU_PROFILE_STARTUP environment variable or the
+    --profile-startup[=path] command line flag; all times are relative to
+    the moment the profiler was created.
+    """
+    
+    ENV_VAR = 'KARTOPU_PROFILE_STARTUP'
+    FLAG = '--profile-startup'
+    DEFAULT_PATH = 'startup_profile.txt'
+    DEFAULT_PREFIXES = ('screens', 'game', 'render', 'kivymd')
+    
+    def __init__(self, path=DEFAULT_PATH, prefixes=DEFAULT_PREFIXES):
+        self.path = path
+        self.prefixes = tuple(prefixes)
+        self.clock = time.perf_counter
+        self.start = self.clock()
+        self.imports = []   # (module, cumulative seconds, self seconds)
+        self.sections = []  # (name, seconds)
+        self.marks = []     # (name, seconds since start)
+        self.local = threading.local()
+    
+    @classmethod
+    def from_command_line(cls, argv=None, environ=None):
+        """Return a profiler if requested, removing the flag from argv"""
+        argv = sys.argv if argv is None else argv
+        environ = os.environ if environ is None else environ
+        
+        path = None
+        for arg in list(argv[1:]):
+            if arg == cls.FLAG or arg.startswith(cls.FLAG + '='):
+                argv.remove(arg)
+                path = arg.partition('=')[2] or cls.DEFAULT_PATH
+        
+        value = environ.get(cls.ENV_VAR, '')
+        if path is None and value and value != '0':
+            path = cls.DEFAULT_PATH if value == '1' else value
+        return cls(path) if path else None
+    
+    # Imports
+    
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+    
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+    
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname.split('.')[0] not in self.prefixes:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+    
+    def time_import(self, name, function, *args):
+        # Children are tracked per thread so imports on worker threads do not mix in
+        stack = self.local.__dict__.setdefault('stack', [])
+        stack.append(0.0)
+        start = self.clock()
+        try:
+            function(*args)
+        finally:
+            cumulative = self.clock() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += cumulative
+            self.imports.append((name, cumulative, cumulative - children))
+    
+    # Sections and marks
+    
+    @contextmanager
+    def section(self, label):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.sections.append((label, self.clock() - start))
+    
+    def measure(self, label, function, *args, **kwargs):
+        with self.section(label):
+            return function(*args, **kwargs)
+    
+    def mark(self, name):
+        self.marks.append((name, self.clock() - self.start))
+    
+    # Report
+    
+    def report(self):
+        lines = ["Kar Topu Savaşı startup profile", ""]
+        
+        lines.append("Milestones (ms since start)")
+        for name, elapsed in self.marks:
+            lines.append(f"  {elapsed * 1000:9.1f}  {name}")
+        
+        lines += ["", "Sections (ms, slowest first)"]
+        for name, duration in sorted(self.sections, key=lambda item: item[1], reverse=True):
+            lines.append(f"  {duration * 1000:9.1f}  {name}")
+        
+        lines += ["", "Imports (cumulative / self ms, slowest first)"]
+        for name, cumulative, own in sorted(self.imports, key=lambda item: item[1], reverse=True):
+            lines.append(f"  {cumulative * 1000:9.1f} {own * 1000:9.1f}  {name}")
+        return '\n'.join(lines) + '\n'
+    
+    def write_report(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(self.report())
+        return self.path
\ No newline at end of file
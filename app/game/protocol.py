@@ -0,0 +1,190 @@
+import struct
+
+
+# Wire format of the session server (game/server.py). Each seated client
+# plays a solo session; its snapshots describe that session alone.
+
+# Client -> server
+MSG_JOIN = 1      # room name, character name
+MSG_INPUT = 2     # action index, pressed
+MSG_ACK = 3       # newest snapshot frame the client has applied
+# Server -> client
+MSG_SNAPSHOT = 4  # state, delta-encoded against an acknowledged snapshot
+
+ACTIONS = ('left', 'right', 'jump', 'throw')
+KINDS = ('player', 'enemy', 'snowball', 'enemy_snowball')
+
+# Positions are sent as signed 16-bit multiples of 1/8 px (±4096 px)
+POSITION_SCALE = 8
+POSITION_LIMIT = 32767
+NO_BASELINE = 0xFFFFFFFF
+
+# Entity ids are unsigned 16-bit, so a session holds at most this many at once
+ENTITY_IDS = 0x10000
+
+# Entity record flags: kind in the low bits, then how x/y are stored
+FLAG_KIND = 0x03
+FLAG_DELTA = 0x04  # x/y as signed bytes relative to the baseline
+
+LENGTH = struct.Struct('>H')
+INPUT = struct.Struct('>BBB')
+ACK = struct.Struct('>BI')
+SNAPSHOT_HEADER = struct.Struct('>BIIiHHHH')  # type, frame, baseline, score, hits, time, removed, entities
+ENTITY_ID = struct.Struct('>HB')
+FULL_POSITION = struct.Struct('>hh')
+DELTA_POSITION = struct.Struct('>bb')
+
+
+def quantize(value):
+    return max(-POSITION_LIMIT, min(POSITION_LIMIT, round(value * POSITION_SCALE)))
+
+
+def dequantize(value):
+    return value / POSITION_SCALE
+
+
+def frame_message(payload):
+    """Prefix a payload with its length for stream transports such as TCP"""
+    return LENGTH.pack(len(payload)) + payload
+
+
+async def read_message(reader):
+    """Read one length-prefixed payload from an asyncio StreamReader"""
+    size, = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+    return await reader.readexactly(size)
+
+
+def _pack_text(text):
+    data = text.encode('utf-8')
+    if len(data) > 255:
+        raise ValueError(f"Text too long to send: {text[:20]}...")
+    return bytes((len(data),)) + data
+
+
+def encode_join(room, character):
+    return bytes((MSG_JOIN,)) + _pack_text(room) + _pack_text(character)
+
+
+def encode_input(action, active):
+    return INPUT.pack(MSG_INPUT, ACTIONS.index(action), 1 if active else 0)
+
+
+def encode_ack(frame):
+    return ACK.pack(MSG_ACK, frame)
+
+
+def decode_client_message(payload):
+    """Return (MSG_JOIN, room, character), (MSG_INPUT, action, active) or (MSG_ACK, frame)"""
+    if not payload:
+        raise ValueError("Empty message")
+    kind = payload[0]
+    if kind == MSG_JOIN:
+        room_end = 2 + payload[1] if len(payload) > 1 else 0
+        if not 2 <= room_end < len(payload) or room_end + 1 + payload[room_end] != len(payload):
+            raise ValueError("Malformed join message")
+        room = payload[2:room_end].decode('utf-8')
+        character = payload[room_end + 1:].decode('utf-8')
+        return kind, room, character
+    if kind == MSG_INPUT:
+        if len(payload) != INPUT.size:
+            raise ValueError(f"Input message of {len(payload)} bytes, expected {INPUT.size}")
+        _, action, active = INPUT.unpack(payload)
+        if action >= len(ACTIONS):
+            raise ValueError(f"Unknown action: {action}")
+        return kind, ACTIONS[action], bool(active)
+    if kind == MSG_ACK:
+        if len(payload) != ACK.size:
+            raise ValueError(f"Ack message of {len(payload)} bytes, expected {ACK.size}")
+        return ACK.unpack(payload)
+    raise ValueError(f"Unknown message type: {kind}")
+
+
+def encode_snapshot(frame, state, score, hits, time_remaining, baseline_frame=None, baseline=None):
+    """Encode a quantized state, only sending what changed since baseline.
+    
+    state and baseline map entity id -> (kind index, x, y) in quantized
+    units. Without a baseline every entity is sent in full. Entities the
+    baseline has but state lacks are listed as removed; moves that fit in a
+    signed byte are sent as deltas.
+    """
+    baseline = baseline or {}
+    removed = [entity_id for entity_id in baseline if entity_id not in state]
+    records = []
+    for entity_id, entity in state.items():
+        previous = baseline.get(entity_id)
+        if entity == previous:
+            continue
+        kind, x, y = entity
+        if previous is not None and previous[0] == kind:
+            dx = x - previous[1]
+            dy = y - previous[2]
+            if -128 <= dx <= 127 and -128 <= dy <= 127:
+                records.append(ENTITY_ID.pack(entity_id, kind | FLAG_DELTA) +
+                               DELTA_POSITION.pack(dx, dy))
+                continue
+        records.append(ENTITY_ID.pack(entity_id, kind) + FULL_POSITION.pack(x, y))
+    
+    header = SNAPSHOT_HEADER.pack(
+        MSG_SNAPSHOT, frame, NO_BASELINE if baseline_frame is None else baseline_frame,
+        score, min(hits, 0xFFFF), min(round(time_remaining * 10), 0xFFFF),
+        len(removed), len(records))
+    return b''.join([header, struct.pack(f'>{len(removed)}H', *removed)] + records)
+
+
+class SnapshotDecoder:
+    """Client side of encode_snapshot: rebuilds full states from deltas.
+    
+    Keeps the last `history` decoded states so a snapshot can be applied to
+    whichever acknowledged baseline the server chose.
+    """
+    
+    def __init__(self, history=32):
+        self.history = history
+        self.states = {}
+        self.frame = None
+        self.state = {}
+        self.score = 0
+        self.hits = 0
+        self.time_remaining = 0.0
+    
+    def apply(self, payload):
+        """Decode a snapshot and return its frame; raises KeyError for an unknown baseline"""
+        (kind, frame, baseline_frame, score, hits, time_remaining,
+         removed, count) = SNAPSHOT_HEADER.unpack_from(payload)
+        if kind != MSG_SNAPSHOT:
+            raise ValueError(f"Not a snapshot: {kind}")
+        
+        state = {} if baseline_frame == NO_BASELINE else dict(self.states[baseline_frame])
+        offset = SNAPSHOT_HEADER.size
+        for entity_id in struct.unpack_from(f'>{removed}H', payload, offset):
+            del state[entity_id]
+        offset += removed * 2
+        
+        for _ in range(count):
+            entity_id, flags = ENTITY_ID.unpack_from(payload, offset)
+            offset += ENTITY_ID.size
+            if flags & FLAG_DELTA:
+                dx, dy = DELTA_POSITION.unpack_from(payload, offset)
+                offset += DELTA_POSITION.size
+                _, x, y = state[entity_id]
+                state[entity_id] = (flags & FLAG_KIND, x + dx, y + dy)
+            else:
+                x, y = FULL_POSITION.unpack_from(payload, offset)
+                offset += FULL_POSITION.size
+                state[entity_id] = (flags & FLAG_KIND, x, y)
+        
+        self.states[frame] = state
+        for old in [f for f in self.states if f <= frame - self.history]:
+            del self.states[old]
+        self.frame = frame
+        self.state = state
+        self.score = score
+        self.hits = hits
+        self.time_remaining = time_remaining / 10
+        return frame
+    
+    def positions(self, kind):
+        """(x, y) in pixels of every entity of a kind (one of KINDS)"""
+        index = KINDS.index(kind)
+        return [(dequantize(x), dequantize(y))
+                for entity_kind, x, y in self.state.values() if entity_kind == index]
\ No newline at end of file
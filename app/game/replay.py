@@ -0,0 +1,198 @@
+import json
+import struct
+from array import array
+
+from .engine import GameEngine
+from .waves import DEFAULT_DIFFICULTY
+
+
+# Binary layout (little endian):
+#   header      magic, version, seed, fixed_dt, frame count
+#   character   u16 length + UTF-8 JSON
+#   difficulty  u16 length + UTF-8 name
+#   events      u32 count + per event: varint frame delta, u8 action/state code
+#   hashes      u16 interval, u32 count + u32 state hash per checked frame
+MAGIC = b'KTRP'
+VERSION = 3  # Bumped when the simulation changes; v2 added enemy AI, v3 waves
+HEADER = struct.Struct('<4sBqdI')
+U16 = struct.Struct('<H')
+U32 = struct.Struct('<I')
+
+# Input actions, encoded as code = index << 1 | state
+ACTIONS = ('left', 'right', 'jump', 'throw')
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Replay:
+    """A recorded match: seed, character, input edges and state hashes"""
+    
+    def __init__(self, seed, fixed_dt, character, frames=0, events=None,
+                 hash_interval=1, hashes=None, difficulty=DEFAULT_DIFFICULTY):
+        self.seed = seed
+        self.fixed_dt = fixed_dt
+        self.character = character
+        self.difficulty = difficulty
+        self.frames = frames
+        self.events = events if events is not None else []  # (frame, action, state)
+        self.hash_interval = hash_interval
+        self.hashes = hashes if hashes is not None else array('I')
+    
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, self.fixed_dt, self.frames))
+        
+        character = json.dumps(self.character, ensure_ascii=False).encode('utf-8')
+        out += U16.pack(len(character)) + character
+        
+        difficulty = self.difficulty.encode('utf-8')
+        out += U16.pack(len(difficulty)) + difficulty
+        
+        out += U32.pack(len(self.events))
+        last_frame = 0
+        for frame, action, state in self.events:
+            _write_varint(out, frame - last_frame)
+            out.append(ACTIONS.index(action) << 1 | int(state))
+            last_frame = frame
+        
+        hashes = array('I', self.hashes)
+        if struct.pack('=I', 1) != U32.pack(1):
+            hashes.byteswap()
+        out += U16.pack(self.hash_interval) + U32.pack(len(hashes)) + hashes.tobytes()
+        return bytes(out)
+    
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, fixed_dt, frames = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a Kar Topu replay or unsupported version")
+        offset = HEADER.size
+        
+        (length,) = U16.unpack_from(data, offset)
+        offset += U16.size
+        character = json.loads(data[offset:offset + length].decode('utf-8'))
+        offset += length
+        
+        (length,) = U16.unpack_from(data, offset)
+        offset += U16.size
+        difficulty = data[offset:offset + length].decode('utf-8')
+        offset += length
+        
+        (count,) = U32.unpack_from(data, offset)
+        offset += U32.size
+        events = []
+        frame = 0
+        for _ in range(count):
+            delta, offset = _read_varint(data, offset)
+            frame += delta
+            code = data[offset]
+            offset += 1
+            events.append((frame, ACTIONS[code >> 1], bool(code & 1)))
+        
+        (hash_interval,) = U16.unpack_from(data, offset)
+        (count,) = U32.unpack_from(data, offset + U16.size)
+        offset += U16.size + U32.size
+        hashes = array('I')
+        hashes.frombytes(data[offset:offset + count * hashes.itemsize])
+        if struct.pack('=I', 1) != U32.pack(1):
+            hashes.byteswap()
+        
+        return cls(seed, fixed_dt, character, frames, events, hash_interval, hashes,
+                   difficulty)
+    
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+    
+    def play(self, verify=True, engine=None):
+        """Re-run the match headlessly at full speed.
+        
+        Returns (engine, first_mismatch) where first_mismatch is the first
+        frame whose state hash differs from the recording, or None.
+        """
+        if engine is None:
+            engine = GameEngine(seed=self.seed)
+        engine.seed = self.seed
+        engine.fixed_dt = self.fixed_dt
+        engine.set_character(self.character)
+        engine.set_difficulty(self.difficulty)
+        engine.reset_game()
+        for action in ACTIONS:
+            engine.set_player_input(action, False)
+        
+        events = self.events
+        next_event = 0
+        checked = 0
+        while engine.frame < self.frames and engine.time_remaining > 0:
+            while next_event < len(events) and events[next_event][0] <= engine.frame:
+                _, action, state = events[next_event]
+                engine.set_player_input(action, state)
+                next_event += 1
+            
+            engine.update(self.fixed_dt)
+            
+            if verify and engine.frame % self.hash_interval == 0 and checked < len(self.hashes):
+                if engine.state_hash() != self.hashes[checked]:
+                    return engine, engine.frame
+                checked += 1
+        return engine, None
+
+
+class ReplayRecorder:
+    """Records input edges and state hashes of a running engine.
+    
+    Attach after reset_game(); the engine must have a seed for the match
+    to be reproducible.
+    """
+    
+    def __init__(self, hash_interval=1):
+        self.hash_interval = hash_interval
+        self.replay = None
+        self.engine = None
+    
+    def attach(self, engine):
+        if engine.seed is None:
+            raise ValueError("Replays need a seeded engine")
+        self.engine = engine
+        self.replay = Replay(engine.seed, engine.fixed_dt, engine.character_data or {},
+                             hash_interval=self.hash_interval, difficulty=engine.difficulty)
+        engine.recorder = self
+        
+        # Inputs already held when recording starts
+        for action in ACTIONS:
+            if engine.player_input[action]:
+                self.on_input(engine.frame, action, True)
+    
+    def detach(self):
+        if self.engine is not None and self.engine.recorder is self:
+            self.engine.recorder = None
+        self.engine = None
+    
+    def on_input(self, frame, action, active):
+        self.replay.events.append((frame, action, active))
+    
+    def on_step(self, engine):
+        self.replay.frames = engine.frame
+        if engine.frame % self.hash_interval == 0:
+            self.replay.hashes.append(engine.state_hash())
\ No newline at end of file
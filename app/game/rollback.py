@@ -0,0 +1,278 @@
+import heapq
+import random
+from array import array
+from itertools import chain
+from operator import attrgetter
+
+try:
+    import numpy
+except ImportError:  # Optional, store-backed entities then go field by field
+    numpy = None
+
+
+# Engine attributes a step reads or writes, saved as plain Python values
+ENGINE_FIELDS = ('frame', 'sim_time', 'score', 'time_remaining', 'hits',
+                 'enemies_spawned', 'snowballs_thrown', 'times_hit',
+                 'wave_index')
+PLAYER_FIELDS = ('x', 'y', 'prev_x', 'prev_y', 'velocity_x', 'velocity_y',
+                 'on_ground', 'last_throw_time')
+
+# Enemies and snowballs are packed into one flat array of floats per kind
+ENEMY_FIELDS = ('x', 'y', 'prev_x', 'prev_y', 'velocity_x', 'velocity_y',
+                'width', 'height', 'last_throw_time', 'think_slot')
+SNOWBALL_FIELDS = ('x', 'y', 'prev_x', 'prev_y', 'velocity_x', 'velocity_y', 'radius')
+
+_engine_values = attrgetter(*ENGINE_FIELDS)
+_player_values = attrgetter(*PLAYER_FIELDS)
+_enemy_values = attrgetter(*ENEMY_FIELDS)
+_snowball_values = attrgetter(*SNOWBALL_FIELDS)
+
+
+def _copy(values):
+    return values.copy() if hasattr(values, 'copy') else array(values.typecode, values)
+
+
+class EngineState:
+    """Compact copy of everything GameEngine.update depends on.
+    
+    Sprites are flattened into float arrays instead of being deep-copied, so
+    saving allocates a handful of objects regardless of the entity count.
+    Background snow positions are kept so it does not jump on a rollback.
+    """
+    
+    __slots__ = ('frame', 'values', 'inputs', 'rng_state', 'player',
+                 'enemies', 'snowballs', 'enemy_snowballs', 'snow')
+    
+    def __init__(self, engine):
+        self.frame = engine.frame
+        self.values = _engine_values(engine)
+        self.inputs = tuple(engine.player_input.items())
+        self.rng_state = engine.rng.getstate()
+        self.player = _player_values(engine.player) if engine.player else None
+        self.enemies = _pack(engine.enemies, engine.enemy_store, ENEMY_FIELDS, _enemy_values)
+        self.snowballs = _pack(engine.snowballs, engine.snowball_store, SNOWBALL_FIELDS,
+                               _snowball_values)
+        self.enemy_snowballs = _pack(engine.enemy_snowballs, None, SNOWBALL_FIELDS,
+                                     _snowball_values)
+        snow = engine.snow
+        self.snow = (_copy(snow.x), _copy(snow.y)) if snow is not None else None
+    
+    def restore(self, engine):
+        """Put the engine back into this state"""
+        for name, value in zip(ENGINE_FIELDS, self.values):
+            setattr(engine, name, value)
+        engine.player_input.update(self.inputs)
+        engine.rng.setstate(self.rng_state)
+        
+        if self.player is not None:
+            player = engine.player
+            for name, value in zip(PLAYER_FIELDS, self.player):
+                setattr(player, name, value)
+        
+        _restore_entities(engine, 'enemy', engine.enemies, ENEMY_FIELDS, self.enemies,
+                          engine.enemy_pool, engine.enemy_store,
+                          lambda x, y, values: (x, y, values[6], values[7]))
+        _restore_entities(engine, 'snowball', engine.snowballs, SNOWBALL_FIELDS, self.snowballs,
+                          engine.snowball_pool, engine.snowball_store,
+                          lambda x, y, values: (x, y, values[4], values[5], values[6]))
+        _restore_entities(engine, 'enemy_snowball', engine.enemy_snowballs, SNOWBALL_FIELDS,
+                          self.enemy_snowballs, engine.snowball_pool, None,
+                          lambda x, y, values: (x, y, values[4], values[5], values[6]))
+        engine.dead_enemies = 0
+        engine.dead_snowballs = 0
+        
+        snow = engine.snow
+        if self.snow is not None and snow is not None and len(snow) == len(self.snow[0]):
+            snow.x[:] = self.snow[0]
+            snow.y[:] = self.snow[1]
+
+
+def _pack(entities, store, fields, values_of):
+    """Flatten entities into one float array, fields entity by entity"""
+    packed = array('d')
+    if store is not None and store.use_numpy and numpy is not None:
+        # Interleave the store's columns in one go instead of per entity
+        n = store.count
+        packed.frombytes(numpy.column_stack([store.columns[name][:n] for name in fields]).tobytes())
+    else:
+        packed.extend(chain.from_iterable(map(values_of, entities)))
+    return packed
+
+
+def _write_columns(store, fields, values, count):
+    """Write packed entity fields straight into the first count rows of a store"""
+    columns = store.columns
+    if store.use_numpy and numpy is not None:
+        rows = numpy.frombuffer(values, dtype=numpy.float64).reshape(count, len(fields))
+        for i, name in enumerate(fields):
+            columns[name][:count] = rows[:, i]
+        columns['alive'][:count] = 1
+    else:
+        size = len(fields)
+        for i, name in enumerate(fields):
+            columns[name][:count] = values[i::size]
+        columns['alive'][:count] = array('d', [1.0]) * count
+
+
+def _restore_entities(engine, kind, entities, fields, values, pool, store, new_args):
+    """Resize an entity list to the saved count and write the saved fields back"""
+    size = len(fields)
+    count = len(values) // size
+    
+    # Despawn surplus entities, spawn missing ones, reuse the rest in place
+    while len(entities) > count:
+        entity = entities[-1]
+        if store is not None:
+            store.remove(entity)
+        else:
+            entities.pop()
+            pool.release(entity)
+        engine.notify_despawn(kind, entity)
+    while len(entities) < count:
+        start = len(entities) * size
+        args = new_args(values[start], values[start + 1], values[start:start + size])
+        entity = pool.acquire(*args)
+        if store is not None:
+            view = store.add_entity(entity)
+            pool.release(entity)
+            entity = view
+        else:
+            entities.append(entity)
+        engine.notify_spawn(kind, entity)
+    
+    if store is not None:
+        _write_columns(store, fields, values, count)
+        return
+    
+    for index, entity in enumerate(entities):
+        start = index * size
+        saved = values[start:start + size]
+        # Sprite objects cache their collision box, and enemy types differ in size
+        entity.reset(*new_args(saved[0], saved[1], saved))
+        for name, value in zip(fields, saved):
+            setattr(entity, name, value)
+        entity.alive = True
+
+
+class RollbackBuffer:
+    """Ring buffer of the last `capacity` engine states, keyed by frame"""
+    
+    def __init__(self, capacity=16):
+        self.capacity = capacity
+        self.states = [None] * capacity
+        self.newest = None
+    
+    def save(self, engine):
+        state = EngineState(engine)
+        self.states[state.frame % self.capacity] = state
+        self.newest = state.frame
+        return state
+    
+    def get(self, frame):
+        state = self.states[frame % self.capacity]
+        if state is None or state.frame != frame:
+            raise KeyError(f"Frame {frame} is no longer in the rollback buffer")
+        return state
+    
+    def __contains__(self, frame):
+        state = self.states[frame % self.capacity]
+        return state is not None and state.frame == frame
+    
+    def restore(self, engine, frame):
+        self.get(frame).restore(engine)
+    
+    def clear(self):
+        self.states = [None] * self.capacity
+        self.newest = None
+
+
+class RollbackSession:
+    """Steps an engine from frame-stamped inputs, rolling back for late ones.
+    
+    Inputs are stamped with the engine frame they were meant for, like
+    ReplayRecorder events: an input stamped f is applied before the step
+    that advances the engine past frame f. When an input arrives for a frame
+    already simulated, the state saved at that frame is restored and the
+    steps since are re-run with the corrected input history.
+    """
+    
+    def __init__(self, engine, capacity=16, history=120):
+        self.engine = engine
+        self.buffer = RollbackBuffer(capacity)
+        self.history = history
+        self.inputs = {}  # frame -> [(action, active)]
+        self.rollback_frame = None
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.buffer.save(engine)
+    
+    def add_input(self, frame, action, active):
+        """Queue an input for the given frame; late inputs trigger a rollback"""
+        frame = max(frame, self.oldest_frame())
+        self.inputs.setdefault(frame, []).append((action, active))
+        if frame < self.engine.frame:
+            if self.rollback_frame is None or frame < self.rollback_frame:
+                self.rollback_frame = frame
+    
+    def oldest_frame(self):
+        """Earliest frame a late input can still be applied to"""
+        return max(0, self.engine.frame - self.buffer.capacity + 1)
+    
+    def step(self):
+        """Apply the inputs for the current frame, advance one step and save the state"""
+        engine = self.engine
+        for action, active in self.inputs.get(engine.frame, ()):
+            engine.set_player_input(action, active)
+        engine.update(engine.fixed_dt)
+        self.buffer.save(engine)
+        self.inputs.pop(engine.frame - self.history, None)
+    
+    def rollback(self, frame):
+        """Restore the state at frame and re-simulate up to the current frame.
+        
+        Returns the number of frames re-simulated.
+        """
+        engine = self.engine
+        target = engine.frame
+        self.buffer.restore(engine, frame)
+        while engine.frame < target and engine.time_remaining > 0:
+            self.step()
+        self.rollbacks += 1
+        self.resimulated += target - frame
+        return target - frame
+    
+    def advance(self):
+        """Resolve any pending rollback, then step once"""
+        if self.rollback_frame is not None:
+            frame, self.rollback_frame = self.rollback_frame, None
+            self.rollback(frame)
+        self.step()
+
+
+class LatencyChannel:
+    """Delivers frame-stamped inputs a number of frames late, for testing rollback"""
+    
+    def __init__(self, delay=4, jitter=0, seed=None):
+        self.delay = delay
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.queue = []  # (arrival frame, sequence, stamped frame, action, active)
+        self.sequence = 0
+    
+    def send(self, frame, action, active):
+        arrival = frame + self.delay + self.rng.randint(0, self.jitter)
+        heapq.heappush(self.queue, (arrival, self.sequence, frame, action, active))
+        self.sequence += 1
+    
+    def receive(self, frame):
+        """Inputs that have arrived by frame, as (stamped frame, action, active)"""
+        arrived = []
+        while self.queue and self.queue[0][0] <= frame:
+            _, _, stamped, action, active = heapq.heappop(self.queue)
+            arrived.append((stamped, action, active))
+        return arrived
+    
+    def deliver(self, session):
+        """Hand everything that arrived by the session's current frame to it"""
+        for stamped, action, active in self.receive(session.engine.frame):
+            session.add_input(stamped, action, active)
\ No newline at end of file
@@ -0,0 +1,318 @@
+import asyncio
+import random
+import time
+from collections import deque
+
+from .characters import CHARACTERS, get_character
+from .engine import GameEngine
+from .protocol import (
+    ENTITY_IDS, KINDS, MSG_ACK, MSG_INPUT, MSG_JOIN, decode_client_message,
+    encode_snapshot, frame_message, quantize, read_message
+)
+
+# Snapshots are skipped for a client while this many bytes wait to be sent
+MAX_SEND_BACKLOG = 64 * 1024
+
+try:
+    import websockets
+except ImportError:  # Optional, only needed for WebSocket clients
+    websockets = None
+
+
+class Seat:
+    """One player's solo session in a room, with network ids for its entities.
+    
+    Every seat of a room plays the same seeded match in its own engine, so
+    seated players race for the higher score against identical waves. The
+    sessions run side by side; players do not appear in or affect each
+    other's games.
+    
+    Ids of despawned entities are reused oldest first, so the 16-bit id
+    space never wraps onto a live entity.
+    """
+    
+    def __init__(self, seed, character):
+        self.engine = GameEngine(seed=seed)
+        self.engine.set_character(character)
+        self.ids = {}
+        self.next_id = 0
+        self.free_ids = deque()
+        self.engine.add_listener(self)
+        self.engine.reset_game()
+        self.history = {}  # tick -> quantized state sent at that tick
+    
+    def on_spawn(self, kind, entity):
+        if self.free_ids:
+            entity_id = self.free_ids.popleft()
+        elif self.next_id < ENTITY_IDS:
+            entity_id = self.next_id
+            self.next_id += 1
+        else:
+            raise RuntimeError(f"More than {ENTITY_IDS} live entities in one session")
+        self.ids[entity] = (entity_id, KINDS.index(kind))
+    
+    def on_despawn(self, kind, entity):
+        entry = self.ids.pop(entity, None)
+        if entry is not None:
+            self.free_ids.append(entry[0])
+    
+    def restart(self, seed):
+        self.engine.seed = seed
+        self.engine.reset_game()
+        self.history.clear()
+    
+    def state(self):
+        """Quantized {id: (kind, x, y)} of every live entity"""
+        return {entity_id: (kind, quantize(entity.x), quantize(entity.y))
+                for entity, (entity_id, kind) in self.ids.items()}
+
+
+class Client:
+    """A connected client: its transport, seat and delta baseline"""
+    
+    def __init__(self, send, close=None, address=None, backlog=None):
+        self.send_payload = send
+        self.close = close
+        self.address = address
+        self.backlog = backlog  # Returns the bytes still queued for the client
+        self.room = None
+        self.seat = None
+        self.seated = False  # Plays its seat rather than spectating
+        self.acked = None
+        self.bytes_sent = 0
+        self.snapshots_sent = 0
+        self.snapshots_skipped = 0
+    
+    def congested(self):
+        """Whether the client is too far behind to queue another snapshot"""
+        return self.backlog is not None and self.backlog() > MAX_SEND_BACKLOG
+    
+    def send(self, payload):
+        self.bytes_sent += len(payload)
+        self.snapshots_sent += 1
+        self.send_payload(payload)
+
+
+class Room:
+    """Up to `seats` solo sessions sharing a seed; extra clients spectate seat 0"""
+    
+    def __init__(self, name, seats=2, seed=None):
+        self.name = name
+        self.max_seats = seats
+        self.rng = random.Random(seed)
+        self.seed = self.rng.getrandbits(31)
+        self.seats = []
+        self.clients = []
+    
+    def join(self, client, character):
+        client.room = self
+        self.clients.append(client)
+        if len(self.seats) < self.max_seats:
+            client.seat = Seat(self.seed, character)
+            client.seated = True
+            self.seats.append(client.seat)
+        self.assign_spectators()
+    
+    def leave(self, client):
+        self.clients.remove(client)
+        if client.seated:
+            self.seats.remove(client.seat)
+            self.assign_spectators()
+    
+    def assign_spectators(self):
+        # Spectators watch the first seat; their old baselines are meaningless there
+        watched = self.seats[0] if self.seats else None
+        for client in self.clients:
+            if not client.seated and client.seat is not watched:
+                client.seat = watched
+                client.acked = None
+    
+    def step(self):
+        seats = self.seats
+        for seat in seats:
+            engine = seat.engine
+            engine.update(engine.fixed_dt)
+        # Rematch once everyone's clock ran out
+        if seats and all(seat.engine.time_remaining <= 0 for seat in seats):
+            self.seed = self.rng.getrandbits(31)
+            for seat in seats:
+                seat.restart(self.seed)
+    
+    def send_snapshots(self, tick, history):
+        states = {}
+        for seat in self.seats:
+            state = states[seat] = seat.state()
+            seat.history[tick] = state
+            if len(seat.history) > history:
+                del seat.history[next(iter(seat.history))]  # Oldest first
+        
+        for client in self.clients:
+            seat = client.seat
+            if seat is None:
+                continue
+            if client.congested():
+                # Deltas are against acknowledged snapshots, so skipping is safe
+                client.snapshots_skipped += 1
+                continue
+            engine = seat.engine
+            baseline = seat.history.get(client.acked) if client.acked is not None else None
+            client.send(encode_snapshot(
+                tick, states[seat], engine.score, engine.hits, engine.time_remaining,
+                client.acked if baseline is not None else None, baseline))
+
+
+class SessionServer:
+    """Authoritative server relaying many rooms of solo sessions on one asyncio loop.
+    
+    All rooms step together at `tick_rate`; every `tick_rate / send_rate`
+    ticks each client gets a snapshot of its seat, delta-encoded against the
+    newest snapshot it acknowledged (or in full when that is too old).
+    Clients send length-prefixed messages over TCP, or one message per
+    binary frame over WebSocket. A client whose connection has fallen behind
+    by MAX_SEND_BACKLOG bytes is skipped until it catches up.
+    
+    Rooms are not head-to-head: each seated player plays a solo session in
+    their own engine on the room's seed, and players only compete on score.
+    """
+    
+    def __init__(self, tick_rate=60, send_rate=20, seats=2, history=32, seed=None):
+        # history: snapshots per seat kept as possible delta baselines
+        self.tick_interval = 1.0 / tick_rate
+        self.send_every = max(1, round(tick_rate / send_rate))
+        self.seats = seats
+        self.history = history
+        self.rng = random.Random(seed)
+        self.rooms = {}
+        self.clients = set()
+        self.tick = 0
+        self.running = False
+        self.servers = []
+        
+        # Load statistics
+        self.busy_time = 0.0
+        self.late_ticks = 0
+    
+    def room(self, name):
+        if name not in self.rooms:
+            self.rooms[name] = Room(name, self.seats, self.rng.getrandbits(32))
+        return self.rooms[name]
+    
+    def handle_message(self, client, payload):
+        message = decode_client_message(payload)
+        kind = message[0]
+        if kind == MSG_INPUT:
+            if client.seated:
+                client.seat.engine.set_player_input(message[1], message[2])
+        elif kind == MSG_ACK:
+            client.acked = message[1]
+        elif kind == MSG_JOIN and client.room is None:
+            name, character = message[1], message[2]
+            try:
+                character = get_character(character)
+            except KeyError:
+                character = CHARACTERS[0]
+            self.room(name).join(client, character)
+    
+    def disconnect(self, client):
+        self.clients.discard(client)
+        room = client.room
+        if room:
+            room.leave(client)
+            if not room.clients:
+                del self.rooms[room.name]
+    
+    async def handle_tcp(self, reader, writer):
+        client = Client(lambda payload: writer.write(frame_message(payload)), writer.close,
+                        writer.get_extra_info('peername'), writer.transport.get_write_buffer_size)
+        self.clients.add(client)
+        try:
+            while True:
+                self.handle_message(client, await read_message(reader))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.disconnect(client)
+            writer.close()
+    
+    async def handle_websocket(self, websocket):
+        loop = asyncio.get_running_loop()
+        client = Client(lambda payload: loop.create_task(websocket.send(payload)),
+                        lambda: loop.create_task(websocket.close()),
+                        websocket.remote_address,
+                        websocket.transport.get_write_buffer_size)
+        self.clients.add(client)
+        try:
+            async for payload in websocket:
+                if isinstance(payload, bytes):
+                    self.handle_message(client, payload)
+        except (ConnectionError, ValueError, websockets.ConnectionClosed):
+            pass
+        finally:
+            self.disconnect(client)
+    
+    async def listen(self, host='127.0.0.1', port=7777, websocket_port=None):
+        """Start accepting TCP (and optionally WebSocket) clients"""
+        self.servers.append(await asyncio.start_server(self.handle_tcp, host, port))
+        if websocket_port is not None:
+            if websockets is None:
+                raise RuntimeError("WebSocket support needs the 'websockets' package")
+            self.servers.append(await websockets.serve(self.handle_websocket, host, websocket_port))
+    
+    def step(self):
+        """Advance every room one tick and send snapshots when due"""
+        self.tick += 1
+        send = self.tick % self.send_every == 0
+        for room in list(self.rooms.values()):
+            room.step()
+            if send:
+                room.send_snapshots(self.tick, self.history)
+    
+    async def run(self, duration=None):
+        """Tick all rooms at the fixed rate until stop() (or for duration seconds)"""
+        loop = asyncio.get_running_loop()
+        clock = time.perf_counter
+        self.running = True
+        next_tick = loop.time()
+        end = next_tick + duration if duration is not None else None
+        while self.running and (end is None or loop.time() < end):
+            start = clock()
+            self.step()
+            self.busy_time += clock() - start
+            
+            next_tick += self.tick_interval
+            delay = next_tick - loop.time()
+            if delay < -5 * self.tick_interval:
+                # Overloaded: skip ahead rather than trying to catch up
+                self.late_ticks += 1
+                next_tick = loop.time()
+            await asyncio.sleep(max(0.0, delay))
+        self.running = False
+    
+    def stop(self):
+        self.running = False
+    
+    async def close(self):
+        """Stop ticking, stop listening and disconnect every client"""
+        self.stop()
+        for server in self.servers:
+            server.close()
+        for client in list(self.clients):
+            client.close()
+        # Give the connection handlers up to a second to see the disconnects
+        for _ in range(100):
+            if not self.clients:
+                break
+            await asyncio.sleep(0.01)
+        for server in self.servers:
+            await server.wait_closed()
+        self.servers.clear()
+    
+    def stats(self):
+        return {
+            'rooms': len(self.rooms),
+            'clients': len(self.clients),
+            'ticks': self.tick,
+            'busy_time': self.busy_time,
+            'late_ticks': self.late_ticks,
+            'bytes_sent': sum(client.bytes_sent for client in self.clients)
+        }
\ No newline at end of file
@@ -0,0 +1,166 @@
+import csv
+import json
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import GameEngine
+from .characters import get_character
+
+
+class ScriptedPolicy:
+    """Walks to a fixed firing spot and throws as the cooldown allows.
+    
+    Like a person, it notices the cooldown is over a random 0 to
+    `max_delay` frames late, so seeds vary the throw cadence.
+    """
+    
+    def __init__(self, rng, firing_x=200, max_delay=6):
+        self.rng = rng
+        self.firing_x = firing_x
+        self.max_delay = max_delay
+        self.next_throw = None
+    
+    def act(self, engine, frame):
+        player = engine.player
+        engine.set_player_input('right', player.x < self.firing_x)
+        if engine.sim_time - player.last_throw_time < player.throw_cooldown:
+            self.next_throw = None
+            return
+        if self.next_throw is None:
+            self.next_throw = frame + self.rng.randint(0, self.max_delay)
+        if frame >= self.next_throw:
+            engine.set_player_input('throw', True)
+
+
+class RandomPolicy:
+    """Holds random inputs for random durations, like a button-mashing player"""
+    
+    def __init__(self, rng, min_hold=6, max_hold=45):
+        self.rng = rng
+        self.min_hold = min_hold
+        self.max_hold = max_hold
+        self.next_change = 0
+    
+    def act(self, engine, frame):
+        if frame >= self.next_change:
+            self.next_change = frame + self.rng.randint(self.min_hold, self.max_hold)
+            direction = self.rng.choice(('left', 'right', None))
+            engine.set_player_input('left', direction == 'left')
+            engine.set_player_input('right', direction == 'right')
+            engine.set_player_input('jump', self.rng.random() < 0.2)
+        if self.rng.random() < 0.1:
+            engine.set_player_input('throw', True)
+
+
+POLICIES = {
+    'scripted': ScriptedPolicy,
+    'random': RandomPolicy
+}
+
+
+def run_match(character_name, seed=0, policy='scripted', duration=60.0, difficulty='easy'):
+    """Play one headless match as fast as possible and return its statistics.
+    
+    difficulty defaults to the one the app starts on, so sweeps measure the
+    game players get unless told otherwise.
+    """
+    engine = GameEngine(seed=seed, difficulty=difficulty)
+    engine.set_character(get_character(character_name))
+    engine.reset_game()
+    engine.time_remaining = duration
+    
+    agent = POLICIES[policy](random.Random(seed))
+    frame = 0
+    while engine.time_remaining > 0:
+        agent.act(engine, frame)
+        engine.update(engine.fixed_dt)
+        frame += 1
+    
+    return {
+        'character': character_name,
+        'policy': policy,
+        'difficulty': difficulty,
+        'seed': seed,
+        'frames': frame,
+        'score': engine.score,
+        'hits': engine.hits,
+        'enemies_spawned': engine.enemies_spawned,
+        'snowballs_thrown': engine.snowballs_thrown
+    }
+
+
+def _run_job(job):
+    return run_match(*job)
+
+
+def make_jobs(characters, matches, policy='scripted', duration=60.0, base_seed=0,
+              difficulty='easy'):
+    """Build (character, seed, policy, duration, difficulty) jobs, matches per character.
+    
+    Every character plays the same seeds so their results are comparable.
+    """
+    return [(name, base_seed + i, policy, duration, difficulty)
+            for name in characters
+            for i in range(matches)]
+
+
+def run_batch(jobs, workers=None, difficulty=None):
+    """Run jobs across a process pool; workers=1 runs them in this process.
+    
+    difficulty, when given, overrides the one in every job.
+    """
+    if difficulty is not None:
+        jobs = [job[:4] + (difficulty,) for job in jobs]
+    if workers == 1:
+        return [_run_job(job) for job in jobs]
+    
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_run_job, jobs, chunksize=chunksize))
+
+
+def summarize(results):
+    """Aggregate match results per character, policy and difficulty"""
+    groups = {}
+    for result in results:
+        key = (result['character'], result['policy'], result['difficulty'])
+        groups.setdefault(key, []).append(result)
+    
+    summary = []
+    for (character, policy, difficulty), matches in groups.items():
+        scores = [m['score'] for m in matches]
+        hits = sum(m['hits'] for m in matches)
+        thrown = sum(m['snowballs_thrown'] for m in matches)
+        summary.append({
+            'character': character,
+            'policy': policy,
+            'difficulty': difficulty,
+            'matches': len(matches),
+            'score_mean': statistics.mean(scores),
+            'score_stdev': statistics.pstdev(scores),
+            'score_min': min(scores),
+            'score_max': max(scores),
+            'hits_mean': hits / len(matches),
+            'enemies_spawned_mean': statistics.mean(m['enemies_spawned'] for m in matches),
+            'snowballs_thrown_mean': thrown / len(matches),
+            'accuracy': hits / thrown if thrown else 0.0
+        })
+    return summary
+
+
+def write_report(path, summary, results):
+    """Write the summary as CSV, or summary plus every match as JSON"""
+    if not summary:
+        raise ValueError("No matches to report")
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(summary[0]))
+            writer.writeheader()
+            writer.writerows(summary)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'matches': results}, f,
+                      ensure_ascii=False, indent=2)
\ No newline at end of file
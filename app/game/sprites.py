@@ -1,12 +1,22 @@
-import time
-
-
 class Player:
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'width', 'height', 'half_width',
+                 'box_height', 'velocity_x', 'velocity_y', 'on_ground', 'speed',
+                 'jump_power', 'throw_cooldown', 'snowball_power', 'last_throw_time',
+                 'gravity')
+    
     def __init__(self, x, y, width, height):
         self.x = x
         self.y = y
+        
+        # Position at the end of the previous step, for render interpolation
+        self.prev_x = x
+        self.prev_y = y
         self.width = width
         self.height = height
+        
+        # Cached collision box: x is the horizontal center, y the bottom
+        self.half_width = width / 2
+        self.box_height = height
         self.velocity_x = 0
         self.velocity_y = 0
         self.on_ground = True
@@ -17,8 +27,8 @@ class Player:
         self.throw_cooldown = 1.0  # seconds
         self.snowball_power = 1.0
         
-        # State
-        self.last_throw_time = 0
+        # State (times are simulation seconds, see GameEngine.sim_time)
+        self.last_throw_time = float('-inf')
         self.gravity = 800  # pixels per second squared
     
     def set_character_attributes(self, character_data):
@@ -47,24 +57,27 @@ class Player:
             self.velocity_y = self.jump_power
             self.on_ground = False
     
-    def throw_snowball(self):
-        """Throw a snowball if cooldown allows"""
-        current_time = time.time()
-        if current_time - self.last_throw_time >= self.throw_cooldown:
-            self.last_throw_time = current_time
+    def throw_snowball(self, now, pool=None):
+        """Throw a snowball at simulation time now if cooldown allows, taking it from pool when given"""
+        if now - self.last_throw_time >= self.throw_cooldown:
+            self.last_throw_time = now
             
             # Create snowball
-            snowball = Snowball(
-                x=self.x + self.width/2,
-                y=self.y + self.height/2,
-                velocity_x=300 * self.snowball_power,
-                velocity_y=50
+            create = pool.acquire if pool else Snowball
+            snowball = create(
+                self.x + self.width/2,
+                self.y + self.height/2,
+                300 * self.snowball_power,
+                50
             )
             return snowball
         return None
     
     def update(self, dt):
         """Update player physics"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
         # Apply gravity
         self.velocity_y -= self.gravity * dt
         
@@ -77,18 +90,38 @@ class Player:
 
 
 class Enemy:
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'width', 'height', 'half_width',
+                 'box_height', 'velocity_x', 'velocity_y', 'on_ground', 'gravity',
+                 'alive', 'last_throw_time', 'think_slot')
+    
     def __init__(self, x, y, width, height):
+        self.reset(x, y, width, height)
+    
+    def reset(self, x, y, width, height):
+        """(Re)initialize state, used when recycled from a pool"""
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.width = width
         self.height = height
+        self.half_width = width / 2
+        self.box_height = height
         self.velocity_x = -80  # Move left
         self.velocity_y = 0
         self.on_ground = True
         self.gravity = 800
+        self.alive = True
+        
+        # Decision state for game.ai.EnemyAI (simulation seconds, frame slot)
+        self.last_throw_time = float('-inf')
+        self.think_slot = 0
     
     def update(self, dt):
         """Update enemy physics"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
         # Apply gravity
         self.velocity_y -= self.gravity * dt
         
@@ -104,16 +137,33 @@ class Enemy:
 
 
 class Snowball:
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'velocity_x', 'velocity_y',
+                 'radius', 'half_width', 'box_height', 'gravity', 'alive')
+    
     def __init__(self, x, y, velocity_x, velocity_y, radius=8):
+        self.reset(x, y, velocity_x, velocity_y, radius)
+    
+    def reset(self, x, y, velocity_x, velocity_y, radius=8):
+        """(Re)initialize state, used when recycled from a pool"""
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.velocity_x = velocity_x
         self.velocity_y = velocity_y
         self.radius = radius
+        
+        # Collision box is radius wide and radius tall, sitting on y
+        self.half_width = radius / 2
+        self.box_height = radius
         self.gravity = 400  # Less gravity for snowballs
+        self.alive = True
     
     def update(self, dt):
         """Update snowball physics"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
         # Apply gravity
         self.velocity_y -= self.gravity * dt
         
@@ -0,0 +1,275 @@
+from array import array
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, fall back to the array module
+    numpy = None
+
+
+# Columns kept for every entity, named after the sprite attributes
+COLUMNS = ('x', 'y', 'prev_x', 'prev_y', 'velocity_x', 'velocity_y',
+           'width', 'height', 'radius', 'gravity', 'alive',
+           'last_throw_time', 'think_slot')
+
+
+def _column_property(name):
+    def getter(self):
+        return self.store.columns[name][self.index]
+    
+    def setter(self, value):
+        self.store.columns[name][self.index] = value
+    
+    return property(getter, setter)
+
+
+class EntityView:
+    """Lightweight handle to one row of an EntityStore.
+    
+    Views read and write straight through to the store columns, so code
+    written against Enemy/Snowball objects keeps working. The index is kept
+    up to date by the store when rows move during removal.
+    """
+    
+    __slots__ = ('store', 'index')
+    
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+    
+    x = _column_property('x')
+    y = _column_property('y')
+    prev_x = _column_property('prev_x')
+    prev_y = _column_property('prev_y')
+    velocity_x = _column_property('velocity_x')
+    velocity_y = _column_property('velocity_y')
+    gravity = _column_property('gravity')
+    alive = _column_property('alive')
+
+
+class EnemyView(EntityView):
+    __slots__ = ()
+    
+    # Collision box: half_width is half the first column, box_height the second
+    box_columns = ('width', 'height')
+    
+    width = _column_property('width')
+    height = _column_property('height')
+    last_throw_time = _column_property('last_throw_time')
+    think_slot = _column_property('think_slot')
+    
+    @property
+    def half_width(self):
+        return self.store.columns['width'][self.index] / 2
+    
+    @property
+    def box_height(self):
+        return self.store.columns['height'][self.index]
+
+
+class SnowballView(EntityView):
+    __slots__ = ()
+    
+    box_columns = ('radius', 'radius')
+    
+    radius = _column_property('radius')
+    
+    @property
+    def half_width(self):
+        return self.store.columns['radius'][self.index] / 2
+    
+    @property
+    def box_height(self):
+        return self.store.columns['radius'][self.index]
+
+
+class EntityStore:
+    """Structure-of-arrays storage for one kind of entity.
+    
+    Rows are kept dense: removing an entity moves the last row into the
+    freed slot. Physics runs over whole columns, using NumPy when it is
+    installed and plain loops over `array` columns otherwise.
+    """
+    
+    def __init__(self, view_class, capacity=64, use_numpy=True):
+        self.view_class = view_class
+        self.use_numpy = use_numpy and numpy is not None
+        self.count = 0
+        self.capacity = capacity
+        self.views = []
+        self.columns = {name: self._allocate(capacity) for name in COLUMNS}
+    
+    def _allocate(self, capacity):
+        if self.use_numpy:
+            return numpy.zeros(capacity, dtype=numpy.float64)
+        return array('d', bytes(8 * capacity))
+    
+    def _grow(self):
+        capacity = self.capacity * 2
+        for name, column in self.columns.items():
+            grown = self._allocate(capacity)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+        self.capacity = capacity
+    
+    def __len__(self):
+        return self.count
+    
+    def add(self, x, y, velocity_x=0, velocity_y=0, width=0, height=0,
+            radius=0, gravity=0, last_throw_time=float('-inf'), think_slot=0):
+        """Append a row and return its view"""
+        if self.count == self.capacity:
+            self._grow()
+        
+        index = self.count
+        columns = self.columns
+        columns['x'][index] = x
+        columns['y'][index] = y
+        columns['prev_x'][index] = x
+        columns['prev_y'][index] = y
+        columns['velocity_x'][index] = velocity_x
+        columns['velocity_y'][index] = velocity_y
+        columns['width'][index] = width
+        columns['height'][index] = height
+        columns['radius'][index] = radius
+        columns['gravity'][index] = gravity
+        columns['alive'][index] = 1
+        columns['last_throw_time'][index] = last_throw_time
+        columns['think_slot'][index] = think_slot
+        self.count += 1
+        
+        view = self.view_class(self, index)
+        self.views.append(view)
+        return view
+    
+    def add_entity(self, entity):
+        """Copy a sprite object into a new row and return its view"""
+        return self.add(
+            entity.x, entity.y,
+            velocity_x=entity.velocity_x,
+            velocity_y=entity.velocity_y,
+            width=getattr(entity, 'width', 0),
+            height=getattr(entity, 'height', 0),
+            radius=getattr(entity, 'radius', 0),
+            gravity=entity.gravity,
+            last_throw_time=getattr(entity, 'last_throw_time', float('-inf')),
+            think_slot=getattr(entity, 'think_slot', 0)
+        )
+    
+    def boxes(self):
+        """Return (x, y, prev_x, prev_y, half_width, box_height) columns of the live rows.
+        
+        Values match the views' properties, for collision tests that read
+        whole columns instead of going through one view at a time.
+        """
+        n = self.count
+        c = self.columns
+        width, height = self.view_class.box_columns
+        if self.use_numpy:
+            half_width = c[width][:n] / 2
+        else:
+            half_width = array('d', (w / 2 for w in c[width][:n]))
+        return c['x'][:n], c['y'][:n], c['prev_x'][:n], c['prev_y'][:n], half_width, c[height][:n]
+    
+    def remove(self, view):
+        """Remove a row in O(1) by moving the last row into its slot"""
+        index = view.index
+        last = self.count - 1
+        if index != last:
+            for column in self.columns.values():
+                column[index] = column[last]
+            moved = self.views[last]
+            moved.index = index
+            self.views[index] = moved
+        self.views.pop()
+        self.count = last
+        view.index = -1
+    
+    def remove_dead(self):
+        """Remove every row whose alive flag is cleared and return their views"""
+        n = self.count
+        alive = self.columns['alive']
+        if self.use_numpy:
+            dead_rows = numpy.flatnonzero(alive[:n] == 0)
+        else:
+            dead_rows = [i for i in range(n) if not alive[i]]
+        
+        # Highest rows first, so every swap-remove moves a live row
+        dead = []
+        for i in reversed(dead_rows):
+            view = self.views[i]
+            self.remove(view)
+            dead.append(view)
+        return dead
+    
+    def clear(self):
+        for view in self.views:
+            view.index = -1
+        self.views.clear()
+        self.count = 0
+    
+    def integrate(self, dt, ground_level=None):
+        """Apply gravity and velocity to every row, optionally clamping to the ground"""
+        n = self.count
+        if n == 0:
+            return
+        
+        c = self.columns
+        if self.use_numpy:
+            c['prev_x'][:n] = c['x'][:n]
+            c['prev_y'][:n] = c['y'][:n]
+            vy = c['velocity_y'][:n]
+            y = c['y'][:n]
+            vy -= c['gravity'][:n] * dt
+            c['x'][:n] += c['velocity_x'][:n] * dt
+            y += vy * dt
+            if ground_level is not None:
+                grounded = y <= ground_level
+                y[grounded] = ground_level
+                vy[grounded] = 0
+            return
+        
+        x, y = c['x'], c['y']
+        prev_x, prev_y = c['prev_x'], c['prev_y']
+        vx, vy, gravity = c['velocity_x'], c['velocity_y'], c['gravity']
+        for i in range(n):
+            prev_x[i] = x[i]
+            prev_y[i] = y[i]
+            vy[i] -= gravity[i] * dt
+            x[i] += vx[i] * dt
+            y[i] += vy[i] * dt
+            if ground_level is not None and y[i] <= ground_level:
+                y[i] = ground_level
+                vy[i] = 0
+    
+    def find_outside(self, min_x=None, max_x=None, min_y=None, margin_column=None):
+        """Return views whose position lies outside the given bounds.
+        
+        Rows with x < min_x - margin, x > max_x or y <= min_y are reported,
+        where margin is read per row from `margin_column` when given.
+        """
+        n = self.count
+        if n == 0:
+            return []
+        
+        c = self.columns
+        if self.use_numpy:
+            x = c['x'][:n]
+            outside = numpy.zeros(n, dtype=bool)
+            if min_x is not None:
+                left = min_x - c[margin_column][:n] if margin_column else min_x
+                outside |= x < left
+            if max_x is not None:
+                outside |= x > max_x
+            if min_y is not None:
+                outside |= c['y'][:n] <= min_y
+            return [self.views[i] for i in numpy.flatnonzero(outside)]
+        
+        x, y = c['x'], c['y']
+        margin = c[margin_column] if margin_column else None
+        found = []
+        for i in range(n):
+            if ((min_x is not None and x[i] < min_x - (margin[i] if margin is not None else 0)) or
+                    (max_x is not None and x[i] > max_x) or
+                    (min_y is not None and y[i] <= min_y)):
+                found.append(self.views[i])
+        return found
\ No newline at end of file
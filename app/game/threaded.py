@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+from array import array
+from collections import namedtuple
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, snow may be array-backed
+    numpy = None
+
+
+# Immutable per-step state read by the renderer. Field names match the
+# engine and sprite attributes GameCanvas draws from, so a snapshot can be
+# drawn exactly like a live engine.
+EntityState = namedtuple('EntityState', 'x y prev_x prev_y width height radius')
+SnowState = namedtuple('SnowState', 'x y size')
+Snapshot = namedtuple('Snapshot', (
+    'frame sim_time score hits time_remaining player enemies snowballs enemy_snowballs snow '
+    'character_data interpolation_alpha published'
+))
+
+
+def _entity_state(entity):
+    return EntityState(entity.x, entity.y, entity.prev_x, entity.prev_y,
+                       getattr(entity, 'width', 0), getattr(entity, 'height', 0),
+                       getattr(entity, 'radius', 0))
+
+
+def _frozen_copy(values):
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        values = values.copy()
+        values.flags.writeable = False
+        return values
+    return array(values.typecode, values)
+
+
+def take_snapshot(engine, published=0.0):
+    """Copy everything the renderer and HUD need out of the engine"""
+    snow = engine.snow
+    return Snapshot(
+        frame=engine.frame,
+        sim_time=engine.sim_time,
+        score=engine.score,
+        hits=engine.hits,
+        time_remaining=engine.time_remaining,
+        player=_entity_state(engine.player) if engine.player else None,
+        enemies=tuple(_entity_state(enemy) for enemy in engine.enemies if enemy.alive),
+        snowballs=tuple(_entity_state(snowball) for snowball in engine.snowballs
+                        if snowball.alive),
+        enemy_snowballs=tuple(_entity_state(snowball) for snowball in engine.enemy_snowballs
+                              if snowball.alive),
+        snow=SnowState(_frozen_copy(snow.x), _frozen_copy(snow.y), _frozen_copy(snow.size)),
+        character_data=engine.character_data,
+        interpolation_alpha=1.0,
+        published=published
+    )
+
+
+class SimulationThread:
+    """Runs a GameEngine on a worker thread at its fixed tick.
+    
+    The engine is only touched by the worker: input and other commands are
+    queued and applied between steps. After every step a new immutable
+    Snapshot replaces the published one with a single reference assignment,
+    so the renderer always reads a complete state without taking a lock.
+    """
+    
+    def __init__(self, engine, max_catch_up=5):
+        self.engine = engine
+        self.max_catch_up = max_catch_up
+        self.clock = time.perf_counter
+        self.commands = queue.SimpleQueue()
+        self.snapshot = take_snapshot(engine, self.clock())
+        self.running = False
+        self.thread = None
+        self.steps = 0
+        self.dropped_ticks = 0
+    
+    def submit(self, function, *args):
+        """Call function(*args) on the simulation thread before the next step"""
+        self.commands.put((function, args))
+    
+    def set_player_input(self, action, active):
+        self.submit(self.engine.set_player_input, action, active)
+    
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self.run, name='simulation', daemon=True)
+            self.thread.start()
+    
+    def stop(self, timeout=1.0):
+        self.running = False
+        if self.thread is not None:
+            if self.thread is not threading.current_thread():
+                self.thread.join(timeout)
+            self.thread = None
+    
+    def apply_commands(self):
+        commands = self.commands
+        while True:
+            try:
+                function, args = commands.get_nowait()
+            except queue.Empty:
+                return
+            function(*args)
+    
+    def step(self):
+        """Apply queued commands, advance one fixed step and publish a snapshot"""
+        self.apply_commands()
+        self.engine.update(self.engine.fixed_dt)
+        self.steps += 1
+        self.snapshot = take_snapshot(self.engine, self.clock())
+    
+    def run(self):
+        dt = self.engine.fixed_dt
+        next_tick = self.clock()
+        while self.running:
+            self.step()
+            if self.engine.time_remaining <= 0:
+                self.running = False
+                break
+            
+            next_tick += dt
+            delay = next_tick - self.clock()
+            if delay > 0:
+                time.sleep(delay)
+            elif -delay > dt * self.max_catch_up:
+                # Too far behind: drop the backlog instead of spiralling
+                self.dropped_ticks += int(-delay / dt)
+                next_tick = self.clock()
+    
+    def view(self):
+        """Latest snapshot, with interpolation_alpha for the time since it was published"""
+        snapshot = self.snapshot
+        alpha = (self.clock() - snapshot.published) / self.engine.fixed_dt
+        return snapshot._replace(interpolation_alpha=min(1.0, max(0.0, alpha)))
\ No newline at end of file
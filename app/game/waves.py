@@ -0,0 +1,77 @@
+import heapq
+import json
+import os
+from bisect import bisect_right
+from collections import namedtuple
+
+
+# Declarative spawn tables, one list of waves per difficulty
+DIFFICULTY_PATH = os.path.join(os.path.dirname(__file__), 'difficulty.json')
+DEFAULT_DIFFICULTY = 'normal'
+
+# Enemies spawn just beyond the right edge, GROUP_GAP px apart within a group
+SPAWN_MARGIN = 50
+GROUP_GAP = 15
+
+SpawnEvent = namedtuple('SpawnEvent', 'time enemy count')
+
+_tables = {}
+
+
+def compile_waves(waves, enemy_types, duration=60.0):
+    """Expand waves into a timeline of SpawnEvents sorted by time.
+    
+    A wave spawns `count` (default 1) enemies of type `enemy` every `every`
+    seconds from `start` up to and including `end` (default: the whole
+    match). All events go through one heap, so overlapping waves come out
+    interleaved in time order, earlier waves first on ties.
+    """
+    heap = []
+    for order, wave in enumerate(waves):
+        enemy = wave['enemy']
+        if enemy not in enemy_types:
+            raise ValueError(f"Unknown enemy type in wave {order}: {enemy}")
+        every = wave['every']
+        if every <= 0:
+            raise ValueError(f"Wave {order} needs a positive 'every', got {every}")
+        start = wave.get('start', every)
+        end = min(wave.get('end', duration), duration)
+        count = wave.get('count', 1)
+        
+        spawn = 0
+        time = start
+        while time <= end + 1e-9:
+            heapq.heappush(heap, (time, order, spawn, SpawnEvent(time, enemy, count)))
+            spawn += 1
+            time = start + spawn * every
+    return tuple(heapq.heappop(heap)[-1] for _ in range(len(heap)))
+
+
+class WaveTable:
+    """Enemy types plus the precompiled spawn timeline of every difficulty"""
+    
+    def __init__(self, data, duration=60.0):
+        self.enemy_types = data['enemy_types']
+        self.timelines = {name: compile_waves(waves, self.enemy_types, duration)
+                          for name, waves in data['difficulties'].items()}
+    
+    def __contains__(self, difficulty):
+        return difficulty in self.timelines
+    
+    def timeline(self, difficulty):
+        if difficulty not in self.timelines:
+            raise ValueError(f"Unknown difficulty: {difficulty}")
+        return self.timelines[difficulty]
+    
+    @staticmethod
+    def resume_index(timeline, sim_time):
+        """Index of the first event after sim_time, to switch timelines mid-match"""
+        return bisect_right([event.time for event in timeline], sim_time)
+
+
+def load_wave_table(path=DIFFICULTY_PATH):
+    """Return the shared WaveTable compiled from a difficulty file"""
+    if path not in _tables:
+        with open(path, encoding='utf-8') as f:
+            _tables[path] = WaveTable(json.load(f))
+    return _tables[path]
\ No newline at end of file
@@ -1,20 +1,57 @@
-from kivy.app import App
-from kivy.uix.screenmanager import ScreenManager
+# Start the startup profiler (if requested) before Kivy is imported
+from game.profiler import StartupProfiler
+startup_profiler = StartupProfiler.from_command_line()
+if startup_profiler:
+    startup_profiler.install()
+
+import glob
+import os
+
+from kivy.clock import Clock
+from kivy.core.window import Window
 from kivymd.app import MDApp
-from kivymd.theming import ThemableBehavior
 
+from render.assets import EXTENSIONS, asset_manager
+from render.atlas import ASSETS_DIR, ATLAS_PATH, page_paths
 from screens.home import HomeScreen
-from screens.character_selection import CharacterSelectionScreen
-from screens.game import GameScreen
-from screens.settings import SettingsScreen
+from screens.lazy import LazyScreenManager
+
+
+# Screens built on first navigation (or by pre-warming) instead of at startup
+LAZY_SCREENS = (
+    ('character_selection', 'screens.character_selection:CharacterSelectionScreen'),
+    ('game', 'screens.game:GameScreen'),
+    ('settings', 'screens.settings:SettingsScreen')
+)
+
+
+def startup_assets():
+    """Sprite atlas pages plus any fonts and sounds shipped in assets/"""
+    paths = page_paths(ATLAS_PATH) if os.path.exists(ATLAS_PATH) else []
+    for directory in ('fonts', 'sounds'):
+        for path in sorted(glob.glob(os.path.join(ASSETS_DIR, directory, '*'))):
+            if os.path.splitext(path)[1].lower() in EXTENSIONS:
+                paths.append(path)
+    return paths
 
 
 class KarTopuApp(MDApp):
-    def __init__(self, **kwargs):
+    # Build the other screens in the background once startup assets are loaded
+    prewarm_screens = True
+    prewarm_delay = 1.0
+    
+    def __init__(self, profiler=None, **kwargs):
         super().__init__(**kwargs)
         self.title = "Kar Topu Savaşı"
-        
+        self.profiler = profiler
+    
     def build(self):
+        if self.profiler:
+            self.profiler.mark('build() start')
+            return self.profiler.measure('build()', self.build_screens)
+        return self.build_screens()
+    
+    def build_screens(self):
         # Set app theme
         self.theme_cls.primary_palette = "Blue"
         self.theme_cls.primary_hue = "400"
@@ -22,16 +59,52 @@ class KarTopuApp(MDApp):
         self.theme_cls.theme_style = "Light"
         
         # Create screen manager
-        sm = ScreenManager()
+        sm = LazyScreenManager()
+        sm.profiler = self.profiler
         
-        # Add screens
-        sm.add_widget(HomeScreen(name='home'))
-        sm.add_widget(CharacterSelectionScreen(name='character_selection'))
-        sm.add_widget(GameScreen(name='game'))
-        sm.add_widget(SettingsScreen(name='settings'))
+        # Only the home screen is built up front
+        if self.profiler:
+            home = self.profiler.measure('HomeScreen()', HomeScreen, name='home')
+            self.profile_first_draw(home.snowfall)
+        else:
+            home = HomeScreen(name='home')
+        sm.add_widget(home)
+        for name, path in LAZY_SCREENS:
+            sm.register(name, path)
         
         return sm
+    
+    def profile_first_draw(self, snowfall):
+        """Time the first snowfall draw and the first rendered frame"""
+        profiler = self.profiler
+        draw = snowfall.draw_snowfall
+        
+        def first_draw():
+            del snowfall.draw_snowfall  # Back to the plain method
+            profiler.measure('SnowfallWidget first draw', draw)
+        
+        def first_frame(*args):
+            Window.unbind(on_flip=first_frame)
+            profiler.mark('first frame')
+            print(f"Startup profile written to {profiler.write_report()}")
+        
+        snowfall.draw_snowfall = first_draw
+        Window.bind(on_flip=first_frame)
+    
+    def on_start(self):
+        # Decode assets in the background while the home screen shows progress
+        asset_manager().load_many(startup_assets(), on_complete=self.on_assets_loaded)
+    
+    def on_assets_loaded(self):
+        if self.prewarm_screens:
+            Clock.schedule_once(lambda dt: self.root.prewarm(), self.prewarm_delay)
+    
+    def on_stop(self):
+        # Rewrite the report to include screens built after the first frame
+        if self.profiler:
+            self.profiler.mark('stop')
+            self.profiler.write_report()
 
 
 if __name__ == '__main__':
-    KarTopuApp().run()
\ No newline at end of file
+    KarTopuApp(profiler=startup_profiler).run()
\ No newline at end of file
@@ -0,0 +1 @@
+# Empty init file to make this a Python package
\ No newline at end of file
@@ -0,0 +1,214 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from kivy.clock import Clock
+from kivy.event import EventDispatcher
+from kivy.logger import Logger
+from kivy.properties import BooleanProperty, NumericProperty
+
+
+# Rows uploaded per slice when a decoded image becomes a texture
+UPLOAD_ROWS = 64
+
+_manager = None
+
+
+def decode_image(path):
+    """Decode an image to bottom-up RGBA rows, ready for Texture.blit_buffer"""
+    from PIL import Image
+    
+    with Image.open(path) as image:
+        image = image.convert('RGBA').transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+        return image.size, image.tobytes()
+
+
+def upload_texture(path, decoded, rows=UPLOAD_ROWS):
+    """Upload decoded pixels to a new texture, yielding after every band of rows"""
+    from kivy.graphics.texture import Texture
+    
+    (width, height), pixels = decoded
+    texture = Texture.create(size=(width, height), colorfmt='rgba')
+    stride = width * 4
+    for row in range(0, height, rows):
+        band = min(rows, height - row)
+        texture.blit_buffer(pixels[row * stride:(row + band) * stride],
+                            pos=(0, row), size=(width, band),
+                            colorfmt='rgba', bufferfmt='ubyte')
+        yield
+    return texture
+
+
+def read_file(path):
+    """Read a file in the background so the main thread finds it in the OS cache"""
+    with open(path, 'rb') as f:
+        return len(f.read())
+
+
+def load_sound(path, decoded):
+    from kivy.core.audio import SoundLoader
+    
+    yield
+    return SoundLoader.load(path)
+
+
+def register_font(path, decoded):
+    from kivy.core.text import LabelBase
+    
+    name = os.path.splitext(os.path.basename(path))[0]
+    LabelBase.register(name=name, fn_regular=path)
+    yield
+    return name
+
+
+# kind: (decode on a worker thread, finish on the main thread as a generator)
+KINDS = {
+    'image': (decode_image, upload_texture),
+    'sound': (read_file, load_sound),
+    'font': (read_file, register_font)
+}
+
+EXTENSIONS = {
+    '.png': 'image', '.jpg': 'image', '.jpeg': 'image',
+    '.wav': 'sound', '.ogg': 'sound', '.mp3': 'sound',
+    '.ttf': 'font', '.otf': 'font'
+}
+
+
+def run_to_completion(steps):
+    """Drive a finishing generator in one go and return its result"""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+
+def asset_manager():
+    """Return the shared AssetManager, whose cache outlives screen changes"""
+    global _manager
+    if _manager is None:
+        _manager = AssetManager()
+    return _manager
+
+
+class AssetManager(EventDispatcher):
+    """Loads assets without blocking the UI thread.
+    
+    Files are decoded on a thread pool; the GL work (texture uploads, sound
+    and font registration) runs on the main thread in slices of at most
+    `upload_budget` seconds per frame. Finished assets are cached by path.
+    """
+    
+    progress = NumericProperty(1.0)
+    loading = BooleanProperty(False)
+    
+    def __init__(self, workers=2, upload_budget=0.004, **kwargs):
+        super().__init__(**kwargs)
+        self.workers = workers
+        self.upload_budget = upload_budget
+        self.kinds = dict(KINDS)
+        self.clock = time.perf_counter
+        self.executor = None
+        
+        self.cache = {}
+        self.callbacks = {}      # path -> callbacks waiting for it
+        self.decoded = deque()   # (path, kind, decoded or exception), filled by workers
+        self.current = None      # (path, finishing generator)
+        self.total = 0
+        self.done = 0
+        self.pumping = False
+    
+    def get(self, path):
+        return self.cache.get(os.path.normpath(path))
+    
+    def load(self, path, kind=None, callback=None):
+        """Load path in the background; callback(asset) runs on the main thread"""
+        path = os.path.normpath(path)
+        if path in self.cache:
+            if callback:
+                callback(self.cache[path])
+            return
+        if path in self.callbacks:
+            if callback:
+                self.callbacks[path].append(callback)
+            return
+        
+        kind = kind or EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if kind not in self.kinds:
+            raise ValueError(f"Unknown asset type: {path}")
+        self.callbacks[path] = [callback] if callback else []
+        self.total += 1
+        self.update_progress()
+        
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers,
+                                               thread_name_prefix='assets')
+        self.executor.submit(self.decode, path, kind)
+        if not self.pumping:
+            self.pumping = True
+            Clock.schedule_interval(self.pump, 0)
+    
+    def load_many(self, paths, on_complete=None):
+        """Load several assets; on_complete() runs once all of them are ready"""
+        remaining = [len(paths)]
+        
+        def loaded(asset):
+            remaining[0] -= 1
+            if remaining[0] == 0 and on_complete:
+                on_complete()
+        
+        if not paths and on_complete:
+            on_complete()
+        for path in paths:
+            self.load(path, callback=loaded)
+    
+    def decode(self, path, kind):
+        # Worker thread: only file I/O and decoding, no GL calls
+        try:
+            decoded = self.kinds[kind][0](path)
+        except Exception as e:
+            decoded = e
+        self.decoded.append((path, kind, decoded))
+    
+    def pump(self, dt):
+        """Finish decoded assets on the main thread within the frame budget"""
+        deadline = self.clock() + self.upload_budget
+        while self.clock() < deadline:
+            if self.current is None:
+                if not self.decoded:
+                    break
+                path, kind, decoded = self.decoded.popleft()
+                if isinstance(decoded, Exception):
+                    Logger.warning(f"Assets: Could not load {path}: {decoded}")
+                    self.finish(path, None)
+                    continue
+                self.current = (path, self.kinds[kind][1](path, decoded))
+            
+            path, steps = self.current
+            try:
+                next(steps)
+            except StopIteration as done:
+                self.current = None
+                self.finish(path, done.value)
+            except Exception as e:
+                self.current = None
+                Logger.warning(f"Assets: Could not load {path}: {e}")
+                self.finish(path, None)
+        
+        if self.done == self.total:
+            self.pumping = False
+            return False  # Unschedule until the next load
+    
+    def finish(self, path, asset):
+        if asset is not None:
+            self.cache[path] = asset
+        self.done += 1
+        self.update_progress()
+        for callback in self.callbacks.pop(path, []):
+            callback(asset)
+    
+    def update_progress(self):
+        self.loading = self.done < self.total
+        self.progress = self.done / self.total if self.total else 1.0
\ No newline at end of file
@@ -0,0 +1,105 @@
+import glob
+import json
+import os
+
+
+# Prebuilt sprite atlas, generated from assets/characters by build_atlas.py
+ASSETS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'assets'))
+SPRITE_SOURCES = os.path.join(ASSETS_DIR, 'characters')
+ATLAS_PATH = os.path.join(ASSETS_DIR, 'atlas', 'sprites.atlas')
+
+# All sprites must fit on one page so a layer needs a single texture bind
+ATLAS_SIZE = 512
+
+_atlases = {}
+
+
+def pack_atlas(source_dir=SPRITE_SOURCES, atlas_path=ATLAS_PATH, size=ATLAS_SIZE, padding=2):
+    """Pack every PNG in source_dir into a Kivy atlas; returns the frame names"""
+    from kivy.atlas import Atlas
+    
+    filenames = sorted(glob.glob(os.path.join(source_dir, '*.png')))
+    if not filenames:
+        raise ValueError(f"No PNG images in {source_dir}")
+    os.makedirs(os.path.dirname(atlas_path), exist_ok=True)
+    
+    result = Atlas.create(os.path.splitext(atlas_path)[0], filenames, size, padding)
+    if not result:
+        raise ValueError(f"Could not pack {source_dir} into {atlas_path}")
+    pages = frame_names(atlas_path)
+    if len(pages) > 1:
+        raise ValueError(f"Sprites need {len(pages)} pages of {size}px; use a larger size")
+    return sorted(name for names in pages.values() for name in names)
+
+
+def frame_names(atlas_path=ATLAS_PATH):
+    """Return {page image: [frame names]} from an atlas file without loading textures"""
+    with open(atlas_path, encoding='utf-8') as f:
+        return {page: list(frames) for page, frames in json.load(f).items()}
+
+
+def page_paths(atlas_path=ATLAS_PATH):
+    """Image files holding the pages of an atlas"""
+    directory = os.path.dirname(atlas_path)
+    return [os.path.join(directory, page) for page in frame_names(atlas_path)]
+
+
+def load_atlas(atlas_path=ATLAS_PATH):
+    """Return the shared SpriteAtlas, or None when no atlas has been built.
+    
+    Pages already loaded by the asset manager are reused; missing ones are
+    loaded synchronously.
+    """
+    if atlas_path not in _atlases and os.path.exists(atlas_path):
+        from .assets import asset_manager
+        _atlases[atlas_path] = SpriteAtlas(atlas_path, asset_manager().cache)
+    return _atlases.get(atlas_path)
+
+
+def load_atlas_async(callback, atlas_path=ATLAS_PATH):
+    """Call callback(atlas) once the atlas pages are loaded in the background"""
+    if atlas_path in _atlases or not os.path.exists(atlas_path):
+        callback(load_atlas(atlas_path))
+        return
+    from .assets import asset_manager
+    asset_manager().load_many(page_paths(atlas_path),
+                              on_complete=lambda: callback(load_atlas(atlas_path)))
+
+
+class SpriteAtlas:
+    """Frame lookup in a prebuilt Kivy texture atlas.
+    
+    Frames are regions of a shared page texture; a QuadBatch using `page(name)`
+    draws any number of them with one bind by passing their `uvs` per quad.
+    """
+    
+    def __init__(self, atlas_path=ATLAS_PATH, textures=None):
+        from .assets import decode_image, run_to_completion, upload_texture
+        
+        textures = textures or {}
+        self.textures = {}
+        self.pages = {}
+        directory = os.path.dirname(atlas_path)
+        with open(atlas_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        
+        for page_name, frames in meta.items():
+            path = os.path.normpath(os.path.join(directory, page_name))
+            page = textures.get(path)
+            if page is None:
+                page = run_to_completion(upload_texture(path, decode_image(path)))
+            # Atlas coordinates are (x, y, w, h) from the bottom left
+            for name, (x, y, width, height) in frames.items():
+                self.textures[name] = page.get_region(x, y, width, height)
+                self.pages[name] = page
+    
+    def __contains__(self, name):
+        return name in self.textures
+    
+    def page(self, name):
+        """Texture the frame lives on, to use as a QuadBatch texture"""
+        return self.pages[name]
+    
+    def uvs(self, name):
+        """The 8 texture coordinates of a frame, as taken by QuadBatch.set_quad"""
+        return self.textures[name].tex_coords
\ No newline at end of file
@@ -0,0 +1,143 @@
+from kivy.graphics import Mesh
+from kivy.graphics.texture import Texture
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, set_disc_arrays falls back to set_discs
+    numpy = None
+
+
+# Mesh indices are 16-bit, so one mesh can address at most 65536 vertices
+MAX_QUADS = 65536 // 4
+
+# Floats per quad: 4 vertices of (x, y, u, v)
+QUAD_FLOATS = 16
+
+# Whole-texture coordinates, in Texture.tex_coords order
+DEFAULT_TEX_COORDS = (0, 0, 1, 0, 1, 1, 0, 1)
+
+_disc_texture = None
+
+
+def disc_texture(size=32):
+    """Return a shared white disc texture used to draw round particles"""
+    global _disc_texture
+    if _disc_texture is None:
+        radius = size / 2.0
+        pixels = bytearray(size * size * 4)
+        for row in range(size):
+            for col in range(size):
+                dx = col + 0.5 - radius
+                dy = row + 0.5 - radius
+                # Soft one pixel edge to avoid jaggies
+                alpha = max(0.0, min(1.0, radius - (dx * dx + dy * dy) ** 0.5))
+                offset = (row * size + col) * 4
+                pixels[offset:offset + 4] = (255, 255, 255, int(alpha * 255))
+        
+        texture = Texture.create(size=(size, size), colorfmt='rgba')
+        texture.blit_buffer(bytes(pixels), colorfmt='rgba', bufferfmt='ubyte')
+        _disc_texture = texture
+    return _disc_texture
+
+
+class QuadBatch:
+    """Draws any number of textured quads with a single Mesh instruction.
+    
+    The vertex buffer is a flat list of floats that is rewritten in place
+    each frame; indices are only rebuilt when the quad count changes.
+    Add `batch.mesh` to a canvas after the Color it should be tinted with.
+    """
+    
+    def __init__(self, texture=None):
+        self.count = 0
+        self.vertices = []
+        self.buffer = None  # float32 (quads, 16) vertex array used by set_disc_arrays
+        self.mesh = Mesh(mode='triangles', texture=texture)
+    
+    def resize(self, count):
+        """Set the number of quads in the batch"""
+        count = min(count, MAX_QUADS)
+        size = count * QUAD_FLOATS
+        if size < len(self.vertices):
+            del self.vertices[size:]
+        elif size > len(self.vertices):
+            self.vertices.extend([0.0] * (size - len(self.vertices)))
+        self.set_indices(count)
+    
+    def set_indices(self, count):
+        if count == self.count:
+            return
+        indices = []
+        for i in range(0, count * 4, 4):
+            indices.extend((i, i + 1, i + 2, i + 2, i + 3, i))
+        self.mesh.indices = indices
+        self.count = count
+    
+    def set_quad(self, index, x, y, width, height, tex_coords=DEFAULT_TEX_COORDS):
+        """Write one quad; tex_coords are the 8 floats of Texture.tex_coords"""
+        u0, v0, u1, v1, u2, v2, u3, v3 = tex_coords
+        right = x + width
+        top = y + height
+        offset = index * QUAD_FLOATS
+        self.vertices[offset:offset + QUAD_FLOATS] = (
+            x, y, u0, v0,
+            right, y, u1, v1,
+            right, top, u2, v2,
+            x, top, u3, v3
+        )
+    
+    def set_discs(self, discs):
+        """Rewrite the batch from a sequence of (center_x, center_y, diameter)"""
+        self.resize(len(discs))
+        vertices = self.vertices
+        offset = 0
+        for cx, cy, d in discs:
+            if offset >= len(vertices):
+                break
+            r = d / 2
+            left = cx - r
+            bottom = cy - r
+            right = cx + r
+            top = cy + r
+            vertices[offset:offset + QUAD_FLOATS] = (
+                left, bottom, 0, 0,
+                right, bottom, 1, 0,
+                right, top, 1, 1,
+                left, top, 0, 1
+            )
+            offset += QUAD_FLOATS
+        self.commit()
+    
+    def set_disc_arrays(self, x, y, diameter):
+        """Rewrite the batch from arrays of centers and diameters.
+        
+        NumPy arrays are turned into vertices with a few array operations and
+        uploaded without building a Python list; other sequences go through
+        set_discs.
+        """
+        if numpy is None or not isinstance(x, numpy.ndarray):
+            self.set_discs(list(zip(x, y, diameter)))
+            return
+        
+        count = min(len(x), MAX_QUADS)
+        buffer = self.buffer
+        if buffer is None or len(buffer) != count:
+            buffer = self.buffer = numpy.zeros((count, QUAD_FLOATS), dtype=numpy.float32)
+            # Texture coordinates never change: (0, 0) (1, 0) (1, 1) (0, 1)
+            buffer[:, 6] = buffer[:, 10] = buffer[:, 11] = buffer[:, 15] = 1
+        self.set_indices(count)
+        
+        radius = diameter[:count] * 0.5
+        left = x[:count] - radius
+        right = x[:count] + radius
+        bottom = y[:count] - radius
+        top = y[:count] + radius
+        buffer[:, 0] = buffer[:, 12] = left
+        buffer[:, 4] = buffer[:, 8] = right
+        buffer[:, 1] = buffer[:, 5] = bottom
+        buffer[:, 9] = buffer[:, 13] = top
+        self.mesh.vertices = memoryview(buffer.reshape(-1))
+    
+    def commit(self):
+        """Upload the vertex buffer to the mesh"""
+        self.mesh.vertices = self.vertices
\ No newline at end of file
@@ -1,4 +1,4 @@
-from kivy.uix.screen import Screen
+from kivy.uix.screenmanager import Screen
 from kivy.uix.scrollview import ScrollView
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.card import MDCard
@@ -8,6 +8,8 @@ from kivymd.uix.toolbar import MDTopAppBar
 from kivymd.uix.bottomnavigation import MDBottomNavigation, MDBottomNavigationItem
 from kivy.uix.image import Image
 from kivy.uix.widget import Widget
+from game.characters import CHARACTERS
+from render.atlas import load_atlas_async
 
 
 class CharacterCard(MDCard):
@@ -33,10 +35,9 @@ class CharacterCard(MDCard):
             spacing='12dp'
         )
         
-        # Character image placeholder
-        img_container = Widget(size_hint_y=0.6)
-        # For now, using a colored rectangle as placeholder
-        # In production, you would load actual character images
+        # Character image, filled in once the sprite atlas has loaded
+        self.image = Image(size_hint_y=0.6, fit_mode='contain', opacity=0)
+        load_atlas_async(self.on_atlas_loaded)
         
         # Character name
         name_label = MDLabel(
@@ -59,13 +60,19 @@ class CharacterCard(MDCard):
             height='48dp'
         )
         
-        layout.add_widget(img_container)
+        layout.add_widget(self.image)
         layout.add_widget(name_label)
         layout.add_widget(desc_label)
         
         self.add_widget(layout)
         self.bind(on_release=self.on_card_press)
     
+    def on_atlas_loaded(self, atlas):
+        sprite = self.character_data.get('sprite')
+        if atlas and sprite in atlas:
+            self.image.texture = atlas.textures[sprite]
+            self.image.opacity = 1
+    
     def on_card_press(self, *args):
         if self.on_select_callback:
             self.on_select_callback(self)
@@ -88,41 +95,8 @@ class CharacterSelectionScreen(Screen):
         self.selected_character = None
         self.character_cards = []
         
-        # Character data
-        self.characters = [
-            {
-                'name': 'Arda',
-                'description': 'Hızlı hareket\nkabiliyeti',
-                'speed': 1.5,
-                'throw_cooldown': 1.0,
-                'jump_power': 1.0,
-                'snowball_power': 1.0
-            },
-            {
-                'name': 'Elif',
-                'description': 'Hızlı atış\nkabiliyeti',
-                'speed': 1.0,
-                'throw_cooldown': 0.6,
-                'jump_power': 1.0,
-                'snowball_power': 1.0
-            },
-            {
-                'name': 'Can',
-                'description': 'Güçlü kar topu\natışları',
-                'speed': 1.0,
-                'throw_cooldown': 1.0,
-                'jump_power': 1.0,
-                'snowball_power': 1.5
-            },
-            {
-                'name': 'Ayşe',
-                'description': 'Yüksek zıplama\nkabiliyeti',
-                'speed': 1.0,
-                'throw_cooldown': 1.0,
-                'jump_power': 1.4,
-                'snowball_power': 1.0
-            }
-        ]
+        # Character data (copied so the screen can't alter the shared table)
+        self.characters = [dict(character) for character in CHARACTERS]
         
         # Main layout
         main_layout = MDBoxLayout(
@@ -222,12 +196,14 @@ class CharacterSelectionScreen(Screen):
         card.set_selected(True)
         self.selected_character = card.character_data
         
-        # Store selection globally (you might want to use a proper state manager)
-        if hasattr(self.manager.get_screen('game'), 'set_character'):
+        # Pass the selection on if the game screen has already been built
+        if self.manager and self.manager.has_screen('game'):
             self.manager.get_screen('game').set_character(self.selected_character)
     
     def start_game(self, instance):
         if self.selected_character:
+            # Builds the game screen on first use
+            self.manager.get_screen('game').set_character(self.selected_character)
             self.manager.current = 'game'
     
     def go_to_settings(self, instance):
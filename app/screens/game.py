@@ -1,15 +1,23 @@
-from kivy.uix.screen import Screen
+from kivy.uix.screenmanager import Screen
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.toolbar import MDTopAppBar
 from kivymd.uix.card import MDCard
 from kivymd.uix.label import MDLabel
 from kivymd.uix.button import MDIconButton, MDRaisedButton, MDFloatingActionButton
 from kivy.uix.widget import Widget
+from kivy.app import App
 from kivy.clock import Clock
 from kivy.core.window import Window
-from kivy.graphics import Canvas, Color, Rectangle, Ellipse, Line
+from kivy.graphics import Canvas, Color, Rectangle, Line, InstructionGroup
+import os
 import random
+import time
 from game.engine import GameEngine
+from game.replay import ReplayRecorder
+from game.profiler import FrameProfiler
+from game.threaded import SimulationThread
+from render.atlas import load_atlas
+from render.batch import QuadBatch, DEFAULT_TEX_COORDS, disc_texture
 
 
 class GameStatsCard(MDCard):
@@ -36,6 +44,7 @@ class GameStatsCard(MDCard):
             height='16dp'
         )
         
+        self.value = value
         self.value_label = MDLabel(
             text=str(value),
             theme_text_color='Primary',
@@ -49,57 +58,255 @@ class GameStatsCard(MDCard):
         self.add_widget(layout)
     
     def update_value(self, value):
-        self.value_label.text = str(value)
+        # Setting the label text re-renders its texture, so skip unchanged values
+        if value != self.value:
+            self.value = value
+            self.value_label.text = str(value)
+
+
+class PerfOverlay(MDCard):
+    """Toggleable performance HUD with rolling frame statistics"""
+    
+    def __init__(self, on_export=None, **kwargs):
+        super().__init__(**kwargs)
+        self.elevation = 0
+        self.radius = [12]
+        self.md_bg_color = (0.06, 0.11, 0.13, 0.8)
+        self.padding = '8dp'
+        
+        layout = MDBoxLayout(orientation='horizontal')
+        
+        self.stats_label = MDLabel(
+            text='',
+            font_style='Caption',
+            theme_text_color='Custom',
+            text_color=(1, 1, 1, 1)
+        )
+        
+        export_btn = MDIconButton(
+            icon='download',
+            theme_text_color='Custom',
+            text_color=(1, 1, 1, 1),
+            pos_hint={'center_y': 0.5}
+        )
+        if on_export:
+            export_btn.bind(on_release=lambda x: on_export())
+        
+        layout.add_widget(self.stats_label)
+        layout.add_widget(export_btn)
+        self.add_widget(layout)
+    
+    def set_visible(self, visible):
+        self.opacity = 1 if visible else 0
+        self.disabled = not visible
+    
+    def update_stats(self, summary):
+        frame = summary['frame']
+        phases = summary['phases']
+        
+        # Show the three slowest phases by p95
+        slowest = sorted(phases.items(), key=lambda item: item[1]['p95'], reverse=True)[:3]
+        phase_text = '  '.join(f"{name} {stats['p95']:.1f}" for name, stats in slowest)
+        
+        self.stats_label.text = (
+            f"Kare p50 {frame['p50']:.1f} / p95 {frame['p95']:.1f} / p99 {frame['p99']:.1f} ms\n"
+            f"p95: {phase_text}\n"
+            f"Nesne {summary['entities']}  GC/kare {summary['gc_per_frame']:.2f}"
+        )
 
 
 class GameCanvas(Widget):
+    """Retained-mode game renderer.
+    
+    Instructions are created once and updated in place every frame. Static
+    layers follow the widget geometry; snow, the player, enemies and
+    snowballs are each drawn from one batched mesh. Player and enemy quads
+    sample frames of the prebuilt sprite atlas, so each layer binds a single
+    texture, and fall back to flat colours for sprites the atlas lacks.
+    Moving entities are drawn interpolated between the engine's last two steps.
+    
+    Layers are only touched when their state changed: nothing is redrawn
+    unless the engine stepped or the interpolation factor moved, snow only
+    after a step, and the player only when its position changed.
+    
+    When the simulation runs on its own thread, `state_source` returns the
+    latest immutable snapshot and the layers are drawn from it instead of
+    from the live engine.
+    """
+    
+    PLAYER_COLOR = (0.2, 0.6, 1, 1)  # Blue player without a sprite
+    ENEMY_COLOR = (1, 0.3, 0.3, 1)  # Red enemies without a sprite
+    ENEMY_SPRITE = 'enemy'
+    ENEMY_SNOWBALL_COLOR = (1, 0.85, 0.85, 1)  # Pinkish, to tell incoming snowballs apart
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.game_engine = None
-        self.bind(size=self.update_graphics)
+        self.state_source = None
+        self.atlas = load_atlas()
+        
+        # Dirty tracking: what the layers currently show
+        self.drawn_frame = None
+        self.drawn_alpha = None
+        self.snow_frame = None
+        self.player_quad = None
+        self.force_redraw = True
+        
+        # How often each layer was re-uploaded, to check what a frame touched
+        self.layer_updates = {'snow': 0, 'player': 0, 'enemies': 0, 'snowballs': 0,
+                              'enemy_snowballs': 0}
+        
+        with self.canvas:
+            # Static layers: sky and ground
+            Color(0.7, 0.85, 0.95, 1)  # Light blue sky
+            self.sky_rect = Rectangle(pos=self.pos, size=self.size)
+            Color(0.9, 0.9, 0.9, 1)  # Light gray ground
+            self.ground_rect = Rectangle(pos=self.pos, size=(self.width, 100))
+        
+        # Dynamic layers, drawn in this order, one batched mesh each
+        self.snow_batch = QuadBatch(texture=disc_texture())
+        self.snow_layer = InstructionGroup()
+        self.snow_layer.add(Color(1, 1, 1, 0.8))
+        self.snow_layer.add(self.snow_batch.mesh)
+        self.player_batch = QuadBatch()
+        self.player_color = Color(*self.PLAYER_COLOR)
+        self.player_layer = InstructionGroup()
+        self.player_layer.add(self.player_color)
+        self.player_layer.add(self.player_batch.mesh)
+        self.enemy_batch = QuadBatch()
+        self.enemy_color = Color(*self.ENEMY_COLOR)
+        self.enemy_layer = InstructionGroup()
+        self.enemy_layer.add(self.enemy_color)
+        self.enemy_layer.add(self.enemy_batch.mesh)
+        self.snowball_batch = QuadBatch(texture=disc_texture())
+        self.snowball_layer = InstructionGroup()
+        self.snowball_layer.add(Color(1, 1, 1, 1))  # White snowballs
+        self.snowball_layer.add(self.snowball_batch.mesh)
+        self.enemy_snowball_batch = QuadBatch(texture=disc_texture())
+        self.enemy_snowball_layer = InstructionGroup()
+        self.enemy_snowball_layer.add(Color(*self.ENEMY_SNOWBALL_COLOR))
+        self.enemy_snowball_layer.add(self.enemy_snowball_batch.mesh)
+        
+        self.player_uvs = self.use_sprite(self.player_batch, self.player_color,
+                                          None, self.PLAYER_COLOR)
+        self.enemy_uvs = self.use_sprite(self.enemy_batch, self.enemy_color,
+                                         self.ENEMY_SPRITE, self.ENEMY_COLOR)
+        
+        self.canvas.add(self.snow_layer)
+        self.canvas.add(self.player_layer)
+        self.canvas.add(self.enemy_layer)
+        self.canvas.add(self.snowball_layer)
+        self.canvas.add(self.enemy_snowball_layer)
+        
+        self.bind(pos=self.update_static_layers, size=self.update_static_layers)
         
     def set_game_engine(self, engine):
+        if self.game_engine:
+            self.game_engine.remove_listener(self)
+        
         self.game_engine = engine
+        engine.add_listener(self)
+        if engine.player:
+            self.on_spawn('player', engine.player)
+        self.force_redraw = True
+        
+    def use_sprite(self, batch, color, name, fallback_color):
+        """Point a layer at an atlas frame and return the frame's UVs"""
+        if self.atlas and name in self.atlas:
+            batch.mesh.texture = self.atlas.page(name)
+            color.rgba = (1, 1, 1, 1)
+            return self.atlas.uvs(name)
+        batch.mesh.texture = None
+        color.rgba = fallback_color
+        return DEFAULT_TEX_COORDS
+        
+    def update_static_layers(self, *args):
+        """Resize the sky and ground when the widget geometry changes"""
+        self.sky_rect.pos = self.pos
+        self.sky_rect.size = self.size
+        self.ground_rect.pos = self.pos
+        self.ground_rect.size = (self.width, 100)
+        self.force_redraw = True
+        self.update_graphics()
+    
+    def on_spawn(self, kind, entity):
+        if kind == 'player':
+            # The sprite follows the selected character
+            sprite = (self.game_engine.character_data or {}).get('sprite')
+            self.player_uvs = self.use_sprite(self.player_batch, self.player_color,
+                                              sprite, self.PLAYER_COLOR)
+        self.force_redraw = True
+    
+    def on_despawn(self, kind, entity):
+        self.force_redraw = True
+    
+    def entity_quad(self, entity, alpha):
+        """Interpolated (x, y, width, height) of an entity between the last two steps"""
+        x = entity.prev_x + (entity.x - entity.prev_x) * alpha
+        y = entity.prev_y + (entity.y - entity.prev_y) * alpha
+        return (x - entity.width/2, y, entity.width, entity.height)
         
     def update_graphics(self, *args):
-        if not self.game_engine:
+        engine = self.game_engine
+        if not engine:
             return
-            
-        self.canvas.clear()
-        with self.canvas:
-            # Background color
-            Color(0.7, 0.85, 0.95, 1)  # Light blue sky
-            Rectangle(pos=self.pos, size=self.size)
-            
-            # Ground
-            Color(0.9, 0.9, 0.9, 1)  # Light gray ground
-            Rectangle(pos=(self.x, self.y), size=(self.width, 100))
-            
-            # Draw snowfall
-            Color(1, 1, 1, 0.8)
-            for particle in self.game_engine.snow_particles:
-                d = particle['size']
-                Ellipse(pos=(particle['x'] - d/2, particle['y'] - d/2), size=(d, d))
-            
-            # Draw player
-            if self.game_engine.player:
-                player = self.game_engine.player
-                Color(0.2, 0.6, 1, 1)  # Blue player
-                Rectangle(pos=(player.x - player.width/2, player.y), 
-                         size=(player.width, player.height))
-            
-            # Draw enemies
-            Color(1, 0.3, 0.3, 1)  # Red enemies
-            for enemy in self.game_engine.enemies:
-                Rectangle(pos=(enemy.x - enemy.width/2, enemy.y), 
-                         size=(enemy.width, enemy.height))
-            
-            # Draw snowballs
-            Color(1, 1, 1, 1)  # White snowballs
-            for snowball in self.game_engine.snowballs:
-                d = snowball.radius * 2
-                Ellipse(pos=(snowball.x - snowball.radius, snowball.y - snowball.radius), 
-                       size=(d, d))
+        if self.state_source:
+            engine = self.state_source()
+        alpha = engine.interpolation_alpha
+        frame = engine.frame
+        
+        # Nothing moved since the last draw
+        if not self.force_redraw and frame == self.drawn_frame and alpha == self.drawn_alpha:
+            return
+        if self.force_redraw:
+            self.player_quad = None
+        
+        # Snow is not interpolated, so it only changes when the engine steps
+        if self.force_redraw or frame != self.snow_frame:
+            snow = engine.snow
+            self.snow_batch.set_disc_arrays(snow.x, snow.y, snow.size)
+            self.snow_frame = frame
+            self.layer_updates['snow'] += 1
+        
+        # Player, only when it moved
+        player = engine.player
+        quad = self.entity_quad(player, alpha) if player else None
+        if quad != self.player_quad:
+            batch = self.player_batch
+            batch.resize(1 if quad else 0)
+            if quad:
+                batch.set_quad(0, *quad, tex_coords=self.player_uvs)
+            batch.commit()
+            self.player_quad = quad
+            self.layer_updates['player'] += 1
+        
+        # Enemies walk every step
+        enemies = engine.enemies
+        if enemies or self.enemy_batch.count:
+            batch = self.enemy_batch
+            batch.resize(len(enemies))
+            uvs = self.enemy_uvs
+            for index in range(batch.count):
+                batch.set_quad(index, *self.entity_quad(enemies[index], alpha), tex_coords=uvs)
+            batch.commit()
+            self.layer_updates['enemies'] += 1
+        
+        # Draw snowballs, skipping the upload while there are none to show
+        for name, batch, snowballs in (
+                ('snowballs', self.snowball_batch, engine.snowballs),
+                ('enemy_snowballs', self.enemy_snowball_batch, engine.enemy_snowballs)):
+            if snowballs or batch.count:
+                batch.set_discs([
+                    (snowball.prev_x + (snowball.x - snowball.prev_x) * alpha,
+                     snowball.prev_y + (snowball.y - snowball.prev_y) * alpha,
+                     snowball.radius * 2)
+                    for snowball in snowballs
+                ])
+                self.layer_updates[name] += 1
+        
+        self.drawn_frame = frame
+        self.drawn_alpha = alpha
+        self.force_redraw = False
 
 
 class ControlButton(MDRaisedButton):
@@ -111,11 +318,22 @@ class ControlButton(MDRaisedButton):
 
 
 class GameScreen(Screen):
+    # Render rates; the simulation always steps at the engine's fixed 60 Hz
+    RENDER_FPS = 60
+    BATTERY_SAVER_FPS = 30
+    
+    # Step the engine on a worker thread and draw from its snapshots
+    threaded_simulation = os.environ.get('KARTOPU_THREADED_SIM') == '1'
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.selected_character = None
-        self.game_engine = GameEngine()
+        self.render_fps = self.RENDER_FPS
+        self.game_engine = GameEngine(difficulty='easy')
         self.game_running = False
+        self.recorder = ReplayRecorder()
+        self.profiler = None
+        self.simulation = None
         self.setup_ui()
         
         # Bind keyboard events
@@ -135,7 +353,10 @@ class GameScreen(Screen):
             md_bg_color=(0.05, 0.65, 0.95, 1),
             specific_text_color=(1, 1, 1, 1),
             left_action_items=[['arrow-left', lambda x: self.go_back()]],
-            right_action_items=[['pause', lambda x: self.toggle_pause()]]
+            right_action_items=[
+                ['speedometer', lambda x: self.toggle_profiler()],
+                ['pause', lambda x: self.toggle_pause()]
+            ]
         )
         
         # Stats section
@@ -151,8 +372,12 @@ class GameScreen(Screen):
         self.score_card = GameStatsCard('SKOR', '0')
         self.time_card = GameStatsCard('SÜRE', '60')
         
+        # Performance HUD, hidden (acting as a spacer) until toggled
+        self.perf_overlay = PerfOverlay(on_export=self.export_trace)
+        self.perf_overlay.set_visible(False)
+        
         stats_layout.add_widget(self.score_card)
-        stats_layout.add_widget(Widget())  # Spacer
+        stats_layout.add_widget(self.perf_overlay)
         stats_layout.add_widget(self.time_card)
         
         # Game canvas
@@ -185,12 +410,12 @@ class GameScreen(Screen):
         )
         
         # Bind control events
-        self.left_btn.bind(on_press=lambda x: self.game_engine.set_player_input('left', True))
-        self.left_btn.bind(on_release=lambda x: self.game_engine.set_player_input('left', False))
-        self.right_btn.bind(on_press=lambda x: self.game_engine.set_player_input('right', True))
-        self.right_btn.bind(on_release=lambda x: self.game_engine.set_player_input('right', False))
-        self.jump_btn.bind(on_press=lambda x: self.game_engine.set_player_input('jump', True))
-        self.throw_btn.bind(on_press=lambda x: self.game_engine.set_player_input('throw', True))
+        self.left_btn.bind(on_press=lambda x: self.set_input('left', True))
+        self.left_btn.bind(on_release=lambda x: self.set_input('left', False))
+        self.right_btn.bind(on_press=lambda x: self.set_input('right', True))
+        self.right_btn.bind(on_release=lambda x: self.set_input('right', False))
+        self.jump_btn.bind(on_press=lambda x: self.set_input('jump', True))
+        self.throw_btn.bind(on_press=lambda x: self.set_input('throw', True))
         
         controls_layout.add_widget(self.left_btn)
         controls_layout.add_widget(self.right_btn)
@@ -238,37 +463,147 @@ class GameScreen(Screen):
     def start_game(self):
         if not self.game_running:
             self.game_running = True
+            
+            # Seed every match and record it so it can be replayed offline
+            self.game_engine.seed = random.randrange(2 ** 31)
             self.game_engine.reset_game()
-            Clock.schedule_interval(self.update_game, 1/60.0)  # 60 FPS
+            self.recorder.attach(self.game_engine)
+            if self.threaded_simulation:
+                self.start_simulation_thread()
+            Clock.schedule_interval(self.update_game, 1.0 / self.render_fps)
+    
+    def start_simulation_thread(self):
+        """Hand the engine to a worker thread; from here on it is only touched there"""
+        # FrameProfiler is not thread-safe, so engine phases are not profiled
+        self.game_engine.profiler = None
+        self.simulation = SimulationThread(self.game_engine)
+        self.game_canvas.state_source = self.simulation.view
+        self.simulation.start()
+    
+    def stop_simulation_thread(self):
+        if self.simulation:
+            self.simulation.stop()
+            self.simulation = None
+            self.game_canvas.state_source = None
+            self.game_canvas.force_redraw = True
+    
+    def set_input(self, action, active):
+        """Forward player input to the engine, queued when it runs on a worker thread"""
+        if self.simulation:
+            self.simulation.set_player_input(action, active)
+        else:
+            self.game_engine.set_player_input(action, active)
+    
+    def set_render_fps(self, fps):
+        """Cap how often the screen is redrawn, e.g. 30 FPS in battery saver mode"""
+        self.render_fps = fps
+        if self.game_running:
+            Clock.unschedule(self.update_game)
+            Clock.schedule_interval(self.update_game, 1.0 / fps)
+    
+    def set_snow_density(self, density):
+        if self.simulation:
+            self.simulation.submit(self.game_engine.set_snow_density, density)
+        else:
+            self.game_engine.set_snow_density(density)
+    
+    def set_difficulty(self, difficulty):
+        if self.simulation:
+            self.simulation.submit(self.game_engine.set_difficulty, difficulty)
+        else:
+            self.game_engine.set_difficulty(difficulty)
+    
+    def set_battery_saver(self, enabled):
+        self.set_render_fps(self.BATTERY_SAVER_FPS if enabled else self.RENDER_FPS)
     
     def stop_game(self):
         if self.game_running:
             self.game_running = False
             Clock.unschedule(self.update_game)
+            self.stop_simulation_thread()
     
     def update_game(self, dt):
         if not self.game_running:
             return
+        
+        profiler = self.profiler
+        if profiler:
+            profiler.begin_frame()
             
-        # Update game engine
-        self.game_engine.update(dt)
+        # Update game engine in fixed steps, independent of the render rate;
+        # a simulation thread steps on its own and we read its latest snapshot
+        if self.simulation:
+            state = self.simulation.view()
+        else:
+            self.game_engine.advance(dt)
+            state = self.game_engine
         
-        # Update UI
-        self.score_card.update_value(self.game_engine.score)
-        self.time_card.update_value(int(self.game_engine.time_remaining))
+        # Update UI (the cards skip values that did not change)
+        self.score_card.update_value(state.score)
+        self.time_card.update_value(int(state.time_remaining))
         
         # Update canvas
-        self.game_canvas.update_graphics()
+        if profiler:
+            profiler.run_phase('render', self.game_canvas.update_graphics)
+        else:
+            self.game_canvas.update_graphics()
+        
+        if profiler:
+            profiler.end_frame(1 + len(state.enemies) + len(state.snowballs) +
+                               len(state.enemy_snowballs))
         
         # Check game over
-        if self.game_engine.time_remaining <= 0:
+        if state.time_remaining <= 0:
             self.game_over()
     
     def game_over(self):
         self.stop_game()
+        self.save_replay()
         # TODO: Show game over dialog
         print(f"Game Over! Final Score: {self.game_engine.score}")
     
+    def save_replay(self):
+        """Save the last match to the app data directory"""
+        if not self.recorder.replay:
+            return
+        path = os.path.join(App.get_running_app().user_data_dir, 'last_match.ktr')
+        try:
+            self.recorder.replay.save(path)
+        except OSError as e:
+            print(f"Could not save replay: {e}")
+    
+    def toggle_profiler(self):
+        """Turn frame profiling and the performance HUD on or off"""
+        if self.profiler is None:
+            self.profiler = FrameProfiler()
+            self.profiler.enable()
+            if not self.simulation:
+                self.game_engine.profiler = self.profiler
+            self.perf_overlay.set_visible(True)
+            Clock.schedule_interval(self.refresh_perf_overlay, 0.5)
+        else:
+            Clock.unschedule(self.refresh_perf_overlay)
+            self.profiler.disable()
+            self.game_engine.profiler = None
+            self.profiler = None
+            self.perf_overlay.set_visible(False)
+    
+    def refresh_perf_overlay(self, dt):
+        if self.profiler:
+            self.perf_overlay.update_stats(self.profiler.summary())
+    
+    def export_trace(self):
+        """Write the recorded frames as a Chrome trace to the app data directory"""
+        if not self.profiler:
+            return
+        path = os.path.join(App.get_running_app().user_data_dir,
+                            time.strftime('trace_%Y%m%d_%H%M%S.json'))
+        try:
+            count = self.profiler.export_chrome_trace(path)
+            print(f"Trace with {count} events written to {path}")
+        except OSError as e:
+            print(f"Could not write trace: {e}")
+    
     def toggle_pause(self):
         if self.game_running:
             self.stop_game()
@@ -282,20 +617,22 @@ class GameScreen(Screen):
     def on_key_down(self, window, key, *args):
         # Desktop keyboard controls
         if key == 97 or key == 276:  # A or Left arrow
-            self.game_engine.set_player_input('left', True)
+            self.set_input('left', True)
         elif key == 100 or key == 275:  # D or Right arrow
-            self.game_engine.set_player_input('right', True)
+            self.set_input('right', True)
         elif key == 119 or key == 32:  # W or Space
-            self.game_engine.set_player_input('jump', True)
+            self.set_input('jump', True)
         elif key == 102:  # F
-            self.game_engine.set_player_input('throw', True)
+            self.set_input('throw', True)
+        elif key == 284:  # F3
+            self.toggle_profiler()
         return True
     
     def on_key_up(self, window, key, *args):
         if key == 97 or key == 276:  # A or Left arrow
-            self.game_engine.set_player_input('left', False)
+            self.set_input('left', False)
         elif key == 100 or key == 275:  # D or Right arrow
-            self.game_engine.set_player_input('right', False)
+            self.set_input('right', False)
         elif key == 119 or key == 32:  # W or Space
-            self.game_engine.set_player_input('jump', False)
+            self.set_input('jump', False)
         return True
\ No newline at end of file
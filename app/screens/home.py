@@ -1,54 +1,49 @@
-from kivy.uix.screen import Screen
+from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
-from kivy.graphics import Canvas, Color, Ellipse
+from kivy.graphics import Canvas, Color
 from kivy.clock import Clock
-import random
 from kivymd.uix.button import MDRaisedButton, MDFillRoundFlatButton
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivy.uix.widget import Widget
 from kivy.graphics import Line, Rectangle
+from kivymd.uix.progressbar import MDProgressBar
+from game.particles import DENSITIES, SnowParticles
+from render.assets import asset_manager
+from render.batch import QuadBatch, disc_texture
 
 
 class SnowfallWidget(Widget):
-    def __init__(self, **kwargs):
+    def __init__(self, density='low', **kwargs):
         super().__init__(**kwargs)
-        self.snowflakes = []
+        self.snow = SnowParticles(self.width, self.height, DENSITIES[density],
+                                  speed_range=(20, 50), size_range=(2, 6))
+        self.snow_batch = QuadBatch(texture=disc_texture())
+        with self.canvas:
+            Color(0.8, 0.8, 0.9, 0.6)
+        self.canvas.add(self.snow_batch.mesh)
         self.bind(size=self.update_graphics)
         Clock.schedule_interval(self.update_snowfall, 1/30.0)
         
+    def set_density(self, density):
+        self.snow.set_density(density)
+        self.draw_snowfall()
+        
     def update_graphics(self, *args):
-        # Initialize snowflakes
-        self.snowflakes = []
-        for _ in range(50):
-            self.snowflakes.append({
-                'x': random.uniform(0, self.width),
-                'y': random.uniform(0, self.height),
-                'speed': random.uniform(20, 50),
-                'size': random.uniform(2, 6)
-            })
+        # Scatter snowflakes over the new size
+        self.snow.set_bounds(self.width, self.height)
         self.draw_snowfall()
         
     def update_snowfall(self, dt):
-        if not self.snowflakes:
+        if not len(self.snow):
             return
-            
-        # Update snowflake positions
-        for flake in self.snowflakes:
-            flake['y'] -= flake['speed'] * dt
-            if flake['y'] < 0:
-                flake['y'] = self.height
-                flake['x'] = random.uniform(0, self.width)
         
+        self.snow.update(dt)
         self.draw_snowfall()
         
     def draw_snowfall(self):
-        self.canvas.clear()
-        with self.canvas:
-            Color(0.8, 0.8, 0.9, 0.6)
-            for flake in self.snowflakes:
-                d = flake['size']
-                Ellipse(pos=(flake['x'] - d/2, flake['y'] - d/2), size=(d, d))
+        snow = self.snow
+        self.snow_batch.set_disc_arrays(snow.x, snow.y, snow.size)
 
 
 class HomeScreen(Screen):
@@ -64,8 +59,8 @@ class HomeScreen(Screen):
         )
         
         # Add snowfall background
-        snowfall = SnowfallWidget()
-        main_layout.add_widget(snowfall)
+        self.snowfall = SnowfallWidget()
+        main_layout.add_widget(self.snowfall)
         
         # Title with shadow effect
         title_layout = BoxLayout(
@@ -122,10 +117,28 @@ class HomeScreen(Screen):
         button_layout.add_widget(start_btn)
         button_layout.add_widget(settings_btn)
         
+        # Asset loading progress, hidden once everything is ready
+        self.loading_bar = MDProgressBar(
+            value=0,
+            size_hint=(0.8, None),
+            height='4dp',
+            pos_hint={'center_x': 0.5},
+            color=(0.05, 0.65, 0.95, 1)
+        )
+        
         main_layout.add_widget(title_layout)
         main_layout.add_widget(button_layout)
+        main_layout.add_widget(self.loading_bar)
         
         self.add_widget(main_layout)
+        
+        assets = asset_manager()
+        assets.bind(progress=self.on_asset_progress)
+        self.on_asset_progress(assets, assets.progress)
+    
+    def on_asset_progress(self, assets, progress):
+        self.loading_bar.value = progress * 100
+        self.loading_bar.opacity = 1 if assets.loading else 0
     
     def go_to_character_selection(self, instance):
         self.manager.current = 'character_selection'
@@ -0,0 +1,69 @@
+import importlib
+import sys
+
+from kivy.clock import Clock
+from kivy.uix.screenmanager import ScreenManager
+
+
+class LazyScreenManager(ScreenManager):
+    """ScreenManager that builds registered screens on first use.
+    
+    Screens are registered as 'module:ClassName' paths, so neither the
+    screen module (and the KivyMD widgets it imports) nor its widget tree
+    is loaded until the screen is navigated to or pre-warmed.
+    """
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.factories = {}
+        self.prewarm_queue = []
+        self.profiler = None  # Optional StartupProfiler timing screen builds
+    
+    def register(self, name, path):
+        """Register a screen to build from path ('module:ClassName') when needed"""
+        self.factories[name] = path
+    
+    def get_screen(self, name):
+        # Setting `current` also goes through get_screen, so navigation builds too
+        if not self.has_screen(name) and name in self.factories:
+            return self.build_screen(name)
+        return super().get_screen(name)
+    
+    def build_screen(self, name):
+        module_name, class_name = self.factories.pop(name).split(':')
+        screen_class = getattr(importlib.import_module(module_name), class_name)
+        if self.profiler:
+            screen = self.profiler.measure(f'{class_name}()', screen_class, name=name)
+        else:
+            screen = screen_class(name=name)
+        self.add_widget(screen)
+        return screen
+    
+    def prewarm(self, names=None):
+        """Build the remaining screens without blocking the current one.
+        
+        Importing a KivyMD screen module loads kv rules and registers widget
+        classes, which is only safe on the main thread. So everything runs
+        there, one step per frame: import the next screen's module, then
+        build the screen on the following frame.
+        """
+        self.prewarm_queue = [name for name in (names or list(self.factories))
+                              if name in self.factories]
+        Clock.schedule_once(self.prewarm_next)
+    
+    def prewarm_next(self, dt):
+        # Screens may have been built by navigation in the meantime
+        while self.prewarm_queue and self.prewarm_queue[0] not in self.factories:
+            self.prewarm_queue.pop(0)
+        if not self.prewarm_queue:
+            return
+        
+        name = self.prewarm_queue[0]
+        module_name = self.factories[name].split(':')[0]
+        if module_name in sys.modules:
+            self.prewarm_queue.pop(0)
+            self.build_screen(name)
+        else:
+            importlib.import_module(module_name)
+        if self.prewarm_queue:
+            Clock.schedule_once(self.prewarm_next)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from kivy.uix.screen import Screen
+from kivy.uix.screenmanager import Screen
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.toolbar import MDTopAppBar
 from kivymd.uix.list import MDList, OneLineAvatarIconListItem
@@ -75,9 +75,17 @@ class SettingsScreen(Screen):
             on_switch_change=self.on_dark_mode_change
         )
         
+        # Battery saver: render at a lower frame rate
+        battery_saver_item = SettingsListItem(
+            text='Pil Tasarrufu',
+            switch_active=False,
+            on_switch_change=self.on_battery_saver_change
+        )
+        
         settings_list.add_widget(sound_item)
         settings_list.add_widget(music_item)
         settings_list.add_widget(dark_mode_item)
+        settings_list.add_widget(battery_saver_item)
         
         # Difficulty section
         difficulty_label = MDLabel(
@@ -125,10 +133,39 @@ class SettingsScreen(Screen):
         difficulty_layout.add_widget(normal_btn)
         difficulty_layout.add_widget(hard_btn)
         
+        # Snow density section
+        snow_label = MDLabel(
+            text='Kar Yoğunluğu',
+            theme_text_color='Primary',
+            font_style='H6',
+            size_hint_y=None,
+            height='48dp'
+        )
+        
+        snow_layout = MDBoxLayout(
+            orientation='horizontal',
+            spacing='10dp',
+            size_hint_y=None,
+            height='48dp'
+        )
+        
+        for density, text in (('classic', 'Klasik'), ('low', 'Az'), ('medium', 'Orta'), ('blizzard', 'Tipi')):
+            snow_btn = MDRaisedButton(
+                text=text,
+                size_hint_x=1,
+                md_bg_color=(1, 1, 1, 1),
+                text_color=(0.05, 0.65, 0.95, 1),
+                line_color=(0.05, 0.65, 0.95, 1)
+            )
+            snow_btn.bind(on_release=lambda x, density=density: self.set_snow_density(density))
+            snow_layout.add_widget(snow_btn)
+        
         content_layout.add_widget(settings_list)
         content_layout.add_widget(Widget(size_hint_y=0.2))  # Spacer
         content_layout.add_widget(difficulty_label)
         content_layout.add_widget(difficulty_layout)
+        content_layout.add_widget(snow_label)
+        content_layout.add_widget(snow_layout)
         content_layout.add_widget(Widget())  # Spacer
         
         main_layout.add_widget(toolbar)
@@ -141,6 +178,8 @@ class SettingsScreen(Screen):
             'sound': True,
             'music': True,
             'dark_mode': False,
+            'battery_saver': False,
+            'snow_density': 'classic',
             'difficulty': 'easy'
         }
     
@@ -162,8 +201,23 @@ class SettingsScreen(Screen):
             self.parent.md_bg_color = (0.96, 0.97, 0.97, 1)  # #f5f7f8
         print(f"Dark mode: {'ON' if value else 'OFF'}")
     
+    def on_battery_saver_change(self, instance, value):
+        self.settings['battery_saver'] = value
+        if self.manager:
+            self.manager.get_screen('game').set_battery_saver(value)
+        print(f"Battery saver: {'ON' if value else 'OFF'}")
+    
+    def set_snow_density(self, density):
+        self.settings['snow_density'] = density
+        if self.manager:
+            self.manager.get_screen('home').snowfall.set_density(density)
+            self.manager.get_screen('game').set_snow_density(density)
+        print(f"Snow density set to: {density}")
+    
     def set_difficulty(self, difficulty):
         self.settings['difficulty'] = difficulty
+        if self.manager:
+            self.manager.get_screen('game').set_difficulty(difficulty)
         print(f"Difficulty set to: {difficulty}")
         
         # Update button colors to show selection
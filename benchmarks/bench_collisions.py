@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark snowball-enemy collision detection.
+Compares brute force against the sweep-and-prune broad phase as the
+number of snowballs and enemies grows.
+"""
+
+import sys
+import os
+import random
+import timeit
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from game.engine import GameEngine, COLLISION_BRUTE_FORCE, COLLISION_SWEEP_AND_PRUNE
+from game.sprites import Enemy, Snowball
+
+
+def make_engine(count, seed=1):
+    """Build an engine with `count` snowballs and `count` enemies spread across a wide level"""
+    rng = random.Random(seed)
+    engine = GameEngine()
+    engine.reset_game()
+    engine.game_width = count * 20
+    
+    for _ in range(count):
+        engine.enemies.append(Enemy(
+            x=rng.uniform(0, engine.game_width),
+            y=engine.ground_level,
+            width=35,
+            height=55
+        ))
+        engine.snowballs.append(Snowball(
+            x=rng.uniform(0, engine.game_width),
+            y=rng.uniform(engine.ground_level, engine.ground_level + 200),
+            velocity_x=300,
+            velocity_y=50
+        ))
+    return engine
+
+
+def time_mode(engine, mode, repeat=5):
+    engine.collision_mode = mode
+    finder = (engine.find_hits_brute_force if mode == COLLISION_BRUTE_FORCE
+              else engine.find_hits_sweep_and_prune)
+    loops = max(1, 2000 // len(engine.snowballs))
+    best = min(timeit.repeat(finder, number=loops, repeat=repeat))
+    return best / loops, len(finder())
+
+
+def run_benchmark(counts=(10, 50, 100, 250, 500, 1000, 2000)):
+    print("🎯 Collision Detection Benchmark (per check, lower is better)")
+    print("=" * 60)
+    print(f"{'entities':>10} {'brute force':>14} {'sweep&prune':>14} {'speedup':>9}")
+    
+    for count in counts:
+        engine = make_engine(count)
+        brute_time, brute_hits = time_mode(engine, COLLISION_BRUTE_FORCE)
+        sweep_time, sweep_hits = time_mode(engine, COLLISION_SWEEP_AND_PRUNE)
+        assert brute_hits == sweep_hits, "broad phase changed the result"
+        
+        print(f"{count:>10} {brute_time * 1000:>11.3f} ms {sweep_time * 1000:>11.3f} ms "
+              f"{brute_time / sweep_time:>8.1f}x")
+
+
+if __name__ == '__main__':
+    run_benchmark()
\ No newline at end of file
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark removal of dead entities from the engine lists.
+Compares the old collect-then-list.remove approach with the alive-flag
+compaction used by GameEngine, killing half of the snowballs each run.
+"""
+
+import sys
+import os
+import timeit
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from game.engine import GameEngine
+from game.sprites import Snowball
+
+
+def fill(engine, count):
+    engine.snowballs.clear()
+    for i in range(count):
+        engine.snowballs.append(Snowball(i, 200, 300, 50))
+
+
+def remove_with_list_remove(engine):
+    """Previous behaviour: linear scan plus element shift per removal"""
+    snowballs_to_remove = engine.snowballs[::2]
+    for snowball in snowballs_to_remove:
+        if snowball in engine.snowballs:
+            engine.snowballs.remove(snowball)
+
+
+def remove_with_compaction(engine):
+    for snowball in engine.snowballs[::2]:
+        engine.kill_snowball(snowball)
+    engine.compact_snowballs()
+
+
+def time_removal(remove, count, repeat=5):
+    engine = GameEngine(snowball_pool_size=0)
+    engine.reset_game()
+    
+    def run():
+        fill(engine, count)
+        remove(engine)
+    
+    def setup_only():
+        fill(engine, count)
+    
+    loops = max(1, 20000 // count)
+    total = min(timeit.repeat(run, number=loops, repeat=repeat))
+    setup = min(timeit.repeat(setup_only, number=loops, repeat=repeat))
+    return max(total - setup, 0) / loops
+
+
+def run_benchmark(counts=(100, 500, 1000, 2000, 5000, 10000)):
+    print("🧹 Entity Removal Benchmark (remove half of N snowballs)")
+    print("=" * 60)
+    print(f"{'entities':>10} {'list.remove':>14} {'compaction':>14} {'speedup':>9}")
+    
+    for count in counts:
+        legacy = time_removal(remove_with_list_remove, count)
+        compact = time_removal(remove_with_compaction, count)
+        print(f"{count:>10} {legacy * 1000:>11.3f} ms {compact * 1000:>11.3f} ms "
+              f"{legacy / compact:>8.1f}x")
+
+
+if __name__ == '__main__':
+    run_benchmark()
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Benchmarks for the game engine hot paths, parameterized by entity count.
+Requires pytest-benchmark; GameCanvas benchmarks also need Kivy and a
+window provider (use SDL_VIDEODRIVER=offscreen or dummy on CI).
+
+Save a baseline:
+    python -m pytest benchmarks --benchmark-only --benchmark-save=baseline
+
+Fail when any hot path is more than 10% slower than the baseline:
+    python -m pytest benchmarks --benchmark-only \
+        --benchmark-compare=0001_baseline --benchmark-compare-fail=mean:10%
+"""
+
+import sys
+import os
+import time
+import pytest
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+pytest.importorskip('pytest_benchmark')
+
+from game.engine import GameEngine
+from game.rollback import RollbackSession
+from game.sprites import Enemy, Snowball
+
+
+ENTITY_COUNTS = [10, 100, 1000]
+FRAME = 1/60.0
+VOLLEY = 10000
+
+
+def populated_engine(count, seed=0):
+    """Engine with `count` enemies, snowballs and snow particles spread across the level"""
+    engine = GameEngine(seed=seed, enemy_pool_size=count, snowball_pool_size=count)
+    engine.reset_game()
+    engine.time_remaining = 1e9
+    rng = engine.rng
+    
+    for _ in range(count):
+        engine.add_enemy(Enemy(rng.uniform(0, engine.game_width), engine.ground_level, 35, 55))
+        engine.add_snowball(Snowball(
+            rng.uniform(0, engine.game_width),
+            rng.uniform(engine.ground_level + 50, engine.game_height),
+            300,
+            50
+        ))
+    
+    if len(engine.snow) < count:
+        engine.snow.reset(count)
+    return engine
+
+
+def volley_engine(use_entity_store, snowballs=VOLLEY, enemies=20, seed=0):
+    """Engine one step into a volley of `snowballs` flying at a few enemies"""
+    engine = GameEngine(seed=seed, use_entity_store=use_entity_store)
+    engine.reset_game()
+    rng = engine.rng
+    
+    for _ in range(enemies):
+        engine.add_enemy(Enemy(rng.uniform(0, engine.game_width), engine.ground_level, 35, 55))
+    for _ in range(snowballs):
+        engine.add_snowball(Snowball(
+            rng.uniform(0, engine.game_width),
+            rng.uniform(engine.ground_level + 50, engine.game_height),
+            300,
+            50
+        ))
+    engine.update_enemies(FRAME)
+    engine.update_snowballs(FRAME)
+    return engine
+
+
+def bench_engine(benchmark, count, run):
+    """Time run(engine) on a freshly populated engine every round"""
+    def setup():
+        return (populated_engine(count),), {}
+    benchmark.pedantic(run, setup=setup, rounds=30, warmup_rounds=2)
+
+
+@pytest.mark.parametrize('count', ENTITY_COUNTS)
+def test_update(benchmark, count):
+    bench_engine(benchmark, count, lambda engine: engine.update(FRAME))
+
+
+@pytest.mark.parametrize('count', ENTITY_COUNTS)
+def test_check_collisions(benchmark, count):
+    bench_engine(benchmark, count, lambda engine: engine.check_collisions())
+
+
+@pytest.mark.parametrize('use_entity_store', [False, True], ids=['objects', 'store'])
+def test_check_collisions_volley(benchmark, use_entity_store):
+    def setup():
+        return (volley_engine(use_entity_store),), {}
+    benchmark.pedantic(lambda engine: engine.check_collisions(), setup=setup,
+                       rounds=10, warmup_rounds=1)
+
+
+def test_store_collisions_beat_objects():
+    # The entity store tests whole columns at once, so with 10k snowballs it
+    # must be faster than testing sprite objects one at a time
+    def fastest(use_entity_store):
+        times = []
+        for _ in range(3):
+            engine = volley_engine(use_entity_store)
+            start = time.perf_counter()
+            engine.check_collisions()
+            times.append(time.perf_counter() - start)
+        return min(times)
+    
+    assert fastest(True) < fastest(False)
+
+
+@pytest.mark.parametrize('count', ENTITY_COUNTS)
+def test_update_snowballs(benchmark, count):
+    bench_engine(benchmark, count, lambda engine: engine.update_snowballs(FRAME))
+
+
+@pytest.mark.parametrize('count', ENTITY_COUNTS)
+def test_update_enemies(benchmark, count):
+    bench_engine(benchmark, count, lambda engine: engine.update_enemies(FRAME))
+
+
+@pytest.mark.parametrize('count', ENTITY_COUNTS)
+def test_update_snow_particles(benchmark, count):
+    bench_engine(benchmark, count, lambda engine: engine.update_snow_particles(FRAME))
+
+
+@pytest.mark.parametrize('count', ENTITY_COUNTS)
+def test_rollback_8_frames(benchmark, count):
+    # Budget: restoring and re-simulating 8 frames must fit in one 16 ms frame.
+    # Holds up to about 400 entities of each kind; at 1000 the 8 re-simulated
+    # steps alone take about 50 ms (see DEVELOPMENT.md, Rollback)
+    def setup():
+        session = RollbackSession(populated_engine(count))
+        for _ in range(8):
+            session.step()
+        return (session, session.engine.frame - 8), {}
+    benchmark.pedantic(lambda session, frame: session.rollback(frame), setup=setup,
+                       rounds=30, warmup_rounds=2)
+
+
+@pytest.mark.parametrize('count', ENTITY_COUNTS)
+def test_update_graphics(benchmark, count):
+    os.environ.setdefault('KIVY_NO_ARGS', '1')  # Keep Kivy away from pytest's argv
+    pytest.importorskip('kivymd')
+    from screens.game import GameCanvas
+    
+    canvas = GameCanvas(size=(800, 600))
+    
+    def setup():
+        engine = populated_engine(count)
+        canvas.set_game_engine(engine)
+        engine.update(FRAME)
+        return (), {}
+    
+    benchmark.pedantic(canvas.update_graphics, setup=setup, rounds=30, warmup_rounds=2)
\ No newline at end of file
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Offline sprite atlas packer for Kar Topu Savaşı.
+Packs every PNG in assets/characters into one Kivy texture atlas
+(assets/atlas/sprites.atlas + sprites-0.png). Re-run after adding or
+changing sprite images and commit the result.
+
+Example:
+    python build_atlas.py --size 1024
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from render.atlas import SPRITE_SOURCES, ATLAS_PATH, ATLAS_SIZE, pack_atlas
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pack sprite images into a texture atlas")
+    parser.add_argument('--source', default=SPRITE_SOURCES,
+                        help="directory of PNG sprites")
+    parser.add_argument('--output', default=ATLAS_PATH,
+                        help="atlas file to write (.atlas)")
+    parser.add_argument('--size', type=int, default=ATLAS_SIZE,
+                        help="atlas page size in pixels")
+    parser.add_argument('--padding', type=int, default=2,
+                        help="padding around each sprite")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"🧩 Packing sprites from {args.source}...")
+    frames = pack_atlas(args.source, args.output, args.size, args.padding)
+    print(f"✅ {len(frames)} frames written to {args.output}: {', '.join(frames)}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
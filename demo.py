@@ -61,8 +61,8 @@ def run_headless_demo():
     print("\n✅ Demo completed!")
     print(f"📊 Final Statistics:")
     print(f"   • Final Score: {engine.score}")
-    print(f"   • Enemies Spawned: Total enemies that appeared")
-    print(f"   • Snowballs Thrown: Total snowballs created")
+    print(f"   • Enemies Spawned: {engine.enemies_spawned}")
+    print(f"   • Snowballs Thrown: {engine.snowballs_thrown}")
     print(f"   • Game Time: {60 - engine.time_remaining:.1f} seconds")
     
     print(f"\n🎮 The full game features:")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Load test for the Kar Topu Savaşı session server.
+Starts a server in its own process, connects hundreds of bot clients that
+press random buttons, and reports rooms per core and bandwidth per client.
+
+Example:
+    python loadtest.py --bots 400 --clients-per-room 2 --duration 15
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+from game.bots import run_load_test
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the session server with bot clients")
+    parser.add_argument('--bots', type=int, default=200,
+                        help="number of bot clients")
+    parser.add_argument('--clients-per-room', type=int, default=2,
+                        help="bots sharing a room")
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help="measurement window in seconds")
+    parser.add_argument('--port', type=int, default=7777,
+                        help="TCP port for the server under test")
+    parser.add_argument('--tick-rate', type=int, default=60,
+                        help="server simulation steps per second")
+    parser.add_argument('--send-rate', type=int, default=20,
+                        help="snapshots per second per client")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rooms = -(-args.bots // args.clients_per_room)
+    print(f"🤖 {args.bots} bots in {rooms} rooms for {args.duration:.0f}s...")
+    
+    stats = run_load_test(args.bots, args.clients_per_room, args.duration, port=args.port,
+                          server_options={'tick_rate': args.tick_rate,
+                                          'send_rate': args.send_rate})
+    
+    print(f"✅ {stats['rooms']} rooms, {stats['clients']} clients, {stats['ticks']} ticks "
+          f"({stats['late_ticks']} late)")
+    print(f"   • Server CPU {stats['cpu_load']:.0%} (ticking {stats['tick_load']:.0%})")
+    print(f"   • Rooms per core: {stats['rooms_per_core']:.0f}")
+    print(f"   • Per client: {stats['bytes_per_client']:.0f} B/s, "
+          f"{stats['snapshots_per_client']:.1f} snapshots/s")
+    if stats['decode_errors']:
+        print(f"⚠️  {stats['decode_errors']} snapshots referenced an unknown baseline")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
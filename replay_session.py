@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded Kar Topu Savaşı match headlessly.
+Verifies the per-frame state hashes and reports simulation speed, so
+recorded sessions can be used as regression and performance fixtures.
+
+Example:
+    python replay_session.py last_match.ktr --repeat 10
+"""
+
+import sys
+import os
+import argparse
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+from game.replay import Replay
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay and verify a recorded match")
+    parser.add_argument('path', help="replay file (.ktr)")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="number of times to replay, for timing")
+    parser.add_argument('--no-verify', action='store_true',
+                        help="skip state hash checks")
+    args = parser.parse_args(argv)
+    
+    replay = Replay.load(args.path)
+    print(f"🎬 {args.path}: {replay.frames} frames, {len(replay.events)} input events, "
+          f"seed {replay.seed}, character {replay.character.get('name', '?')}")
+    
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        engine, mismatch = replay.play(verify=not args.no_verify)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        
+        if mismatch is not None:
+            print(f"❌ State diverged from the recording at frame {mismatch}")
+            return 1
+    
+    print(f"✅ Replayed to score {engine.score} in {best * 1000:.1f} ms "
+          f"({replay.frames / best:.0f} frames/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
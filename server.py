@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Headless session server for Kar Topu Savaşı.
+Hosts many rooms in one process; clients join a room by name over TCP
+(or WebSocket with the optional `websockets` package) and receive
+delta-encoded snapshots of their own solo session; room mates play
+the same seed side by side and compete on score.
+
+Example:
+    python server.py --port 7777 --websocket-port 7778
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+from game.server import SessionServer
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the headless session server")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="address to listen on")
+    parser.add_argument('--port', type=int, default=7777,
+                        help="TCP port")
+    parser.add_argument('--websocket-port', type=int, default=None,
+                        help="also accept WebSocket clients on this port")
+    parser.add_argument('--tick-rate', type=int, default=60,
+                        help="simulation steps per second")
+    parser.add_argument('--send-rate', type=int, default=20,
+                        help="snapshots per second sent to each client")
+    parser.add_argument('--seats', type=int, default=2,
+                        help="players per room; later joiners spectate")
+    return parser.parse_args(argv)
+
+
+async def serve(args):
+    server = SessionServer(tick_rate=args.tick_rate, send_rate=args.send_rate, seats=args.seats)
+    await server.listen(args.host, args.port, args.websocket_port)
+    
+    print(f"🎮 Session server on tcp://{args.host}:{args.port}")
+    if args.websocket_port is not None:
+        print(f"🌐 WebSocket clients on ws://{args.host}:{args.websocket_port}")
+    try:
+        await server.run()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
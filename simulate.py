@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Headless batch simulation of Kar Topu Savaşı matches.
+Runs seeded matches for each character across all CPU cores and writes
+an aggregated balance report.
+
+Example:
+    python simulate.py --matches 500 --policy random --difficulty hard --output report.csv
+"""
+
+import sys
+import os
+import argparse
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+from game.characters import CHARACTERS
+from game.simulation import POLICIES, make_jobs, run_batch, summarize, write_report
+from game.waves import load_wave_table
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless balance simulations")
+    parser.add_argument('--characters', nargs='+',
+                        default=[c['name'] for c in CHARACTERS],
+                        help="characters to simulate (default: all)")
+    parser.add_argument('--matches', type=int, default=100,
+                        help="matches per character")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='scripted',
+                        help="input policy driving the player")
+    parser.add_argument('--difficulty', choices=sorted(load_wave_table().timelines),
+                        default='easy',
+                        help="enemy waves to play (default: easy, as in the app)")
+    parser.add_argument('--duration', type=float, default=60.0,
+                        help="match length in seconds of game time")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="first seed; match i uses seed + i")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--output', default='balance_report.json',
+                        help="report path, .json or .csv")
+    args = parser.parse_args(argv)
+    if args.matches < 1:
+        parser.error("--matches must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    jobs = make_jobs(args.characters, args.matches, args.policy, args.duration, args.seed,
+                     args.difficulty)
+    
+    print(f"🎮 Simulating {len(jobs)} matches ({args.policy} policy, {args.difficulty})...")
+    start = time.perf_counter()
+    results = run_batch(jobs, args.workers)
+    elapsed = time.perf_counter() - start
+    
+    summary = summarize(results)
+    write_report(args.output, summary, results)
+    
+    print(f"✅ Done in {elapsed:.1f}s ({len(jobs) / elapsed:.0f} matches/s)")
+    for row in summary:
+        print(f"   • {row['character']:<6} score {row['score_mean']:7.1f} ± {row['score_stdev']:5.1f} | "
+              f"hits {row['hits_mean']:5.1f} | enemies {row['enemies_spawned_mean']:5.1f} | "
+              f"accuracy {row['accuracy']:.0%}")
+    print(f"📊 Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -66,8 +66,8 @@ def test_game_engine():
     print(f"✓ Snowball throwing test: {initial_snowballs} -> {len(engine.snowballs)} snowballs")
     
     # Test enemy spawning
-    engine.enemy_spawn_timer = engine.enemy_spawn_interval  # Force spawn
     initial_enemies = len(engine.enemies)
+    engine.spawn_enemy()  # Force spawn
     engine.update(1/60.0)
     
     print(f"✓ Enemy spawning test: {initial_enemies} -> {len(engine.enemies)} enemies")
@@ -110,6 +110,1013 @@ def test_character_attributes():
               f"Cooldown={player.throw_cooldown:.1f}s, Power={player.snowball_power:.1f}")
 
 
+class RecordingListener:
+    def __init__(self):
+        self.live = set()
+    
+    def on_spawn(self, kind, entity):
+        self.live.add((kind, entity))
+    
+    def on_despawn(self, kind, entity):
+        self.live.remove((kind, entity))
+
+
+def test_entity_listeners():
+    print("\nTesting spawn/despawn notifications...")
+    
+    engine = GameEngine()
+    listener = RecordingListener()
+    engine.add_listener(listener)
+    engine.reset_game()
+    
+    engine.set_player_input('throw', True)
+    engine.spawn_enemy()
+    for i in range(300):
+        engine.update(1/60.0)
+    
+    expected = {('player', engine.player)}
+    expected.update(('enemy', enemy) for enemy in engine.enemies)
+    expected.update(('snowball', snowball) for snowball in engine.snowballs)
+    expected.update(('enemy_snowball', snowball) for snowball in engine.enemy_snowballs)
+    assert listener.live == expected
+    
+    engine.reset_game()
+    assert listener.live == {('player', engine.player)}
+    print(f"✓ Listener tracks {len(expected)} live entities and clears on reset")
+
+
+def run_scripted_match(engine, frames=1200):
+    engine.reset_game()
+    engine.player.throw_cooldown = 0
+    for i in range(frames):
+        engine.set_player_input('throw', True)
+        engine.update(1/60.0)
+    return engine
+
+
+def test_entity_store():
+    print("\nTesting array-backed entity store...")
+    
+    objects = run_scripted_match(GameEngine(seed=1))
+    arrays = run_scripted_match(GameEngine(seed=1, use_entity_store=True))
+    
+    assert objects.score == arrays.score
+    assert (sorted((s.x, s.y) for s in objects.snowballs) ==
+            sorted((s.x, s.y) for s in arrays.snowballs))
+    assert (sorted((e.x, e.y) for e in objects.enemies) ==
+            sorted((e.x, e.y) for e in arrays.enemies))
+    
+    print(f"✓ Store matches object mode: score {arrays.score}, "
+          f"{len(arrays.snowballs)} snowballs, {len(arrays.enemies)} enemies")
+
+
+def test_broad_phase():
+    print("\nTesting sweep-and-prune broad phase...")
+    
+    import random
+    from game.engine import COLLISION_BRUTE_FORCE
+    
+    rng = random.Random(7)
+    engine = GameEngine()
+    engine.reset_game()
+    for _ in range(200):
+        engine.enemies.append(Enemy(rng.uniform(0, 800), rng.uniform(100, 140), 35, 55))
+        engine.snowballs.append(Snowball(rng.uniform(0, 800), rng.uniform(100, 200), 300, 50))
+    
+    brute = engine.find_hits_brute_force()
+    sweep = engine.find_hits_sweep_and_prune()
+    assert brute == sweep
+    
+    score = engine.score
+    engine.collision_mode = COLLISION_BRUTE_FORCE
+    engine.check_collisions()
+    assert engine.score == score + 10 * len(brute)
+    
+    print(f"✓ Both strategies find the same {len(brute)} hits")
+
+
+def test_sprite_boxes():
+    print("\nTesting slotted sprites and cached collision boxes...")
+    
+    from game.collision import bounds, sprites_overlap
+    from game.store import EnemyView, EntityStore, SnowballView
+    
+    player = Player(100, 100, 40, 60)
+    enemy = Enemy(200, 100, 35, 55)
+    snowball = Snowball(150, 120, 300, 50, radius=8)
+    for sprite in (player, enemy, snowball):
+        assert not hasattr(sprite, '__dict__')
+    try:
+        enemy.health = 3
+        assert False, "sprites accept arbitrary attributes"
+    except AttributeError:
+        pass
+    
+    # Boxes are cached at construction and refreshed when pooled objects reset
+    assert (player.half_width, player.box_height) == (20, 60)
+    assert bounds(enemy) == (182.5, 217.5, 100, 155)
+    assert bounds(snowball) == (146, 154, 120, 128)
+    snowball.reset(0, 0, 0, 0, radius=12)
+    enemy.reset(300, 100, 50, 70)
+    assert (snowball.half_width, snowball.box_height) == (6, 12)
+    assert bounds(enemy) == (275, 325, 100, 170)
+    
+    # Overlap is strict: boxes that only touch do not collide
+    left = Enemy(100, 100, 40, 60)
+    assert sprites_overlap(left, Enemy(139, 100, 40, 60))
+    assert not sprites_overlap(left, Enemy(140, 100, 40, 60))
+    assert not sprites_overlap(left, Enemy(100, 160, 40, 60))
+    
+    # Store views expose the same boxes as the objects they were copied from
+    for store, sprite in ((EntityStore(EnemyView), enemy), (EntityStore(SnowballView), snowball)):
+        view = store.add_entity(sprite)
+        assert bounds(view) == bounds(sprite)
+        assert sprites_overlap(view, sprite)
+    
+    print("✓ Sprites are slotted and views share their collision boxes")
+
+
+def test_object_pools():
+    print("\nTesting snowball and enemy pools...")
+    
+    engine = run_scripted_match(GameEngine(snowball_pool_size=8))
+    stats = engine.pool_stats()
+    
+    live = set(map(id, engine.snowballs)) | set(map(id, engine.enemies))
+    pooled = set(map(id, engine.snowball_pool.free)) | set(map(id, engine.enemy_pool.free))
+    assert not live & pooled
+    assert stats['snowball']['hits'] > stats['snowball']['misses']
+    assert stats['snowball']['free'] <= 8
+    
+    print(f"✓ Snowball pool hit rate {stats['snowball']['hit_rate']:.0%}, "
+          f"enemy pool hit rate {stats['enemy']['hit_rate']:.0%}")
+
+
+def test_compaction():
+    print("\nTesting dead entity compaction...")
+    
+    engine = GameEngine()
+    listener = RecordingListener()
+    engine.add_listener(listener)
+    engine.reset_game()
+    
+    for i in range(10):
+        engine.add_snowball(Snowball(i, 200, 300, 50))
+    for snowball in engine.snowballs[::3]:
+        engine.kill_snowball(snowball)
+    engine.compact_snowballs()
+    
+    assert [s.x for s in engine.snowballs] == [1, 2, 4, 5, 7, 8]
+    assert len(listener.live) == 1 + len(engine.snowballs)
+    print(f"✓ Compaction kept {len(engine.snowballs)} live snowballs in order")
+
+
+def test_fixed_timestep():
+    print("\nTesting fixed-timestep accumulator...")
+    
+    fixed = GameEngine()
+    fixed.reset_game()
+    fixed.set_player_input('right', True)
+    for i in range(60):
+        fixed.update(1/60.0)
+    
+    # Same second of play delivered as uneven frames
+    uneven = GameEngine()
+    uneven.reset_game()
+    uneven.set_player_input('right', True)
+    steps = 0
+    for frame_dt in [1/30.0, 1/60.0, 1/20.0] * 10 + [0.001]:
+        steps += uneven.advance(frame_dt)
+    
+    assert steps == 60
+    assert abs(uneven.player.x - fixed.player.x) < 1e-6
+    assert 0 <= uneven.interpolation_alpha < 1
+    
+    # A long stall runs at most max_substeps steps
+    assert uneven.advance(5.0) == uneven.max_substeps
+    print(f"✓ {steps} fixed steps from uneven frames, player at x={uneven.player.x:.1f}")
+
+
+def test_batch_simulation():
+    print("\nTesting headless batch simulation...")
+    
+    from game.simulation import make_jobs, run_batch, summarize, write_report
+    
+    jobs = make_jobs(['Arda', 'Elif'], matches=2, policy='random', duration=5.0,
+                     difficulty='normal')
+    results = run_batch(jobs, workers=1)
+    summary = summarize(results)
+    
+    assert len(results) == 4
+    assert all(r['frames'] >= 300 for r in results)
+    assert [row['character'] for row in summary] == ['Arda', 'Elif']
+    assert all(row['enemies_spawned_mean'] == 2 for row in summary)
+    
+    # Sweeps default to the app's starting difficulty; run_batch can override it
+    assert make_jobs(['Arda'], 1)[0][-1] == 'easy'
+    hard = summarize(run_batch(jobs[:1], workers=1, difficulty='hard'))
+    assert hard[0]['difficulty'] == 'hard' and hard[0]['enemies_spawned_mean'] == 3
+    try:
+        write_report('empty.csv', summarize([]), [])
+        assert False, "empty report written"
+    except ValueError:
+        pass
+    print(f"✓ {len(results)} matches summarized for {len(summary)} characters")
+
+
+def test_deterministic_simulation():
+    print("\nTesting seeded RNG and simulation clock...")
+    
+    from game.simulation import run_match
+    
+    first = run_match('Elif', seed=42, policy='random', duration=20.0)
+    second = run_match('Elif', seed=42, policy='random', duration=20.0)
+    assert first == second
+    
+    # Cooldown runs on simulation time, so throws don't depend on CPU speed
+    engine = GameEngine(seed=1)
+    engine.reset_game()
+    for i in range(600):
+        engine.set_player_input('throw', True)
+        engine.update(1/60.0)
+    assert engine.snowballs_thrown == 10
+    assert abs(engine.sim_time - 10.0) < 1e-9
+    
+    print(f"✓ Same seed, same result (score {first['score']}); "
+          f"{engine.snowballs_thrown} throws in {engine.sim_time:.0f}s of game time")
+
+
+def test_replay():
+    print("\nTesting input recording and replay...")
+    
+    from game.replay import Replay, ReplayRecorder
+    from game.simulation import RandomPolicy
+    import random
+    
+    engine = GameEngine(seed=99)
+    engine.set_character({'name': 'Can', 'snowball_power': 1.5})
+    engine.reset_game()
+    recorder = ReplayRecorder()
+    recorder.attach(engine)
+    
+    policy = RandomPolicy(random.Random(5))
+    while engine.time_remaining > 0:
+        policy.act(engine, engine.frame)
+        engine.advance(1/50.0)
+    recorder.detach()
+    
+    data = recorder.replay.to_bytes()
+    replay = Replay.from_bytes(data)
+    replayed, mismatch = replay.play()
+    assert mismatch is None
+    assert replayed.score == engine.score
+    assert replayed.frame == engine.frame
+    
+    # A tampered input stream must be detected
+    replay.events[len(replay.events) // 2:] = []
+    assert replay.play()[1] is not None
+    
+    print(f"✓ {replay.frames} frames replayed from {len(data)} bytes, score {engine.score}")
+
+
+def test_frame_profiler():
+    print("\nTesting frame profiler...")
+    
+    import json
+    import tempfile
+    from game.profiler import FrameProfiler
+    
+    engine = GameEngine(seed=3)
+    engine.reset_game()
+    profiler = FrameProfiler(window=50)
+    profiler.enable()
+    engine.profiler = profiler
+    
+    for _ in range(120):
+        profiler.begin_frame()
+        engine.advance(1/60.0)
+        profiler.end_frame(1 + len(engine.enemies) + len(engine.snowballs))
+    profiler.disable()
+    
+    summary = profiler.summary()
+    assert summary['frames'] == 50
+    assert set(summary['phases']) == {name for name, _ in engine.update_phases}
+    for stats in [summary['frame']] + list(summary['phases'].values()):
+        assert 0 <= stats['p50'] <= stats['p95'] <= stats['p99']
+    assert summary['entities'] >= 1
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'trace.json')
+        count = profiler.export_chrome_trace(path)
+        with open(path, encoding='utf-8') as f:
+            events = json.load(f)['traceEvents']
+    assert len(events) == count
+    assert all(event['ph'] == 'X' for event in events)
+    assert sum(event['name'] == 'frame' for event in events) == 120
+    
+    print(f"✓ Frame p95 {summary['frame']['p95']:.3f} ms, {count} trace events")
+
+
+def test_startup_profiler():
+    print("\nTesting startup profiler...")
+    
+    import tempfile
+    from game.profiler import StartupProfiler
+    
+    argv = ['main.py', '--profile-startup=out.txt', '--size=800x600']
+    profiler = StartupProfiler.from_command_line(argv, {})
+    assert profiler.path == 'out.txt'
+    assert argv == ['main.py', '--size=800x600']
+    assert StartupProfiler.from_command_line(['main.py'], {}) is None
+    assert StartupProfiler.from_command_line(['main.py'], {StartupProfiler.ENV_VAR: '1'}).path == StartupProfiler.DEFAULT_PATH
+    
+    with tempfile.TemporaryDirectory() as directory:
+        package = os.path.join(directory, 'kt_startup_probe')
+        os.mkdir(package)
+        with open(os.path.join(package, '__init__.py'), 'w') as f:
+            f.write("from . import child\n")
+        with open(os.path.join(package, 'child.py'), 'w') as f:
+            f.write("import time\ntime.sleep(0.01)\n")
+        
+        profiler = StartupProfiler(os.path.join(directory, 'report.txt'), prefixes=('kt_startup_probe',))
+        sys.path.insert(0, directory)
+        profiler.install()
+        try:
+            import kt_startup_probe
+        finally:
+            profiler.uninstall()
+            sys.path.remove(directory)
+        
+        timings = {name: (cumulative, own) for name, cumulative, own in profiler.imports}
+        assert set(timings) == {'kt_startup_probe', 'kt_startup_probe.child'}
+        assert timings['kt_startup_probe.child'][1] >= 0.01
+        assert timings['kt_startup_probe'][0] >= timings['kt_startup_probe.child'][0]
+        assert timings['kt_startup_probe'][1] < 0.01
+        
+        profiler.measure('build()', sum, [1, 2])
+        profiler.mark('first frame')
+        with open(profiler.write_report(), encoding='utf-8') as f:
+            report = f.read()
+    
+    # Slowest import listed first
+    assert report.index('kt_startup_probe\n') < report.index('kt_startup_probe.child')
+    assert 'build()' in report and 'first frame' in report
+    
+    print(f"✓ {len(profiler.imports)} imports and {len(profiler.sections)} section timed")
+
+
+def test_sprite_atlas():
+    print("\nTesting sprite atlas...")
+    
+    from game.characters import CHARACTERS
+    from render.atlas import ATLAS_PATH, frame_names
+    
+    # The prebuilt atlas is one page holding every character sprite
+    pages = frame_names(ATLAS_PATH)
+    assert len(pages) == 1
+    frames = next(iter(pages.values()))
+    for character in CHARACTERS:
+        assert character['sprite'] in frames, character['name']
+    
+    print(f"✓ {len(frames)} sprites packed in {os.path.basename(ATLAS_PATH)}")
+
+
+def test_asset_manager():
+    print("\nTesting asset manager...")
+    
+    import tempfile
+    import time
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    from render.assets import AssetManager, decode_image
+    
+    # Images decode to bottom-up RGBA rows
+    (width, height), pixels = decode_image(os.path.join(os.path.dirname(__file__), 'assets', 'characters', 'arda.png'))
+    assert (width, height) == (100, 120)
+    assert len(pixels) == width * height * 4
+    
+    def finish_text(path, decoded):
+        yield
+        return decoded.upper()
+    
+    manager = AssetManager(workers=2)
+    manager.kinds['text'] = (lambda path: open(path, encoding='utf-8').read(), finish_text)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(5):
+            paths.append(os.path.join(directory, f'asset{i}.txt'))
+            with open(paths[-1], 'w', encoding='utf-8') as f:
+                f.write(f'kar {i}')
+        
+        loaded = []
+        completed = []
+        for path in paths:
+            manager.load(path, kind='text', callback=loaded.append)
+        manager.load(paths[0], kind='text', callback=loaded.append)  # Joins the pending load
+        assert manager.loading and manager.progress == 0
+        
+        # Drive the main-thread side by hand until the workers are done
+        deadline = time.time() + 5
+        while manager.loading and time.time() < deadline:
+            manager.pump(0)
+            time.sleep(0.001)
+        manager.executor.shutdown()
+    
+    assert manager.progress == 1.0 and not manager.loading
+    assert sorted(loaded) == sorted([f'KAR {i}' for i in range(5)] + ['KAR 0'])
+    assert manager.get(paths[3]) == 'KAR 3'
+    
+    # Cached assets come back immediately, without another decode
+    manager.load_many(paths, on_complete=lambda: completed.append(True))
+    assert completed == [True] and manager.total == 5
+    
+    print(f"✓ {manager.total} assets decoded off-thread and cached")
+
+
+def test_snow_particles():
+    print("\nTesting snow particle system...")
+    
+    from game.particles import DENSITIES, SnowParticles
+    
+    for use_numpy in (True, False):
+        snow = SnowParticles(800, 600, DENSITIES['blizzard'], seed=4, use_numpy=use_numpy)
+        again = SnowParticles(800, 600, DENSITIES['blizzard'], seed=4, use_numpy=use_numpy)
+        assert len(snow) == DENSITIES['blizzard']
+        assert list(snow.x) == list(again.x)
+        
+        for _ in range(600):
+            snow.update(1/60.0)
+        assert all(0 <= y <= 600 for y in snow.y)
+        assert all(0 <= x <= 800 for x in snow.x)
+        
+        # Every particle fell at least 20 px/s for 10 s, so all have wrapped once
+        assert list(snow.x) != list(again.x)
+        
+        snow.set_density('medium')
+        assert len(snow) == len(snow.x) == len(snow.size) == DENSITIES['medium']
+    
+    # One seeded stream: the same snow with or without NumPy, wraps included
+    fast = SnowParticles(800, 600, DENSITIES['low'], seed=9, use_numpy=True)
+    slow = SnowParticles(800, 600, DENSITIES['low'], seed=9, use_numpy=False)
+    for _ in range(900):
+        fast.update(1/60.0)
+        slow.update(1/60.0)
+    assert list(fast.x) == list(slow.x) and list(fast.y) == list(slow.y)
+    
+    engine = GameEngine(seed=1)
+    assert len(engine.snow) == DENSITIES['classic'] == 30
+    
+    engine = GameEngine(seed=1)
+    engine.set_snow_density('blizzard')
+    engine.update(1/60.0)
+    assert len(engine.snow) == DENSITIES['blizzard']
+    
+    print(f"✓ {len(engine.snow)} snowflakes updated in bulk")
+
+
+def test_simulation_thread():
+    print("\nTesting off-thread simulation...")
+    
+    import time
+    from game.threaded import SimulationThread
+    
+    engine = GameEngine(seed=5)
+    engine.set_character({'name': 'Arda', 'speed': 1.0})
+    engine.reset_game()
+    simulation = SimulationThread(engine)
+    
+    # Stepped by hand: queued input is applied before the step
+    first = simulation.snapshot
+    simulation.set_player_input('right', True)
+    assert not engine.player_input['right']
+    simulation.step()
+    assert engine.player_input['right']
+    snapshot = simulation.snapshot
+    assert snapshot is not first and snapshot.frame == first.frame + 1
+    assert snapshot.player.x > first.player.x
+    
+    # Snapshots are copies, later steps do not change them
+    x, snow_y = snapshot.player.x, list(snapshot.snow.y)
+    simulation.step()
+    assert snapshot.player.x == x and list(snapshot.snow.y) == snow_y
+    assert 0.0 <= simulation.view().interpolation_alpha <= 1.0
+    
+    # On its own thread the engine keeps stepping until stopped
+    simulation.start()
+    deadline = time.perf_counter() + 2.0
+    while simulation.snapshot.frame < 20 and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    simulation.stop()
+    assert simulation.thread is None
+    frame = simulation.snapshot.frame
+    assert frame >= 20 and frame == engine.frame
+    
+    print(f"✓ {simulation.steps} steps published as snapshots")
+
+
+def test_session_server():
+    print("\nTesting session server and snapshot encoding...")
+    
+    from game.protocol import (
+        ENTITY_IDS, SnapshotDecoder, decode_client_message, encode_ack, encode_input,
+        encode_join, encode_snapshot
+    )
+    from game.server import Client, Seat, SessionServer
+    
+    # Quantized delta encoding round-trips
+    full_state = {1: (0, 800, 800), 2: (1, 6800, 800), 3: (2, 900, 1000)}
+    moved = {1: (0, 840, 800), 2: (1, 6770, 800), 4: (2, 2000, 1200)}
+    decoder = SnapshotDecoder()
+    decoder.apply(encode_snapshot(3, full_state, 10, 1, 59.5))
+    delta = encode_snapshot(6, moved, 20, 2, 59.0, 3, full_state)
+    assert len(delta) < len(encode_snapshot(6, moved, 20, 2, 59.0))
+    assert decoder.apply(delta) == 6
+    assert decoder.state == moved and decoder.score == 20
+    assert decoder.positions('player') == [(105.0, 100.0)]
+    
+    # Two players race in one room, a third client spectates seat 0
+    server = SessionServer(send_rate=20, seed=1)
+    outboxes = []
+    for character in ('Arda', 'Can', 'Elif'):
+        outbox = []
+        client = Client(outbox.append)
+        server.clients.add(client)
+        server.handle_message(client, encode_join('room-1', character))
+        outboxes.append((client, outbox, SnapshotDecoder()))
+    room = server.rooms['room-1']
+    assert len(room.seats) == 2
+    assert decode_client_message(encode_input('right', True)) == (2, 'right', True)
+    for malformed in (b'', encode_input('right', True)[:2], encode_ack(3) + b'\0',
+                      bytes((2, 9, 1)), encode_join('room-1', 'Can')[:-1]):
+        try:
+            decode_client_message(malformed)
+            assert False, f"malformed message accepted: {malformed!r}"
+        except ValueError:
+            pass
+    
+    player, spectator = outboxes[0][0], outboxes[2][0]
+    server.handle_message(player, encode_input('right', True))
+    server.handle_message(spectator, encode_input('left', True))  # Ignored
+    for _ in range(120):
+        server.step()
+        for client, outbox, decoder in outboxes:
+            while outbox:
+                server.handle_message(client, encode_ack(decoder.apply(outbox.pop(0))))
+    
+    positions = [decoder.positions('player')[0][0] for _, _, decoder in outboxes]
+    assert positions[0] > positions[1]          # Only the first player walked
+    assert positions[2] == positions[0]         # The spectator watches seat 0
+    assert player.snapshots_sent == 40
+    
+    # A client with a full send buffer skips snapshots instead of queueing more
+    backlog = [10 ** 6]
+    slow = Client([].append, backlog=lambda: backlog[0])
+    server.clients.add(slow)
+    server.handle_message(slow, encode_join('room-1', 'Arda'))
+    for _ in range(6):
+        server.step()
+    assert slow.snapshots_sent == 0 and slow.snapshots_skipped == 2
+    backlog[0] = 0
+    for _ in range(3):
+        server.step()
+    assert slow.snapshots_sent == 1
+    
+    server.disconnect(player)
+    assert spectator.seat is room.seats[0] and spectator.acked is None
+    
+    # Freed ids are reused oldest first instead of wrapping onto live entities
+    seat = Seat(1, room.seats[0].engine.character_data)
+    first = seat.next_id
+    for _ in range(ENTITY_IDS):
+        entity = object()
+        seat.on_spawn('snowball', entity)
+        seat.on_despawn('snowball', entity)
+    assert seat.next_id == first + 1
+    ids = [entity_id for entity_id, _ in seat.ids.values()]
+    assert len(ids) == len(set(ids))
+    seat.next_id = ENTITY_IDS
+    seat.free_ids.clear()
+    try:
+        seat.on_spawn('snowball', object())
+        assert False, "spawned past the 16-bit id space"
+    except RuntimeError:
+        pass
+    
+    print(f"✓ {player.bytes_sent / 2:.0f} B/s per client at 20 snapshots/s")
+
+
+def test_rollback():
+    print("\nTesting rollback with late inputs...")
+    
+    import random
+    from game.rollback import LatencyChannel, RollbackBuffer, RollbackSession
+    
+    character = {'name': 'Can', 'snowball_power': 1.5, 'throw_cooldown': 0.6}
+    for use_entity_store in (False, True):
+        # Reference engine gets every input on time, the session 5-8 frames late
+        reference = GameEngine(seed=7, use_entity_store=use_entity_store)
+        engine = GameEngine(seed=7, use_entity_store=use_entity_store)
+        for e in (reference, engine):
+            e.set_character(character)
+            e.reset_game()
+        session = RollbackSession(engine)
+        channel = LatencyChannel(delay=5, jitter=3, seed=2)
+        
+        rng = random.Random(3)
+        for _ in range(1200):
+            if rng.random() < 0.1:
+                action = rng.choice(('left', 'right', 'jump', 'throw'))
+                active = rng.random() < 0.6
+                reference.set_player_input(action, active)
+                channel.send(reference.frame, action, active)
+            reference.update(reference.fixed_dt)
+            channel.deliver(session)
+            session.advance()
+        
+        assert session.rollbacks > 0
+        assert engine.frame == reference.frame
+        assert engine.state_hash() == reference.state_hash()
+        assert engine.score == reference.score > 0
+    
+    # Old frames fall out of the ring buffer
+    buffer = RollbackBuffer(capacity=4)
+    for _ in range(6):
+        engine.update(engine.fixed_dt)
+        buffer.save(engine)
+    assert engine.frame in buffer and engine.frame - 4 not in buffer
+    try:
+        buffer.restore(engine, engine.frame - 4)
+        assert False, "Evicted frame restored"
+    except KeyError:
+        pass
+    
+    print(f"✓ {session.rollbacks} rollbacks, {session.resimulated} frames re-simulated, "
+          f"same final state")
+
+
+def test_enemy_ai():
+    print("\nTesting enemy AI...")
+    
+    from game.ai import EnemyAI
+    
+    engine = GameEngine(seed=3)
+    engine.reset_game()
+    
+    # An enemy in range throws a lob that lands on the player
+    enemy = engine.add_enemy(Enemy(400, engine.ground_level, 35, 55))
+    engine.ai.think(engine, enemy)
+    assert len(engine.enemy_snowballs) == 1
+    engine.ai.think(engine, enemy)
+    assert len(engine.enemy_snowballs) == 1  # Still on cooldown
+    
+    engine.score = 20
+    for _ in range(120):
+        engine.update(1/60.0)
+        if engine.times_hit:
+            break
+    assert engine.times_hit == 1 and engine.score == 15
+    
+    # A grounded enemy jumps over an incoming player snowball
+    engine.ai.dodge_chance = 1.0
+    engine.add_snowball(Snowball(enemy.x - 60, engine.ground_level + 20, 300, 0))
+    enemy.y = engine.ground_level
+    enemy.velocity_y = 0
+    enemy.last_throw_time = engine.sim_time
+    engine.ai.think(engine, enemy)
+    assert enemy.velocity_y > 0
+    
+    # Thinking is spread over think_interval frames and capped per frame
+    ai = EnemyAI(think_interval=4, max_thinks=3)
+    engine = GameEngine(seed=3)
+    engine.ai = ai
+    engine.reset_game()
+    for i in range(40):
+        engine.add_enemy(Enemy(900 + i, engine.ground_level, 35, 55))
+        engine.enemies_spawned += 1
+    assert sorted({enemy.think_slot for enemy in engine.enemies}) == [0, 1, 2, 3]
+    for _ in range(8):
+        ai.update(engine)
+        engine.frame += 1
+    assert ai.thinks == 8 * 3 and ai.deferred == 8 * (10 - 3)
+    
+    print(f"✓ Enemies throw, dodge and think {ai.max_thinks} per frame "
+          f"every {ai.think_interval} frames")
+
+
+def test_wave_scheduler():
+    print("\nTesting wave scheduler...")
+    
+    from game.waves import WaveTable, compile_waves, load_wave_table
+    
+    # Overlapping waves interleave into one time-sorted timeline
+    enemy_types = {'walker': {'width': 35, 'height': 55, 'speed': 80},
+                   'brute': {'width': 50, 'height': 70, 'speed': 50}}
+    timeline = compile_waves([{'start': 1, 'end': 5, 'every': 2, 'enemy': 'walker'},
+                              {'start': 2, 'every': 3, 'enemy': 'brute', 'count': 2}],
+                             enemy_types, duration=8)
+    assert [(e.time, e.enemy, e.count) for e in timeline] == [
+        (1, 'walker', 1), (2, 'brute', 2), (3, 'walker', 1), (5, 'walker', 1),
+        (5, 'brute', 2), (8, 'brute', 2)]
+    assert WaveTable.resume_index(timeline, 3) == 3
+    try:
+        compile_waves([{'every': 1, 'enemy': 'yeti'}], enemy_types)
+        assert False, "unknown enemy type accepted"
+    except ValueError:
+        pass
+    
+    # Spawns follow the difficulty's timeline, groups side by side
+    table = load_wave_table()
+    assert set(table.timelines) == {'easy', 'normal', 'hard'}
+    spawned = {}
+    for difficulty in ('easy', 'normal', 'hard'):
+        engine = GameEngine(seed=5, difficulty=difficulty)
+        engine.ai.jump_chance = 0
+        engine.reset_game()
+        for _ in range(int(20 / engine.fixed_dt)):
+            engine.update(engine.fixed_dt)
+        due = [e for e in table.timeline(difficulty) if e.time <= engine.sim_time]
+        assert engine.wave_index == len(due)
+        assert engine.enemies_spawned == sum(e.count for e in due)
+        spawned[difficulty] = engine.enemies_spawned
+    assert spawned['easy'] < spawned['normal'] < spawned['hard']
+    
+    engine = GameEngine(difficulty='hard')
+    engine.reset_game()
+    first = engine.spawn_enemy('brute')
+    second = engine.spawn_enemy('brute', 1)
+    assert (first.width, first.height, first.velocity_x) == (50, 70, -50)
+    assert second.x - first.x == 50 + 15
+    
+    # Switching mid-match continues from the current time
+    engine.sim_time = 10.0
+    engine.set_difficulty('easy')
+    assert engine.spawn_timeline[engine.wave_index].time > 10.0
+    try:
+        engine.set_difficulty('nightmare')
+        assert False, "unknown difficulty accepted"
+    except ValueError:
+        pass
+    
+    print(f"✓ Enemies spawned in 20 s: {spawned}")
+
+
+def test_swept_collision():
+    print("\nTesting continuous snowball collisions...")
+    
+    import random
+    from game.collision import (
+        SweepAndPrune, first_impacts, sprites_overlap, swept_bounds, time_of_impact
+    )
+    from game.engine import COLLISION_BRUTE_FORCE
+    from game.store import EnemyView, EntityStore, SnowballView
+    
+    # A snowball that jumped clean over an enemy in one step still hits it
+    enemy = Enemy(350, 100, 35, 55)
+    snowball = Snowball(420, 120, 0, 0)
+    snowball.prev_x = 300
+    assert not sprites_overlap(snowball, enemy)
+    t = time_of_impact(snowball, enemy)
+    assert t is not None and abs(t - (350 - 17.5 - 4 - 300) / 120) < 1e-9
+    
+    # Relative motion counts: an enemy walking through a resting snowball
+    enemy.prev_x, enemy.x = 250, 450
+    snowball.prev_x = snowball.x = 350
+    assert time_of_impact(snowball, enemy) is not None
+    snowball.prev_y = snowball.y = 160  # Passes above the enemy's head
+    assert time_of_impact(snowball, enemy) is None
+    
+    # The first enemy along the path is hit, whichever strategy finds it
+    engine = GameEngine()
+    engine.reset_game()
+    for x in (500, 380):
+        engine.add_enemy(Enemy(x, 100, 35, 55))
+    fast = Snowball(560, 120, 0, 0)
+    fast.prev_x = 300
+    engine.add_snowball(fast)
+    assert engine.find_hits_sweep_and_prune() == [(fast, engine.enemies[1])]
+    assert engine.find_hits_brute_force() == [(fast, engine.enemies[1])]
+    
+    # Entity stores find the same hits from whole columns, with or without NumPy
+    rng = random.Random(5)
+    enemies = [Enemy(rng.uniform(0, 800), 100, 35, 55) for _ in range(20)]
+    snowballs = [Snowball(rng.uniform(0, 800), rng.uniform(100, 200), 300, 50) for _ in range(300)]
+    for sprite in enemies + snowballs:
+        sprite.update(1/15.0)
+    broad_phase = SweepAndPrune()
+    broad_phase.build(enemies, swept_bounds)
+    firsts = [broad_phase.first_impact(snowball) for snowball in snowballs]
+    expected = [(i, enemies.index(enemy)) for i, enemy in enumerate(firsts) if enemy is not None]
+    assert expected
+    for use_numpy in (True, False):
+        stores = [EntityStore(view_class, use_numpy=use_numpy)
+                  for view_class in (SnowballView, EnemyView)]
+        for store, sprites in zip(stores, (snowballs, enemies)):
+            for sprite in sprites:
+                view = store.add_entity(sprite)
+                view.prev_x, view.prev_y = sprite.prev_x, sprite.prev_y
+        assert first_impacts(stores[0].boxes(), stores[1].boxes(), use_numpy) == expected
+    
+    # At 30 Hz a snowball ten times as fast as usual no longer tunnels
+    hits = {}
+    for mode in ('sweep', COLLISION_BRUTE_FORCE):
+        engine = GameEngine(seed=2)
+        engine.collision_mode = mode
+        engine.fixed_dt = 1/30.0
+        engine.reset_game()
+        engine.player.snowball_power = 10.0
+        engine.add_enemy(Enemy(400, engine.ground_level, 35, 55))
+        engine.set_player_input('throw', True)
+        for _ in range(15):
+            engine.update(engine.fixed_dt)
+        hits[mode] = engine.hits
+    assert hits['sweep'] == hits[COLLISION_BRUTE_FORCE] >= 1
+    
+    # Snowballs that land or leave the screen during the step are swept first
+    for enemy_x, snowball in ((400, Snowball(400, 165, 0, -1500)),   # Lands
+                              (850, Snowball(800, 120, 3000, 0))):   # Flies off
+        engine = GameEngine(seed=1)
+        engine.ai.dodge_chance = 0
+        engine.reset_game()
+        engine.add_enemy(Enemy(enemy_x, 100, 35, 55))
+        engine.add_snowball(snowball)
+        engine.update(1/15.0)
+        assert engine.hits == 1 and not engine.snowballs
+    
+    print(f"✓ Fast snowballs hit at 30 Hz: {hits['sweep']} hit(s), none tunnelled")
+
+
+def test_render_dirty_tracking():
+    print("\nTesting dirty-tracked canvas layers and HUD...")
+    
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    from screens.game import GameCanvas, GameStatsCard
+    
+    engine = GameEngine(seed=1)
+    engine.reset_game()
+    engine.spawn_enemy()
+    engine.set_player_input('throw', True)
+    engine.update(engine.fixed_dt)
+    
+    canvas = GameCanvas(size=(800, 600))
+    canvas.set_game_engine(engine)
+    canvas.update_graphics()
+    drawn = dict(canvas.layer_updates)
+    assert drawn == {'snow': 1, 'player': 1, 'enemies': 1, 'snowballs': 1, 'enemy_snowballs': 0}
+    
+    # Redrawing without an engine step touches no layer
+    canvas.update_graphics()
+    assert canvas.layer_updates == drawn
+    
+    # A step redraws the moving layers; the idle player is left alone
+    engine.set_player_input('throw', False)
+    engine.update(engine.fixed_dt)
+    engine.player.x = engine.player.prev_x
+    engine.player.y = engine.player.prev_y
+    canvas.update_graphics()
+    changed = {name for name, count in canvas.layer_updates.items() if count != drawn[name]}
+    assert changed == {'snow', 'enemies', 'snowballs'}, changed
+    
+    # HUD cards only re-render their label when the value changes
+    class Label:
+        def __init__(self):
+            self.assigned = 0
+        
+        @property
+        def text(self):
+            return self._text
+        
+        @text.setter
+        def text(self, value):
+            self._text = value
+            self.assigned += 1
+    
+    class Card:
+        def __init__(self):
+            self.value = 0
+            self.value_label = Label()
+    
+    card = Card()
+    for value in (10, 10, 10, 20):
+        GameStatsCard.update_value(card, value)
+    assert card.value_label.assigned == 2 and card.value_label.text == '20'
+    
+    print(f"✓ Idle redraw skipped, {len(changed)} layers updated after a step")
+
+
+def test_lazy_screens():
+    print("\nTesting lazily built screens...")
+    
+    import sys
+    import tempfile
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    from screens.lazy import LazyScreenManager
+    
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, 'lazy_demo_screen.py'), 'w', encoding='utf-8') as f:
+            f.write("from kivy.uix.screenmanager import Screen\n"
+                    "class DemoScreen(Screen):\n"
+                    "    built = 0\n"
+                    "    def __init__(self, **kwargs):\n"
+                    "        super().__init__(**kwargs)\n"
+                    "        DemoScreen.built += 1\n")
+        sys.path.insert(0, directory)
+        try:
+            manager = LazyScreenManager()
+            for name in ('first', 'second', 'third'):
+                manager.register(name, 'lazy_demo_screen:DemoScreen')
+            assert 'lazy_demo_screen' not in sys.modules
+            
+            # Built on first access only, by get_screen or by navigating
+            screen = manager.get_screen('first')
+            assert manager.get_screen('first') is screen
+            assert sys.modules['lazy_demo_screen'].DemoScreen.built == 1
+            manager.current = 'second'
+            assert manager.has_screen('second') and not manager.has_screen('third')
+            assert sys.modules['lazy_demo_screen'].DemoScreen.built == 2
+            sys.modules.pop('lazy_demo_screen')
+            
+            # Pre-warming does one step per frame: import, then build
+            manager = LazyScreenManager()
+            for name in ('first', 'second'):
+                manager.register(name, 'lazy_demo_screen:DemoScreen')
+            manager.prewarm()
+            manager.prewarm_next(0)
+            assert 'lazy_demo_screen' in sys.modules and not manager.has_screen('first')
+            manager.prewarm_next(0)
+            assert manager.has_screen('first') and manager.prewarm_queue == ['second']
+            manager.current = 'second'  # Navigation got there first
+            manager.prewarm_next(0)
+            assert not manager.prewarm_queue
+            assert sys.modules['lazy_demo_screen'].DemoScreen.built == 2
+        finally:
+            sys.path.remove(directory)
+            sys.modules.pop('lazy_demo_screen', None)
+    
+    print("✓ Screens built on first use and by pre-warming")
+
+
+def test_quad_batch():
+    print("\nTesting batched quad mesh...")
+    
+    import numpy
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    from kivy.core.window import Window  # Meshes need the GL context a window sets up
+    from render.batch import MAX_QUADS, QUAD_FLOATS, QuadBatch
+    
+    # One quad: four (x, y, u, v) corners counter-clockwise, two triangles
+    batch = QuadBatch()
+    batch.resize(1)
+    batch.set_quad(0, 10, 20, 30, 40, tex_coords=(0, 0, 0.5, 0, 0.5, 0.5, 0, 0.5))
+    batch.commit()
+    assert batch.vertices == [10, 20, 0, 0, 40, 20, 0.5, 0, 40, 60, 0.5, 0.5, 10, 60, 0, 0.5]
+    assert list(batch.mesh.indices) == [0, 1, 2, 2, 3, 0]
+    
+    # Growing keeps existing quads and indexes the new ones
+    batch.resize(3)
+    assert len(batch.vertices) == 3 * QUAD_FLOATS and batch.vertices[:4] == [10, 20, 0, 0]
+    assert list(batch.mesh.indices)[-6:] == [8, 9, 10, 10, 11, 8]
+    batch.resize(MAX_QUADS + 10)
+    assert batch.count == MAX_QUADS
+    
+    # The NumPy path writes the same vertices as the list path
+    x = numpy.array([100.0, 250.5, 3.0])
+    y = numpy.array([50.0, 75.25, 600.0])
+    size = numpy.array([4.0, 6.0, 2.5])
+    listed = QuadBatch()
+    listed.set_discs(list(zip(x, y, size)))
+    arrays = QuadBatch()
+    arrays.set_disc_arrays(x, y, size)
+    assert arrays.count == listed.count == 3
+    assert list(arrays.buffer.reshape(-1)) == listed.vertices
+    assert list(arrays.mesh.indices) == list(listed.mesh.indices)
+    
+    print(f"✓ Quad layout, growth up to {MAX_QUADS} quads and both disc paths agree")
+
+
 if __name__ == '__main__':
     test_character_attributes()
-    test_game_engine()
\ No newline at end of file
+    test_game_engine()
+    test_entity_listeners()
+    test_entity_store()
+    test_broad_phase()
+    test_sprite_boxes()
+    test_object_pools()
+    test_compaction()
+    test_fixed_timestep()
+    test_batch_simulation()
+    test_deterministic_simulation()
+    test_replay()
+    test_frame_profiler()
+    test_startup_profiler()
+    test_sprite_atlas()
+    test_asset_manager()
+    test_snow_particles()
+    test_simulation_thread()
+    test_session_server()
+    test_rollback()
+    test_enemy_ai()
+    test_wave_scheduler()
+    test_swept_collision()
+    test_render_dirty_tracking()
+    test_lazy_screens()
+    test_quad_batch()
\ No newline at end of file
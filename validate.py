@@ -46,6 +46,8 @@ def validate_project_structure():
         ("assets/characters/elif.png", "Elif character image"),
         ("assets/characters/can.png", "Can character image"),
         ("assets/characters/ayse.png", "Ayşe character image"),
+        ("assets/atlas/sprites.atlas", "Sprite atlas (build_atlas.py)"),
+        ("assets/atlas/sprites-0.png", "Sprite atlas page"),
         ("assets/fonts/README.md", "Font directory documentation"),
     ]
     